@@ -1,11 +1,10 @@
 import asyncio
-import json
 import logging
 import os
 import time
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueListener
 from pathlib import Path
-from typing import Any, Dict, Final, Optional, Set
+from typing import Dict, Final, Optional, Set
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
@@ -13,19 +12,23 @@ import asyncpg
 import discord
 import dotenv
 from discord.ext import commands
+from module.http_client import HTTPClient
+from module.instrumentation import InstrumentedCommandTree, observe_event_handler, run_loop_lag_probe
+from module.log_pipeline import setup_logging
 from module.logger import LoggingCog
 from module.prometheus import PrometheusCog
+from module.response_cache import ResponseCache
+from module.role_queue import RoleMutationQueue
+from module.stats_service import StatsService
 
 
 SHARD_COUNT: Final[int] = 3
 COMMAND_PREFIX: Final[str] = "sw!"
-STATUS_UPDATE_COOLDOWN: Final[int] = 5
 LOG_RETENTION_DAYS: Final[int] = 7
 
 PATHS: Final[dict] = {
     "log_dir": Path("./log"),
     "db": Path("data/prohibited_channels.db"),
-    "user_count": Path("data/user_count.json"),
     "cogs_dir": Path("./cogs")
 }
 
@@ -144,52 +147,6 @@ class DatabaseManager:
             logger.error("Database error: %s", e, exc_info=True)
             return False
 
-class UserCountManager:
-    """ユーザー数管理を行うクラス"""
-
-    def __init__(self, file_path: Path) -> None:
-        self.file_path = file_path
-        self.file_path.parent.mkdir(parents=True, exist_ok=True)
-        self._last_update = 0
-        self._cache: Dict[str, Any] = {}
-
-    def _read_count(self) -> int:
-        """ファイルからユーザー数を読み込み"""
-        try:
-            if self.file_path.exists():
-                data = json.loads(self.file_path.read_text(encoding="utf-8"))
-                return data.get("total_users", 0)
-            return 0
-        except Exception as e:
-            logger.error("Error reading user count: %s", e, exc_info=True)
-            return 0
-
-    def _write_count(self, count: int) -> None:
-        """ユーザー数をファイルに書き込み"""
-        try:
-            self.file_path.write_text(
-                json.dumps(
-                    {"total_users": count},
-                    ensure_ascii=False,
-                    indent=4
-                ),
-                encoding="utf-8"
-            )
-        except Exception as e:
-            logger.error("Error writing user count: %s", e, exc_info=True)
-
-    def get_count(self) -> int:
-        """現在のユーザー数を取得"""
-        return self._read_count()
-
-    def update_count(self, count: int) -> None:
-        self._write_count(count)
-        self._last_update = time.time()
-
-    def should_update(self) -> bool:
-        """更新が必要かどうかを判定"""
-        return time.time() - self._last_update >= STATUS_UPDATE_COOLDOWN
-
 class SwiftlyBot(commands.AutoShardedBot):
     """Swiftlyボットのメインクラス"""
 
@@ -204,11 +161,16 @@ class SwiftlyBot(commands.AutoShardedBot):
             intents=intents,
             shard_count=SHARD_COUNT,
             help_command=None,  # sw!helpコマンドを無効化
-            chunk_guilds_at_startup=False  # ギルドチャンクを無効化
+            chunk_guilds_at_startup=False,  # ギルドチャンクを無効化
+            tree_cls=InstrumentedCommandTree  # コマンドの応答時間を計測
         )
 
         self.db = DatabaseManager()  # パス引数不要に
-        self.user_count = UserCountManager(PATHS["user_count"])
+        self.stats = StatsService(self)  # 稼働状況をwebapiへ配信するサービス
+        self.http_client = HTTPClient()  # 外部API用の共有HTTPクライアント
+        self.response_cache = ResponseCache()  # 外部API応答のキャッシュ
+        self.role_queue = RoleMutationQueue(self)  # ギルドごとのロール付与キュー
+        self._lag_probe: Optional[asyncio.Task] = None
         self._setup_logging()
 
         # ファイル監視の設定
@@ -216,61 +178,14 @@ class SwiftlyBot(commands.AutoShardedBot):
         self.observer = Observer()
 
     def _setup_logging(self) -> None:
-        """ロギングの設定"""
-        PATHS["log_dir"].mkdir(exist_ok=True)
-
-        # コンソール出力用のハンドラを追加
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt='%Y-%m-%d %H:%M:%S'))
-
-        # 共通のログハンドラ設定
-        handlers = []
-        for name, level in [("logs", logging.INFO), ("commands", logging.INFO)]:
-            handler = TimedRotatingFileHandler(
-                PATHS["log_dir"] / f"{name}.log",
-                when="midnight",
-                interval=1,
-                backupCount=LOG_RETENTION_DAYS,
-                encoding="utf-8"
-            )
-            handler.setLevel(level)
-            handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt='%Y-%m-%d %H:%M:%S'))
-            handlers.append(handler)
-
-        # ボットのロガー設定
-        logger.setLevel(logging.INFO)
-        for handler in handlers:
-            logger.addHandler(handler)
-        logger.addHandler(console_handler)
-
-        # LoggingCog用のロガー設定
-        bot_logger = logging.getLogger("bot")
-        bot_logger.setLevel(logging.INFO)
-        for handler in handlers:
-            bot_logger.addHandler(handler)
-        bot_logger.addHandler(console_handler)
-
-        # Discordのロガー設定
-        discord_logger = logging.getLogger("discord")
-        discord_logger.setLevel(logging.INFO)
-        for handler in handlers:
-            discord_logger.addHandler(handler)
-        discord_logger.addHandler(console_handler)
-
-        # aiosqliteのロガーレベルをINFOに設定
-        aiosqlite_logger = logging.getLogger("aiosqlite")
-        aiosqlite_logger.setLevel(logging.INFO)
-        for handler in handlers:
-            aiosqlite_logger.addHandler(handler)
-        aiosqlite_logger.addHandler(console_handler)
-
-        # PILのロガーレベルをINFOに設定
-        pil_logger = logging.getLogger("PIL")
-        pil_logger.setLevel(logging.INFO)
-        for handler in handlers:
-            pil_logger.addHandler(handler)
-        pil_logger.addHandler(console_handler)
+        """ロギングの設定（書き込みは専用スレッドで行う）"""
+        self.log_listener: QueueListener = setup_logging(
+            PATHS["log_dir"],
+            LOG_RETENTION_DAYS,
+            [logger.name, "bot", "discord", "aiosqlite", "PIL"],
+            LOG_FORMAT
+        )
+        self.log_listener.start()
 
     async def setup_hook(self) -> None:
         # 並行にDB初期化, Extension読み込み, Cog追加を実行
@@ -281,11 +196,26 @@ class SwiftlyBot(commands.AutoShardedBot):
             self.add_cog(PrometheusCog(self))
         )
         await asyncio.gather(db_task, ext_task, cog_task)
+        await self.stats.start()
+        self._lag_probe = asyncio.create_task(run_loop_lag_probe())
         self.observer.schedule(self.cog_reloader, str(PATHS["cogs_dir"]), recursive=True)
         self.observer.start()
         logger.info("Started watching cogs directory and subdirectories for changes")
         await self.tree.sync()
 
+    async def _run_event(self, coro, event_name: str, *args, **kwargs) -> None:
+        # すべてのイベントハンドラの処理時間を記録する
+        await observe_event_handler(
+            lambda: super(SwiftlyBot, self)._run_event(coro, event_name, *args, **kwargs),
+            event_name,
+            coro
+        )
+
+    async def close(self) -> None:
+        if self._lag_probe:
+            self._lag_probe.cancel()
+        await super().close()
+
     async def _load_extensions(self) -> None:
         tasks = []
         for file in PATHS["cogs_dir"].glob("**/*.py"):
@@ -323,7 +253,7 @@ class SwiftlyBot(commands.AutoShardedBot):
 
         count = len(unique_users)
         logger.info("Unique user count: %s", count)
-        self.user_count.update_count(count)
+        self.stats.set_user_count(count)
 
     async def on_ready(self) -> None:
         """準備完了時の処理"""
@@ -441,6 +371,11 @@ def main() -> None:
         bot.observer.stop()
         bot.observer.join()
         loop.run_until_complete(bot.db.cleanup())
+        loop.run_until_complete(bot.http_client.close())
+        bot.role_queue.close()
+        loop.run_until_complete(bot.stats.stop())
+        # 残っているログを書き出してから終了
+        bot.log_listener.stop()
 
 if __name__ == "__main__":
     main()
@@ -46,13 +46,10 @@ class AntiInvite(commands.Cog):
         self.data_dir = Path(os.getcwd()) / "data"
         self.data_dir.mkdir(exist_ok=True)
 
-        self._session: Optional[aiohttp.ClientSession] = None
         self._url_cache: deque[str] = deque(maxlen=1000)  # キャッシュの最大サイズを1000に設定
         self._db_pool: Optional[asyncpg.Pool] = None  # 接続プールを追加
 
     async def cog_load(self) -> None:
-        self._session = aiohttp.ClientSession()
-
         try:
             self._db_pool = await asyncpg.create_pool(**DB_CONFIG)  # 接続プールを作成
             async with self._db_pool.acquire() as conn:
@@ -75,9 +72,6 @@ class AntiInvite(commands.Cog):
             print(f"Error initializing database: {e}")
 
     async def cog_unload(self) -> None:
-        if self._session:
-            await self._session.close()
-            self._session = None
         if self._db_pool:
             await self._db_pool.close()  # 接続プールを閉じる
 
@@ -160,9 +154,6 @@ class AntiInvite(commands.Cog):
         if not urls:
             return False
 
-        if not self._session:
-            self._session = aiohttp.ClientSession()
-
         for url in urls:
             try:
                 parsed = urlparse(url)
@@ -179,17 +170,19 @@ class AntiInvite(commands.Cog):
 
                 # 短縮URLの展開
                 try:
-                    async with self._session.head(
+                    async with self.bot.http_client.head(
                         url,
                         allow_redirects=True,
-                        timeout=5
+                        timeout=aiohttp.ClientTimeout(total=5),
+                        retries=0
                     ) as response:
                         final_url = str(response.url)
                 except Exception:
-                    async with self._session.get(
+                    async with self.bot.http_client.get(
                         url,
                         allow_redirects=True,
-                        timeout=5
+                        timeout=aiohttp.ClientTimeout(total=5),
+                        retries=0
                     ) as response:
                         final_url = str(response.url)
 
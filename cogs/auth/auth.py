@@ -10,6 +10,8 @@ from dotenv import load_dotenv
 import os
 import asyncpg
 
+from module.http_client import HTTPClient
+
 API_BASE_URL: Final[str] = "https://captcha.evex.land/api/captcha"
 TIMEOUT_SECONDS: Final[int] = 30
 MIN_DIFFICULTY: Final[int] = 1
@@ -39,12 +41,12 @@ SUCCESS_MESSAGES: Final[dict] = {
 logger = logging.getLogger(__name__)
 
 class PersistentAuthView(discord.ui.View):
-    def __init__(self, message_id: int, role_id: int, difficulty: int, session: aiohttp.ClientSession):
+    def __init__(self, message_id: int, role_id: int, difficulty: int, http_client: HTTPClient):
         super().__init__(timeout=None)
         self.message_id = message_id
         self.role_id = role_id
         self.difficulty = difficulty
-        self.session = session
+        self.http_client = http_client
         button = discord.ui.Button(
             label="認証する",
             style=discord.ButtonStyle.primary,
@@ -73,7 +75,7 @@ class PersistentAuthView(discord.ui.View):
     async def fetch_captcha(self) -> tuple[Optional[bytes], Optional[str], Optional[str]]:
         url = f"{API_BASE_URL}?difficulty={self.difficulty}"
         try:
-            async with self.session.get(url) as response:
+            async with self.http_client.get(url) as response:
                 if response.status != 200:
                     return None, None, ERROR_MESSAGES["fetch_failed"]
                 data = await response.json()
@@ -146,7 +148,6 @@ class PersistentAuthModal(discord.ui.Modal):
 class Auth(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self._session: Optional[aiohttp.ClientSession] = None
         # 型をasyncpgのConnectionに変更
         self.conn: Optional[asyncpg.Connection] = None
 
@@ -163,19 +164,15 @@ class Auth(commands.Cog):
         )
 
     async def cog_load(self) -> None:
-        self._session = aiohttp.ClientSession()
         # 接続先をasyncpg用に変更
         self.conn = await asyncpg.connect(DATABASE_URL)
         await self._initialize_db()
         rows = await self.conn.fetch("SELECT message_id, channel_id, role_id, difficulty FROM panels")
         for row in rows:
-            view = PersistentAuthView(row["message_id"], row["role_id"], row["difficulty"], self._session)
+            view = PersistentAuthView(row["message_id"], row["role_id"], row["difficulty"], self.bot.http_client)
             self.bot.add_view(view)
 
     async def cog_unload(self) -> None:
-        if self._session:
-            await self._session.close()
-            self._session = None
         if self.conn:
             await self.conn.close()
             self.conn = None
@@ -205,7 +202,7 @@ class Auth(commands.Cog):
             color=discord.Color.green()
         )
         message = await interaction.channel.send(embed=embed)
-        view = PersistentAuthView(message.id, role.id, difficulty, self._session)
+        view = PersistentAuthView(message.id, role.id, difficulty, self.bot.http_client)
         self.bot.add_view(view)
         await message.edit(view=view)
         await self.conn.execute(
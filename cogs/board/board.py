@@ -1,6 +1,7 @@
+import asyncio
 import datetime
 from pathlib import Path
-from typing import Final, Optional, Tuple
+from typing import Final, List, Optional, Tuple
 import logging
 import asyncpg
 import discord
@@ -9,10 +10,14 @@ from discord.ext import commands, tasks
 import os
 from dotenv import load_dotenv
 
+from module.metrics import UP_REMINDERS
+
 load_dotenv()
 
 UP_COOLDOWN: Final[int] = 7200  # 2時間（秒）
 REMINDER_MESSAGE: Final[str] = "2時間経ちました！/upしてね！"
+REMINDER_CONCURRENCY: Final[int] = 10  # 同時に送信するリマインダーの数
+SERVERS_CHANGED_CHANNEL: Final[str] = "servers_changed"  # webapiのサーバー一覧キャッシュを破棄させる通知
 ERROR_MESSAGES: Final[dict] = {
 	"already_registered": "このサーバーは既に登録されています。",
 	"db_error": "DBエラーが発生しました。時間をおいて再度お試しください。\nエラー: {}",
@@ -134,7 +139,6 @@ class ServerBoard(commands.Cog):
 		self.pool_main = None
 		self.pool_up = None
 		self.setup_database_task = None  # タスクの参照を保持
-		self.check_up_reminder.start()
 
 	async def cog_load(self) -> None:
 		# dotenv から接続情報を読み込み
@@ -159,6 +163,8 @@ class ServerBoard(commands.Cog):
 
 		# setup_database タスクを開始
 		self.setup_database_task = self.bot.loop.create_task(self.setup_database())
+		# プールができてから開始する（__init__ で開始すると pool_up が None のまま走る）
+		self.check_up_reminder.start()
 
 	async def cog_unload(self) -> None:
 		if self.setup_database_task:
@@ -186,6 +192,13 @@ class ServerBoard(commands.Cog):
 					)
 					"""
 				)
+				# webapiのキーセットページネーション用
+				await conn.execute(
+					"""
+					CREATE INDEX IF NOT EXISTS servers_last_up_time_idx
+					ON servers (last_up_time DESC NULLS LAST, server_id DESC)
+					"""
+				)
 			async with self.pool_up.acquire() as conn:
 				await conn.execute(
 					"""
@@ -211,6 +224,13 @@ class ServerBoard(commands.Cog):
 						ADD CONSTRAINT up_channels_server_id_unique UNIQUE (server_id)
 						"""
 					)
+				# 期限を迎えた行だけを引けるようにする
+				await conn.execute(
+					"""
+					CREATE INDEX IF NOT EXISTS up_channels_last_up_time_idx
+					ON up_channels (last_up_time)
+					"""
+				)
 		except asyncpg.exceptions.DuplicateObjectError:
 			# 制約が既に存在する場合は無視
 			pass
@@ -220,18 +240,72 @@ class ServerBoard(commands.Cog):
 	@tasks.loop(minutes=1)
 	async def check_up_reminder(self) -> None:
 		try:
-			current_time = datetime.datetime.now()
+			# 期限 (last_up_time + UP_COOLDOWN) を過ぎた行だけを取り出す
+			deadline = datetime.datetime.now() - datetime.timedelta(seconds=UP_COOLDOWN)
+			async with self.pool_up.acquire() as conn:
+				rows = await conn.fetch(
+					"""
+					SELECT server_id, channel_id FROM up_channels
+					WHERE last_up_time <= $1
+					""",
+					deadline
+				)
+		except Exception as e:
+			UP_REMINDERS.labels(result="db_error").inc()
+			logger.error(f"check_up_reminder error: {e}", exc_info=True)
+			return
+		if not rows:
+			return
+
+		semaphore = asyncio.Semaphore(REMINDER_CONCURRENCY)
+		# 送信済み、または二度と送れない（権限がない・チャンネルが消えた）行。
+		# 一時的な失敗（429や5xx）の行は残して次の周期で再送する
+		done: List[int] = []
+
+		async def send(row: asyncpg.Record) -> None:
+			guild = self.bot.get_guild(row["server_id"])
+			channel = guild.get_channel(row["channel_id"]) if guild else None
+			if not channel:
+				UP_REMINDERS.labels(result="missing_channel").inc()
+				done.append(row["server_id"])
+				return
+			async with semaphore:
+				try:
+					await channel.send(REMINDER_MESSAGE)
+				except (discord.Forbidden, discord.NotFound) as e:
+					UP_REMINDERS.labels(result="failed").inc()
+					logger.warning(f"Dropping up reminder for {row['channel_id']}: {e}")
+					done.append(row["server_id"])
+					return
+				except discord.HTTPException as e:
+					UP_REMINDERS.labels(result="failed").inc()
+					logger.warning(f"Failed to send up reminder to {row['channel_id']}, will retry: {e}")
+					return
+			UP_REMINDERS.labels(result="sent").inc()
+			done.append(row["server_id"])
+
+		await asyncio.gather(*(send(row) for row in rows))
+		if not done:
+			return
+		try:
+			# 送信中に再度/upされた行（last_up_timeが新しくなった行）は消さない
 			async with self.pool_up.acquire() as conn:
-				rows = await conn.fetch("SELECT server_id, channel_id, last_up_time FROM up_channels")
-				for row in rows:
-					last_up = row["last_up_time"]
-					if (current_time - last_up).total_seconds() >= UP_COOLDOWN:
-						if guild := self.bot.get_guild(row["server_id"]):
-							if channel := guild.get_channel(row["channel_id"]):
-								await channel.send(REMINDER_MESSAGE)
-						await conn.execute("DELETE FROM up_channels WHERE server_id = $1", row["server_id"])
+				await conn.execute(
+					"""
+					DELETE FROM up_channels
+					WHERE server_id = ANY($1) AND last_up_time <= $2
+					""",
+					done,
+					deadline
+				)
 		except Exception as e:
-			pass
+			UP_REMINDERS.labels(result="db_error").inc()
+			logger.error(f"check_up_reminder delete error: {e}", exc_info=True)
+
+	@check_up_reminder.before_loop
+	async def before_check_up_reminder(self) -> None:
+		# ギルドのキャッシュが揃う前にチャンネルを引くと、存在しないと誤判定する
+		await self.bot.wait_until_ready()
 
 	async def create_server_invite(self, guild: discord.Guild) -> Tuple[Optional[discord.Invite], Optional[str]]:
 		"""サーバーの招待リンクを作成"""
@@ -326,7 +400,8 @@ class ServerBoard(commands.Cog):
 
 				if last_up_time:
 					try:
-						last_up = datetime.datetime.fromisoformat(last_up_time)
+						# TIMESTAMP列はdatetimeで返るが、古いデータは文字列の場合がある
+						last_up = last_up_time if isinstance(last_up_time, datetime.datetime) else datetime.datetime.fromisoformat(last_up_time)
 					except ValueError as e:
 						logger.error(f"up_rank: Failed to parse last_up_time: {last_up_time}, error: {e}")
 						await interaction.followup.send(
@@ -355,6 +430,7 @@ class ServerBoard(commands.Cog):
 					current_time,  # current_time をそのまま渡すが明示的にキャスト
 					interaction.guild.id
 				)
+				await conn.execute("SELECT pg_notify($1, $2)", SERVERS_CHANGED_CHANNEL, str(interaction.guild.id))
 			async with self.pool_up.acquire() as conn:
 				await conn.execute(
 					"""
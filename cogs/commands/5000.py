@@ -17,15 +17,6 @@ class Yen5000(commands.Cog):
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self._session: aiohttp.ClientSession | None = None
-
-    async def cog_load(self) -> None:
-        self._session = aiohttp.ClientSession()
-
-    async def cog_unload(self) -> None:
-        if self._session:
-            await self._session.close()
-            self._session = None
 
     @discord.app_commands.command(name="5000", description="5000兆円ジェネレーター")
     async def yen5000(self, interaction: discord.Interaction, top: str, bottom: str) -> None:
@@ -37,11 +28,8 @@ class Yen5000(commands.Cog):
         await interaction.response.defer(thinking=True)
 
         try:
-            if not self._session:
-                self._session = aiohttp.ClientSession()
-
             params = {"top": top, "bottom": bottom}
-            async with self._session.get(API_URL, params=params) as response:
+            async with self.bot.http_client.get(API_URL, params=params) as response:
                 if response.status != 200:
                     await interaction.followup.send(
                         f"{ERROR_MESSAGE} (Status: {response.status})",
@@ -122,15 +122,6 @@ class Captcha(commands.Cog):
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self._session: Optional[aiohttp.ClientSession] = None
-
-    async def cog_load(self) -> None:
-        self._session = aiohttp.ClientSession()
-
-    async def cog_unload(self) -> None:
-        if self._session:
-            await self._session.close()
-            self._session = None
 
     def _create_captcha_embed(
         self,
@@ -151,11 +142,8 @@ class Captcha(commands.Cog):
         self,
         difficulty: int
     ) -> tuple[Optional[bytes], Optional[str], Optional[str]]:
-        if not self._session:
-            self._session = aiohttp.ClientSession()
-
         try:
-            async with self._session.get(
+            async with self.bot.http_client.get(
                 f"{API_BASE_URL}?difficulty={difficulty}"
             ) as response:
                 if response.status != 200:
@@ -1,6 +1,6 @@
+import aiohttp
 import discord
 from discord.ext import commands
-import aiohttp
 import io
 from typing import Final, Optional
 import logging
@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 
 API_BASE_URL: Final[str] = "https://image-ai.evex.land"
 MAX_PROMPT_LENGTH: Final[int] = 1000
+GENERATION_TIMEOUT: Final[int] = 300  # 生成には時間がかかるため共有クライアントの既定値より長く待つ
 
 ERROR_MESSAGES: Final[dict] = {
     "generation_failed": "画像の生成に失敗しました。時間をおいて再度お試しください。",
@@ -30,15 +31,6 @@ class ImageGen(commands.Cog):
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self._session: Optional[aiohttp.ClientSession] = None
-
-    async def cog_load(self) -> None:
-        self._session = aiohttp.ClientSession()
-
-    async def cog_unload(self) -> None:
-        if self._session:
-            await self._session.close()
-            self._session = None
 
     def _validate_prompt(self, prompt: str) -> tuple[bool, Optional[str]]:
         if len(prompt) > MAX_PROMPT_LENGTH:
@@ -74,12 +66,11 @@ class ImageGen(commands.Cog):
         self,
         prompt: str
     ) -> Optional[bytes]:
-        if not self._session:
-            self._session = aiohttp.ClientSession()
-
         try:
-            async with self._session.get(
-                f"{API_BASE_URL}/?prompt={prompt}"
+            async with self.bot.http_client.get(
+                f"{API_BASE_URL}/?prompt={prompt}",
+                timeout=aiohttp.ClientTimeout(total=GENERATION_TIMEOUT),
+                retries=0  # 再試行すると上流で生成がやり直される
             ) as response:
                 if response.status == 200:
                     return await response.read()
@@ -11,6 +11,8 @@ from datetime import datetime, timedelta
 API_BASE_URL: Final[str] = "http://ip-api.com/json"
 RATE_LIMIT_SECONDS: Final[int] = 60
 REQUEST_TIMEOUT: Final[int] = 10
+CACHE_TTL: Final[int] = 3600
+NEGATIVE_CACHE_TTL: Final[int] = 600
 
 ERROR_MESSAGES: Final[dict] = {
     "invalid_ip": "無効なIPアドレスです。",
@@ -41,17 +43,8 @@ class IP(commands.Cog):
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self._session: Optional[aiohttp.ClientSession] = None
         self._last_uses: Dict[int, datetime] = {}
 
-    async def cog_load(self) -> None:
-        self._session = aiohttp.ClientSession()
-
-    async def cog_unload(self) -> None:
-        if self._session:
-            await self._session.close()
-            self._session = None
-
     def _validate_ip(self, ip_addr: str) -> bool:
         ipv4_pattern = r"^(\d{1,3}\.){3}\d{1,3}$"
         ipv6_pattern = r"^([0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}$"
@@ -106,27 +99,36 @@ class IP(commands.Cog):
 
         return embed
 
-    async def _fetch_ip_info(self, ip_addr: str) -> Optional[dict]:
-        if not self._session:
-            self._session = aiohttp.ClientSession()
+    async def _request_ip_info(self, ip_addr: str) -> Optional[dict]:
+        async with self.bot.http_client.get(
+            f"{API_BASE_URL}/{ip_addr}",
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        ) as response:
+            if response.status != 200:
+                raise aiohttp.ClientResponseError(
+                    response.request_info,
+                    response.history,
+                    status=response.status
+                )
 
-        try:
-            async with self._session.get(
-                f"{API_BASE_URL}/{ip_addr}",
-                timeout=REQUEST_TIMEOUT
-            ) as response:
-                if response.status != 200:
-                    logger.warning(
-                        "API error for IP %s: %d", ip_addr, response.status
-                    )
-                    return None
-
-                data = await response.json()
-                if data.get("status") != "success":
-                    return None
-
-                return data
+            data = await response.json()
+            if data.get("status") != "success":
+                return None
 
+            return data
+
+    async def _fetch_ip_info(self, ip_addr: str) -> Optional[dict]:
+        try:
+            return await self.bot.response_cache.get_or_fetch(
+                "ip",
+                ip_addr,
+                lambda: self._request_ip_info(ip_addr),
+                ttl=CACHE_TTL,
+                negative_ttl=NEGATIVE_CACHE_TTL
+            )
+        except aiohttp.ClientResponseError as e:
+            logger.warning("API error for IP %s: %d", ip_addr, e.status)
+            return None
         except Exception as e:
             logger.error("Error fetching IP info: %s", e, exc_info=True)
             return None
@@ -10,6 +10,8 @@ from datetime import datetime, timedelta
 SKIN_BASE_URL: Final[str] = "https://mineskin.eu"
 MOJANG_API_URL: Final[str] = "https://api.mojang.com/users/profiles/minecraft"
 RATE_LIMIT_SECONDS: Final[int] = 30
+CACHE_TTL: Final[int] = 3600
+NEGATIVE_CACHE_TTL: Final[int] = 300
 USERNAME_PATTERN: Final[str] = r"^[a-zA-Z0-9_]{2,16}$"
 
 SKIN_VIEWS: Final[dict] = {
@@ -34,17 +36,8 @@ class MinecraftSkin(commands.Cog):
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self._session: Optional[aiohttp.ClientSession] = None
         self._last_uses = {}
 
-    async def cog_load(self) -> None:
-        self._session = aiohttp.ClientSession()
-
-    async def cog_unload(self) -> None:
-        if self._session:
-            await self._session.close()
-            self._session = None
-
     def _validate_username(self, username: str) -> bool:
         return bool(re.match(USERNAME_PATTERN, username))
 
@@ -60,18 +53,36 @@ class MinecraftSkin(commands.Cog):
                 return True, remaining
         return False, None
 
+    async def _request_minecraft_user(
+        self,
+        username: str
+    ) -> Optional[bool]:
+        async with self.bot.http_client.get(
+            f"{MOJANG_API_URL}/{username}"
+        ) as response:
+            if response.status == 200:
+                return True
+            if response.status in (204, 404):
+                return None
+            raise aiohttp.ClientResponseError(
+                response.request_info,
+                response.history,
+                status=response.status
+            )
+
     async def _verify_minecraft_user(
         self,
         username: str
     ) -> bool:
-        if not self._session:
-            self._session = aiohttp.ClientSession()
-
         try:
-            async with self._session.get(
-                f"{MOJANG_API_URL}/{username}"
-            ) as response:
-                return response.status == 200
+            exists = await self.bot.response_cache.get_or_fetch(
+                "skin",
+                username,
+                lambda: self._request_minecraft_user(username),
+                ttl=CACHE_TTL,
+                negative_ttl=NEGATIVE_CACHE_TTL
+            )
+            return bool(exists)
         except Exception as e:
             logger.error(
                 "Error verifying Minecraft user: %s",
@@ -12,6 +12,7 @@ logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 RATE_LIMIT_SECONDS: Final[int] = 30
+CACHE_TTL: Final[int] = 60
 
 class Minecraft(commands.Cog):
     def __init__(self, bot):
@@ -28,6 +29,16 @@ class Minecraft(commands.Cog):
                 return True, remaining
         return False, None
 
+    async def _fetch_server_status(self, url: str) -> dict:
+        async with self.bot.http_client.get(url) as response:
+            logger.debug("Request URL: %s", url)
+            logger.debug("Response status: %s", response.status)
+            if response.status != 200:
+                raise aiohttp.ClientError(f"HTTP Error: {response.status}")
+            data = await response.json()
+            logger.debug("Response data: %s", data)
+            return data
+
     @app_commands.command(name="minecraft", description="Get the status of a Minecraft server")
     async def minecraft(self, interaction: discord.Interaction, address: str):
         # プライバシーモードのユーザーを無視
@@ -47,41 +58,38 @@ class Minecraft(commands.Cog):
         url = f"https://api.mcsrvstat.us/3/{address}"
         icon_url = f"https://api.mcsrvstat.us/icon/{address}"
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    # レート制限の更新
-                    self._last_uses[interaction.user.id] = datetime.now()
-
-                    logger.debug("Request URL: %s", url)
-                    logger.debug("Response status: %s", response.status)
-                    if response.status != 200:
-                        raise aiohttp.ClientError(f"HTTP Error: {response.status}")
-                    data = await response.json()
-                    logger.debug("Response data: %s", data)
+            data = await self.bot.response_cache.get_or_fetch(
+                "minecraft",
+                address,
+                lambda: self._fetch_server_status(url),
+                ttl=CACHE_TTL
+            )
+            # レート制限の更新
+            self._last_uses[interaction.user.id] = datetime.now()
 
-                    if data["online"]:
-                        embed = discord.Embed(title=f"Server Status for {address}", color=discord.Color.green())
-                        embed.set_thumbnail(url=icon_url)
-                        embed.add_field(name="IP", value=data.get("ip", "N/A"), inline=False)
-                        embed.add_field(name="Port", value=data.get("port", "N/A"), inline=False)
-                        embed.add_field(name="Version", value=data.get("version", "N/A"), inline=False)
-                        embed.add_field(name="Players Online", value=f"{data["players"]["online"]}/{data["players"]["max"]}", inline=False)
-                        if "hostname" in data:
-                            embed.add_field(name="Hostname", value=data["hostname"], inline=False)
-                        if "motd" in data:
-                            embed.add_field(name="MOTD", value="\n".join(data["motd"]["clean"]), inline=False)
-                        if "plugins" in data:
-                            plugins = ", ".join([plugin["name"] for plugin in data["plugins"]])
-                            embed.add_field(name="Plugins", value=plugins, inline=False)
-                        if "mods" in data:
-                            mods = ", ".join([mod["name"] for mod in data["mods"]])
-                            embed.add_field(name="Mods", value=mods, inline=False)
-                    else:
-                        embed = discord.Embed(title=f"Server Status for {address}", color=discord.Color.red())
-                        embed.set_thumbnail(url=icon_url)
-                        embed.add_field(name="Status", value="Offline", inline=False)
+            if data["online"]:
+                embed = discord.Embed(title=f"Server Status for {address}", color=discord.Color.green())
+                embed.set_thumbnail(url=icon_url)
+                embed.add_field(name="IP", value=data.get("ip", "N/A"), inline=False)
+                embed.add_field(name="Port", value=data.get("port", "N/A"), inline=False)
+                embed.add_field(name="Version", value=data.get("version", "N/A"), inline=False)
+                embed.add_field(name="Players Online", value=f"{data["players"]["online"]}/{data["players"]["max"]}", inline=False)
+                if "hostname" in data:
+                    embed.add_field(name="Hostname", value=data["hostname"], inline=False)
+                if "motd" in data:
+                    embed.add_field(name="MOTD", value="\n".join(data["motd"]["clean"]), inline=False)
+                if "plugins" in data:
+                    plugins = ", ".join([plugin["name"] for plugin in data["plugins"]])
+                    embed.add_field(name="Plugins", value=plugins, inline=False)
+                if "mods" in data:
+                    mods = ", ".join([mod["name"] for mod in data["mods"]])
+                    embed.add_field(name="Mods", value=mods, inline=False)
+            else:
+                embed = discord.Embed(title=f"Server Status for {address}", color=discord.Color.red())
+                embed.set_thumbnail(url=icon_url)
+                embed.add_field(name="Status", value="Offline", inline=False)
 
-                    await interaction.followup.send(embed=embed)
+            await interaction.followup.send(embed=embed)
         except aiohttp.ClientError as e:
             logger.error("ClientError: %s", e)
             await interaction.followup.send(f"Failed to retrieve server status: {e}", ephemeral=True)
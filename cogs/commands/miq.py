@@ -2,7 +2,6 @@ import discord
 from discord.ext import commands
 from lib.miq import MakeItQuote
 from PIL import Image
-import aiohttp
 from io import BytesIO
 import logging
 import asyncio
@@ -16,16 +15,8 @@ class MakeItQuoteCog(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
         self.miq = MakeItQuote()
-        self.session = None
         self.avatar_cache = {}  # Cache for avatar images
 
-    async def cog_load(self) -> None:
-        self.session = aiohttp.ClientSession()
-
-    async def cog_unload(self) -> None:
-        if self.session:
-            await self.session.close()
-
     @commands.command(
         name="miq",
         description="返信先のメッセージとその人のアイコンでMake It Quoteを作成します"
@@ -55,7 +46,7 @@ class MakeItQuoteCog(commands.Cog):
                 if avatar_url in self.avatar_cache:
                     avatar_image = self.avatar_cache[avatar_url]
                 else:
-                    async with self.session.get(avatar_url) as response:
+                    async with self.bot.http_client.get(avatar_url) as response:
                         if response.status != 200:
                             raise Exception(f"アバター画像の取得に失敗しました: {response.status}")
                         avatar_bytes = await response.read()
@@ -12,6 +12,8 @@ PACKAGE_MANAGERS: Final[Dict[str, str]] = {
 }
 
 RATE_LIMIT_SECONDS: Final[int] = 10
+CACHE_TTL: Final[int] = 600
+NEGATIVE_CACHE_TTL: Final[int] = 300
 
 ERROR_MESSAGES: Final[dict] = {
     "invalid_manager": "無効なパッケージマネージャーです。'npm'または'pip'を使用してください。",
@@ -71,17 +73,8 @@ class PackageSearch(commands.Cog):
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self._session: Optional[aiohttp.ClientSession] = None
         self._last_uses = {}
 
-    async def cog_load(self) -> None:
-        self._session = aiohttp.ClientSession()
-
-    async def cog_unload(self) -> None:
-        if self._session:
-            await self._session.close()
-            self._session = None
-
     def _check_rate_limit(
         self,
         user_id: int
@@ -121,27 +114,42 @@ class PackageSearch(commands.Cog):
 
         return embed
 
-    async def _fetch_package_info(
+    async def _request_package_info(
         self,
         manager: Literal["npm", "pip"],
         package: str
     ) -> Optional[PackageInfo]:
-        if not self._session:
-            self._session = aiohttp.ClientSession()
-
-        try:
-            url = PACKAGE_MANAGERS[manager].format(package)
-            async with self._session.get(url) as response:
-                if response.status != 200:
-                    return None
-
-                data = await response.json()
-                return (
-                    PackageInfo.from_npm_data(data)
-                    if manager == "npm"
-                    else PackageInfo.from_pip_data(data)
+        url = PACKAGE_MANAGERS[manager].format(package)
+        async with self.bot.http_client.get(url) as response:
+            if response.status == 404:
+                return None
+            if response.status != 200:
+                raise aiohttp.ClientResponseError(
+                    response.request_info,
+                    response.history,
+                    status=response.status
                 )
 
+            data = await response.json()
+            return (
+                PackageInfo.from_npm_data(data)
+                if manager == "npm"
+                else PackageInfo.from_pip_data(data)
+            )
+
+    async def _fetch_package_info(
+        self,
+        manager: Literal["npm", "pip"],
+        package: str
+    ) -> Optional[PackageInfo]:
+        try:
+            return await self.bot.response_cache.get_or_fetch(
+                f"package_{manager}",
+                package,
+                lambda: self._request_package_info(manager, package),
+                ttl=CACHE_TTL,
+                negative_ttl=NEGATIVE_CACHE_TTL
+            )
         except Exception as e:
             logger.error("Error fetching package info: %s", e, exc_info=True)
             return None
@@ -1,22 +1,25 @@
 import asyncio
+import heapq
+import time
 from datetime import datetime, timedelta
 import discord
 from discord import app_commands
 from discord.ext import commands
-import hashlib
 import json
 import os
 import pytz
 import asyncpg
 from dotenv import load_dotenv
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 
 RATE_LIMIT_SECONDS = 5  # コマンドのレート制限
 VOTE_RATE_LIMIT_SECONDS = 2  # 投票アクションのレート制限
 CLEANUP_DAYS = 1  # 終了した投票を保持する日数
 MAX_OPTIONS = 5  # 最大選択肢数（Discordの制限に合わせる）
-RECOVER = True  # BOT再起動時にアクティブな投票を復元するかどうか(レートリミット注意)
+RECONCILE = True  # BOT再起動時に投票メッセージの表示を最新の集計に合わせるかどうか
+RECONCILE_INTERVAL = 2  # 表示合わせでメッセージを編集する間隔（秒、レートリミット対策）
+EMBED_UPDATE_INTERVAL = 3  # 投票数表示を更新する最短間隔（秒）
 
 
 DURATION_CHOICES = [
@@ -35,10 +38,113 @@ def encrypt_user_id(user_id: int) -> str:
     return str(user_id)
 
 
-def get_vote_hash(poll_id: int, user_id: int) -> str:
-    """投票確認用のハッシュを生成"""
-    data = f"{poll_id}:{user_id}".encode()
-    return hashlib.sha256(data).hexdigest()
+# 投票の記録。投票・更新・有効確認の3文を1往復で実行する
+# 後段のUPDATEで同じ行を更新するため、最初から更新用のロックを取る
+# （FOR SHAREだと同時に投票した2人が互いの共有ロックを待ってデッドロックする）
+RECORD_VOTE_QUERY = """
+    WITH poll AS (
+        SELECT id FROM polls
+        WHERE id = $1 AND is_active = true
+        FOR NO KEY UPDATE
+    ), inserted AS (
+        INSERT INTO votes (poll_id, encrypted_user_id, choice)
+        SELECT id, $2, $3 FROM poll
+        ON CONFLICT (poll_id, encrypted_user_id) DO NOTHING
+        RETURNING poll_id
+    )
+    UPDATE polls
+    SET total_votes = total_votes + 1,
+        vote_counts[$3 + 1] = vote_counts[$3 + 1] + 1
+    WHERE id IN (SELECT poll_id FROM inserted)
+    RETURNING total_votes
+"""
+IS_POLL_ACTIVE_QUERY = "SELECT is_active FROM polls WHERE id = $1"
+
+
+class PollStore:
+    """投票データのPostgreSQL操作を行うクラス
+
+    クエリは固定文字列で発行し、asyncpgの接続ごとのプリペアドステートメント
+    キャッシュにより2回目以降は解析なしで実行される。
+    """
+
+    def __init__(self, pool: asyncpg.Pool):
+        self.pool = pool
+
+    async def init_schema(self):
+        """必要なテーブルを作成"""
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                # pollsテーブルを作成
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS polls (
+                        id SERIAL PRIMARY KEY,
+                        title TEXT NOT NULL,
+                        description TEXT,
+                        creator_id BIGINT NOT NULL,
+                        end_time DOUBLE PRECISION NOT NULL,
+                        is_active BOOLEAN NOT NULL DEFAULT true,
+                        options TEXT NOT NULL,
+                        channel_id BIGINT,
+                        message_id BIGINT,
+                        total_votes INTEGER DEFAULT 0
+                    )
+                """)
+                # DiscordのIDはINTEGERに収まらないため既存テーブルをBIGINTへ移行
+                narrow_columns = await conn.fetchval("""
+                    SELECT COUNT(*) FROM information_schema.columns
+                    WHERE table_name = 'polls'
+                    AND column_name IN ('creator_id', 'channel_id')
+                    AND data_type = 'integer'
+                """)
+                if narrow_columns:
+                    await conn.execute("""
+                        ALTER TABLE polls
+                        ALTER COLUMN creator_id TYPE BIGINT,
+                        ALTER COLUMN channel_id TYPE BIGINT
+                    """)
+                # votesテーブルを作成
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS votes (
+                        poll_id INTEGER NOT NULL,
+                        encrypted_user_id TEXT NOT NULL,
+                        choice INTEGER NOT NULL
+                    )
+                """)
+                # 1ユーザー1票を一意制約で保証（vote_checksの代わり）
+                await conn.execute("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS votes_poll_user_idx
+                    ON votes (poll_id, encrypted_user_id)
+                """)
+                # 選択肢ごとの投票数カウンタを追加し、既存の投票から集計
+                has_counts = await conn.fetchval("""
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = 'polls' AND column_name = 'vote_counts'
+                """)
+                if not has_counts:
+                    await conn.execute(f"""
+                        ALTER TABLE polls ADD COLUMN vote_counts INTEGER[] NOT NULL
+                        DEFAULT '{{{",".join(["0"] * MAX_OPTIONS)}}}'
+                    """)
+                    await conn.execute(f"""
+                        UPDATE polls p SET
+                            vote_counts = ARRAY(
+                                SELECT COUNT(v.poll_id)::INTEGER
+                                FROM generate_series(0, {MAX_OPTIONS - 1}) AS g(i)
+                                LEFT JOIN votes v ON v.poll_id = p.id AND v.choice = g.i
+                                GROUP BY g.i ORDER BY g.i
+                            ),
+                            total_votes = (SELECT COUNT(*) FROM votes WHERE poll_id = p.id)
+                    """)
+
+    async def record_vote(self, poll_id: int, user_id: int, choice: int) -> Optional[int]:
+        """投票を記録して新しい総投票数を返す。終了済み・投票済みの場合はNone"""
+        async with self.pool.acquire() as conn:
+            return await conn.fetchval(RECORD_VOTE_QUERY, poll_id, encrypt_user_id(user_id), choice)
+
+    async def is_poll_active(self, poll_id: int) -> bool:
+        async with self.pool.acquire() as conn:
+            return bool(await conn.fetchval(IS_POLL_ACTIVE_QUERY, poll_id))
 
 
 class PollView(discord.ui.View):
@@ -84,52 +190,15 @@ class PollButton(discord.ui.Button):
 
         await interaction.response.defer(ephemeral=True)
 
+        poll_cog = interaction.client.get_cog("Poll")
         try:
-            async with self.db_pool.acquire() as db:
-                async with db.transaction():
-                    # 投票が有効かチェック
-                    async with db.execute("SELECT is_active FROM polls WHERE id = ?", (self.poll_id,)) as cursor:
-                        poll = await cursor.fetchone()
-                        if not poll or not poll[0]:
-                            await interaction.followup.send("この投票はもう終了しているよ", ephemeral=True)
-                            return
-
-                    # ユーザーが既に投票しているかチェック
-                    vote_hash = get_vote_hash(
-                        self.poll_id, interaction.user.id)
-                    async with db.execute("SELECT 1 FROM vote_checks WHERE vote_hash = ?", (vote_hash,)) as cursor:
-                        if await cursor.fetchone():
-                            await interaction.followup.send("既に投票済みだよ", ephemeral=True)
-                            return
-
-                    # 暗号化されたユーザーIDと投票データを保存
-                    encrypted_user_id = encrypt_user_id(interaction.user.id)
-                    await db.execute("""
-                        INSERT INTO votes (poll_id, encrypted_user_id, choice)
-                        VALUES (?, ?, ?)
-                    """, (self.poll_id, encrypted_user_id, self.option_id))
-
-                    # 投票チェック用のハッシュを保存
-                    await db.execute("INSERT INTO vote_checks (vote_hash) VALUES (?)", (vote_hash,))
-
-                    # 投票数を更新
-                    await db.execute("""
-                        UPDATE polls
-                        SET total_votes = (
-                            SELECT COUNT(*)
-                            FROM votes
-                            WHERE poll_id = ?
-                        )
-                        WHERE id = ?
-                    """, (self.poll_id, self.poll_id))
-
-                    await db.commit()
-
-                # 現在の投票数を取得
-                async with db.execute("SELECT total_votes FROM polls WHERE id = ?", (self.poll_id,)) as cursor:
-                    result = await cursor.fetchone()
-                    total_votes = result[0] if result else 0
-
+            total_votes = await poll_cog.store.record_vote(self.poll_id, interaction.user.id, self.option_id)
+            if total_votes is None:
+                if await poll_cog.store.is_poll_active(self.poll_id):
+                    await interaction.followup.send("既に投票済みだよ", ephemeral=True)
+                else:
+                    await interaction.followup.send("この投票はもう終了しているよ", ephemeral=True)
+                return
         except Exception as e:
             print(f"データベース接続エラー: {e}")
             await interaction.followup.send("システムエラーが発生したよ。もう一度試してね", ephemeral=True)
@@ -138,37 +207,57 @@ class PollButton(discord.ui.Button):
         # レート制限を更新
         self._last_uses[interaction.user.id] = datetime.now()
 
-        # 投票メッセージを更新
-        try:
-            async with self.db_pool.acquire() as db:
-                async with db.execute("SELECT channel_id, message_id FROM polls WHERE id = ?", (self.poll_id,)) as cursor:
-                    poll_location = await cursor.fetchone()
+        # 投票メッセージの更新はまとめて行う
+        poll_cog.request_embed_update(self.poll_id)
 
-            if poll_location and poll_location[0] and poll_location[1]:
-                channel_id, message_id = poll_location
-                channel = interaction.guild.get_channel(channel_id)
+        await interaction.followup.send(f"投票を受け付けたよ（現在の投票数: {total_votes}票）", ephemeral=True)
 
-                if channel:
-                    try:
-                        message = await channel.fetch_message(message_id)
-                        if message.embeds and len(message.embeds) > 0:
-                            embed = message.embeds[0]
-                            for i, field in enumerate(embed.fields):
-                                if field.name == "🗳️ 投票数":
-                                    embed.set_field_at(
-                                        i,
-                                        name="🗳️ 投票数",
-                                        value=str(total_votes),
-                                        inline=False
-                                    )
-                                    await message.edit(embed=embed)
-                                    break
-                    except (discord.NotFound, discord.Forbidden, discord.HTTPException) as e:
-                        print(f"投票メッセージの更新中にエラーが発生しました: {e}")
-        except Exception as e:
-            print(f"投票数の更新中にエラーが発生しました: {e}")
 
-        await interaction.followup.send(f"投票を受け付けたよ（現在の投票数: {total_votes}票）", ephemeral=True)
+def create_poll_embed(title: str, description: str, end_time: float, total_votes: int) -> discord.Embed:
+    """投票中の表示用Embedを作成"""
+    end_dt = datetime.fromtimestamp(end_time, pytz.timezone("Asia/Tokyo"))
+    embed = discord.Embed(
+        title=f"📊 {title}",
+        description=f"🔒 **匿名投票**\n\n{description or '投票を開始するよ'}",
+        color=discord.Color.blue()
+    )
+    embed.add_field(
+        name="⏰ 終了時刻",
+        value=f"{end_dt.strftime('%Y/%m/%d %H:%M')} (JST)\n<t:{int(end_time)}:R>",
+        inline=False
+    )
+    embed.add_field(
+        name="🗳️ 投票数",
+        value=str(total_votes),
+        inline=False
+    )
+    return embed
+
+
+def create_result_embed(title: str, options: List[str], vote_counts: Dict[int, int], total_votes: int, auto: bool = False) -> discord.Embed:
+    """投票結果表示用のEmbedを作成"""
+    embed = discord.Embed(
+        title=f"📊 投票結果: {title}" + (" (自動終了)" if auto else ""),
+        description="🔒 この投票は匿名で実施されたよ",
+        color=discord.Color.green()
+    )
+
+    max_votes = max(vote_counts.values()) if vote_counts else 0
+    for i, option in enumerate(options):
+        votes = vote_counts.get(i, 0)
+        percentage = (votes / total_votes * 100) if total_votes > 0 else 0
+        bar_length = int(
+            percentage / 5 * total_votes / max_votes) if max_votes > 0 else 0
+        progress_bar = "█" * bar_length + \
+            "▁" * (20 - bar_length)
+        embed.add_field(
+            name=option,
+            value=f"{progress_bar} {votes}票 ({percentage:.1f}%)",
+            inline=False
+        )
+
+    embed.set_footer(text=f"総投票数: {total_votes}票")
+    return embed
 
 
 class Poll(commands.Cog):
@@ -176,12 +265,28 @@ class Poll(commands.Cog):
         self.bot = bot
         load_dotenv()  # 環境変数をロード
         self.db_pool = None  # db_poolを初期化
-        self.bot.loop.create_task(self.init_db_pool())  # DBプールの初期化を非同期で実行
+        self.store: Optional[PollStore] = None
         self._last_uses = {}
-        self.bot.loop.create_task(self.cleanup_old_polls())
-        self.bot.loop.create_task(self.check_ended_polls())
-        if RECOVER:
-            self.bot.loop.create_task(self.recover_active_polls())
+        # 終了時刻の最小ヒープ (end_time, poll_id)
+        self._deadlines: List[Tuple[float, int]] = []
+        self._deadline_changed = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        # 投票数表示の更新待ち (poll_id -> 更新タスク)
+        self._embed_updates: Dict[int, asyncio.Task] = {}
+
+    async def cog_load(self) -> None:
+        await self.init_db_pool()  # DBプールを初期化
+        active_polls = await self.restore_poll_views()
+        self._tasks.append(asyncio.create_task(self.cleanup_old_polls()))
+        self._tasks.append(asyncio.create_task(self.run_expiry_scheduler()))
+        if RECONCILE and active_polls:
+            self._tasks.append(asyncio.create_task(self.reconcile_poll_messages(active_polls)))
+
+    async def cog_unload(self) -> None:
+        for task in self._tasks + list(self._embed_updates.values()):
+            task.cancel()
+        if self.db_pool:
+            await self.db_pool.close()
 
     def _check_rate_limit(self, user_id: int) -> tuple[bool, Optional[int]]:
         now = datetime.now()
@@ -199,102 +304,81 @@ class Poll(commands.Cog):
         user = os.environ.get("DB_USER")
         password = os.environ.get("DB_PASSWORD")
         self.db_pool = await asyncpg.create_pool(user=user, password=password, database="poll", host=host, port=port)
-        await self.init_db()  # テーブルを初期化
+        self.store = PollStore(self.db_pool)
+        await self.store.init_schema()  # テーブルを初期化
 
-    async def init_db(self):
-        """必要なテーブルを作成"""
-        async with self.db_pool.acquire() as conn:
-            async with conn.transaction():
-                # pollsテーブルを作成
-                await conn.execute("""
-                    CREATE TABLE IF NOT EXISTS polls (
-                        id SERIAL PRIMARY KEY,
-                        title TEXT NOT NULL,
-                        description TEXT,
-                        creator_id INTEGER NOT NULL,
-                        end_time DOUBLE PRECISION NOT NULL,
-                        is_active BOOLEAN NOT NULL DEFAULT true,
-                        options TEXT NOT NULL,
-                        channel_id INTEGER,
-                        message_id BIGINT,
-                        total_votes INTEGER DEFAULT 0
-                    )
-                """)
-                # votesテーブルを作成
-                await conn.execute("""
-                    CREATE TABLE IF NOT EXISTS votes (
-                        poll_id INTEGER NOT NULL,
-                        encrypted_user_id TEXT NOT NULL,
-                        choice INTEGER NOT NULL
-                    )
-                """)
-                # vote_checksテーブルを作成
-                await conn.execute("""
-                    CREATE TABLE IF NOT EXISTS vote_checks (
-                        vote_hash TEXT PRIMARY KEY
-                    )
-                """)
+    def request_embed_update(self, poll_id: int) -> None:
+        """投票数表示の更新を予約（投票ごとではなく一定間隔でまとめて編集）"""
+        if poll_id not in self._embed_updates:
+            self._embed_updates[poll_id] = asyncio.create_task(self._flush_embed_update(poll_id))
 
-    async def recover_active_polls(self):
-        """アクティブな投票の状態を復元"""
-        await self.bot.wait_until_ready()
+    async def _flush_embed_update(self, poll_id: int) -> None:
+        try:
+            await asyncio.sleep(EMBED_UPDATE_INTERVAL)
+        finally:
+            # これ以降の投票は次回の更新に回す
+            self._embed_updates.pop(poll_id, None)
+        await self._edit_poll_message(poll_id)
+
+    async def _edit_poll_message(self, poll_id: int) -> None:
+        """投票メッセージのEmbedを現在の投票数で編集"""
         try:
             async with self.db_pool.acquire() as conn:
-                async with conn.transaction():
-                    rows = await conn.fetch("""
-                        SELECT id, title, options, channel_id, message_id, total_votes
-                        FROM polls
-                        WHERE is_active = true
-                    """)
-                    active_polls = rows
-
-                for poll in active_polls:
-                    poll_id = poll["id"]
-                    title = poll["title"]
-                    options_str = poll["options"]
-                    channel_id = poll["channel_id"]
-                    message_id = poll["message_id"]
-                    total_votes = poll["total_votes"]
-                    options = options_str.split(",")
-
-                    # チャンネルとメッセージを取得
-                    for guild in self.bot.guilds:
-                        channel = guild.get_channel(channel_id)
-                        if channel:
-                            try:
-                                # 古いメッセージを削除
-                                if message_id:
-                                    try:
-                                        message = await channel.fetch_message(message_id)
-                                        await message.delete()
-                                    except:
-                                        pass
-
-                                # 新しい投票メッセージを作成
-                                embed = discord.Embed(
-                                    title=f"📊 {title}",
-                                    description="🔒 **匿名投票**\n\n(BOTの再起動により再作成されました)",
-                                    color=discord.Color.blue()
-                                )
-                                embed.add_field(
-                                    name="🗳️ 投票数",
-                                    value=str(total_votes),
-                                    inline=False
-                                )
-
-                                view = PollView(options, poll_id)
-                                message = await channel.send(embed=embed, view=view)
-
-                                # 新しいメッセージIDを保存
-                                await conn.execute(
-                                    "UPDATE polls SET message_id = $1 WHERE id = $2",
-                                    (message.id, poll_id)
-                                )
-                                break
-                            except Exception as e:
-                                print(f"投票の復元中にエラーが発生: {e}")
+                poll = await conn.fetchrow("""
+                    SELECT title, description, end_time, channel_id, message_id, total_votes
+                    FROM polls
+                    WHERE id = $1 AND is_active = true
+                """, poll_id)
+            if not poll or not poll["channel_id"] or not poll["message_id"]:
+                return
+
+            channel = self.bot.get_channel(poll["channel_id"])
+            if not channel:
+                return
+            embed = create_poll_embed(poll["title"], poll["description"], poll["end_time"], poll["total_votes"])
+            await channel.get_partial_message(poll["message_id"]).edit(embed=embed)
+        except discord.NotFound:
+            # メッセージが削除されている場合は以後編集しない（結果は終了時に投稿される）
+            try:
+                async with self.db_pool.acquire() as conn:
+                    await conn.execute("UPDATE polls SET message_id = NULL WHERE id = $1", poll_id)
+            except Exception as e:
+                print(f"投票メッセージの削除記録中にエラーが発生しました: {e}")
+        except (discord.Forbidden, discord.HTTPException) as e:
+            print(f"投票メッセージの更新中にエラーが発生しました: {e}")
         except Exception as e:
-            print(f"アクティブな投票の復元中にエラーが発生: {e}")
+            print(f"投票数の更新中にエラーが発生しました: {e}")
+
+    async def restore_poll_views(self) -> List[int]:
+        """アクティブな投票のボタンを永続Viewとして再登録
+
+        custom_id (poll_{id}_{option}) は投票ごとに固定なので、既存のメッセージに
+        Viewを紐付け直すだけでボタンが再び反応する。Discord APIは呼び出さない。
+        """
+        async with self.db_pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT id, options, message_id
+                FROM polls
+                WHERE is_active = true AND message_id IS NOT NULL
+            """)
+
+        for poll in rows:
+            self.bot.add_view(PollView(poll["options"].split(","), poll["id"]), message_id=poll["message_id"])
+        return [poll["id"] for poll in rows]
+
+    async def reconcile_poll_messages(self, poll_ids: List[int]):
+        """停止中に反映されなかった投票数表示を、間隔を空けて順に更新"""
+        await self.bot.wait_until_ready()
+        queue: asyncio.Queue = asyncio.Queue()
+        for poll_id in poll_ids:
+            queue.put_nowait(poll_id)
+
+        while not queue.empty():
+            poll_id = await queue.get()
+            # 稼働中に投票があれば通常の更新に任せる
+            if poll_id not in self._embed_updates:
+                await self._edit_poll_message(poll_id)
+            await asyncio.sleep(RECONCILE_INTERVAL)
 
     async def cleanup_old_polls(self):
         """終了した古い投票を定期的に削除"""
@@ -311,13 +395,6 @@ class Poll(commands.Cog):
                                 AND end_time < $1
                             )
                         """, cleanup_time.timestamp())
-                        # 投票チェックデータを削除
-                        await conn.execute("""
-                            DELETE FROM vote_checks WHERE vote_hash IN (
-                                SELECT vote_hash FROM vote_checks
-                                WHERE vote_hash LIKE $1
-                            )
-                        """, f"%{cleanup_time.timestamp()}%")
                         # 投票自体を削除
                         await conn.execute("""
                             DELETE FROM polls
@@ -328,88 +405,77 @@ class Poll(commands.Cog):
                 print(f"Error in cleanup_old_polls: {e}")
             await asyncio.sleep(86400)  # 24時間ごとに実行
 
-    async def check_ended_polls(self):
-        """終了時間を過ぎた投票を自動的に終了する"""
+    def schedule_poll_end(self, poll_id: int, end_time: float) -> None:
+        """投票の終了時刻をスケジューラに登録"""
+        heapq.heappush(self._deadlines, (end_time, poll_id))
+        self._deadline_changed.set()
+
+    def unschedule_poll_end(self, poll_id: int) -> None:
+        """手動終了した投票をスケジューラから外す"""
+        self._deadlines = [d for d in self._deadlines if d[1] != poll_id]
+        heapq.heapify(self._deadlines)
+        self._deadline_changed.set()
+
+    async def run_expiry_scheduler(self):
+        """次の終了時刻まで待機し、時刻になった投票を終了する"""
+        async with self.db_pool.acquire() as conn:
+            rows = await conn.fetch("SELECT id, end_time FROM polls WHERE is_active = true")
+        for row in rows:
+            heapq.heappush(self._deadlines, (row["end_time"], row["id"]))
+        await self.bot.wait_until_ready()
+
         while True:
+            self._deadline_changed.clear()
+            if not self._deadlines:
+                await self._deadline_changed.wait()
+                continue
+
+            end_time, poll_id = self._deadlines[0]
+            delay = end_time - time.time()
+            if delay > 0:
+                # 新しい投票の追加・手動終了があれば待機し直す
+                try:
+                    await asyncio.wait_for(self._deadline_changed.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._deadlines)
             try:
-                current_time = datetime.now().timestamp()
-                async with self.db_pool.acquire() as conn:
-                    async with conn.transaction():
-                        rows = await conn.fetch("""
-                            SELECT id, title, options, end_time, channel_id, message_id
-                            FROM polls
-                            WHERE is_active = true
-                            AND end_time < $1
-                        """, current_time)
-                        ended_polls = rows
-                        for poll in ended_polls:
-                            poll_id = poll["id"]
-                            title = poll["title"]
-                            options = poll["options"].split(",")
-                            # 投票を終了状態に更新
-                            await conn.execute("UPDATE polls SET is_active = false WHERE id = $1", poll_id)
-                            # 投票結果集計
-                            vote_counts = {i: 0 for i in range(len(options))}
-                            total_votes = 0
-                            results = await conn.fetch("""
-                                SELECT choice, COUNT(*) as votes
-                                FROM votes
-                                WHERE poll_id = $1
-                                GROUP BY choice
-                            """, poll_id)
-                            for r in results:
-                                vote_counts[r["choice"]] = r["votes"]
-                                total_votes += r["votes"]
-
-                            # 結果表示用のEmbed作成
-                            embed = discord.Embed(
-                                title=f"📊 投票結果: {title} (自動終了)",
-                                description="🔒 この投票は匿名で実施されました",
-                                color=discord.Color.green()
-                            )
+                await self.finish_poll(poll_id)
+            except Exception as e:
+                print(f"Error in finish_poll: {e}")
 
-                            max_votes = max(vote_counts.values()
-                                            ) if vote_counts else 0
-                            for i, option in enumerate(options):
-                                votes = vote_counts.get(i, 0)
-                                percentage = (
-                                    votes / total_votes * 100) if total_votes > 0 else 0
-                                bar_length = int(
-                                    percentage / 5 * total_votes / max_votes) if max_votes > 0 else 0
-                                progress_bar = "█" * bar_length + \
-                                    "▁" * (20 - bar_length)
-                                embed.add_field(
-                                    name=option,
-                                    value=f"{progress_bar} {votes}票 ({percentage:.1f}%)",
-                                    inline=False
-                                )
-
-                            embed.set_footer(
-                                text=f"総投票数: {total_votes}票")
-
-                            # チャンネルを取得して結果を送信
-                            if poll[4]:
-                                for guild in self.bot.guilds:
-                                    channel = guild.get_channel(poll[3])
-                                    if channel:
-                                        try:
-                                            await channel.send("投票の終了時間になったよ", embed=embed)
-
-                                            if poll[5]:
-                                                try:
-                                                    original_message = await channel.fetch_message(poll[5])
-                                                    await original_message.delete()
-                                                except:
-                                                    pass
-
-                                            break
-                                        except Exception as e:
-                                            print(f"投票結果の送信中にエラーが発生しました: {e}")
+    async def finish_poll(self, poll_id: int):
+        """終了時間を過ぎた投票を終了し、結果を投稿する"""
+        async with self.db_pool.acquire() as conn:
+            async with conn.transaction():
+                # 手動で終了済みの場合は何もしない
+                poll = await conn.fetchrow("""
+                    UPDATE polls SET is_active = false
+                    WHERE id = $1 AND is_active = true
+                    RETURNING title, options, channel_id, message_id, vote_counts, total_votes
+                """, poll_id)
+                if not poll:
+                    return
 
-            except Exception as e:
-                print(f"Error in check_ended_polls: {e}")
+        options = poll["options"].split(",")
+        vote_counts = {i: poll["vote_counts"][i] for i in range(len(options))}
+        embed = create_result_embed(poll["title"], options, vote_counts, poll["total_votes"], auto=True)
 
-            await asyncio.sleep(10)
+        # チャンネルを取得して結果を送信
+        channel = self.bot.get_channel(poll["channel_id"]) if poll["channel_id"] else None
+        if not channel:
+            return
+        try:
+            await channel.send("投票の終了時間になったよ", embed=embed)
+            if poll["message_id"]:
+                try:
+                    await channel.get_partial_message(poll["message_id"]).delete()
+                except discord.HTTPException:
+                    pass
+        except Exception as e:
+            print(f"投票結果の送信中にエラーが発生しました: {e}")
 
     @app_commands.command(name="poll", description="匿名投票の作成・管理")
     @app_commands.choices(
@@ -480,21 +546,7 @@ class Poll(commands.Cog):
                         """, title, description or "", interaction.user.id, end_time.timestamp(), options, interaction.channel_id)
                         poll_id = row["id"]
 
-                embed = discord.Embed(
-                    title=f"📊 {title}",
-                    description=f"🔒 **匿名投票**\n\n{description or '投票を開始するよ'}",
-                    color=discord.Color.blue()
-                )
-                embed.add_field(
-                    name="⏰ 終了時刻",
-                    value=f"{end_time.strftime('%Y/%m/%d %H:%M')} (JST)\n<t:{int(end_time.timestamp())}:R>",
-                    inline=False
-                )
-                embed.add_field(
-                    name="🗳️ 投票数",
-                    value="0",
-                    inline=False
-                )
+                embed = create_poll_embed(title, description, end_time.timestamp(), 0)
 
                 view = PollView(option_list, poll_id)
                 message = await interaction.followup.send(embed=embed, view=view)
@@ -503,6 +555,7 @@ class Poll(commands.Cog):
                 async with self.db_pool.acquire() as conn:
                     await conn.execute("UPDATE polls SET message_id = $1 WHERE id = $2", message.id, poll_id)
 
+                self.schedule_poll_end(poll_id, end_time.timestamp())
                 self._last_uses[interaction.user.id] = datetime.now()
 
             except Exception as e:
@@ -532,50 +585,24 @@ class Poll(commands.Cog):
                     try:
                         async with self.db_pool.acquire() as conn:
                             async with conn.transaction():
-                                await conn.execute("UPDATE polls SET is_active = false WHERE id = $1", poll_id)
-                                results = await conn.fetch("""
-                                    SELECT p.title, p.options, v.choice, COUNT(*) as votes
-                                    FROM polls p
-                                    LEFT JOIN votes v ON p.id = v.poll_id
-                                    WHERE p.id = $1
-                                    GROUP BY p.title, p.options, v.choice
+                                # 締め切りで終了済みなら何もしない（結果の二重投稿を防ぐ）
+                                result = await conn.fetchrow("""
+                                    UPDATE polls SET is_active = false
+                                    WHERE id = $1 AND is_active = true
+                                    RETURNING title, options, vote_counts, total_votes
                                 """, poll_id)
+                        self.unschedule_poll_end(poll_id)
 
-                        if not results:
-                            await select_interaction.response.send_message("エラーが発生したよ", ephemeral=True)
+                        if not result:
+                            await select_interaction.response.send_message("この投票はもう終了しているよ", ephemeral=True)
                             return
 
-                        title = results[0]["title"]
-                        options_list = results[0]["options"].split(",")
-                        vote_counts = {i: 0 for i in range(len(options_list))}
-                        total_votes = 0
-                        for r in results:
-                            if r["choice"] is not None:
-                                vote_counts[r["choice"]] = r["votes"]
-                                total_votes += r["votes"]
-
-                        embed = discord.Embed(
-                            title=f"📊 投票結果: {title}",
-                            description="🔒 この投票は匿名で実施されたよ",
-                            color=discord.Color.green()
-                        )
-
-                        max_votes = max(vote_counts.values()
-                                        ) if vote_counts else 0
-                        for i, option in enumerate(options_list):
-                            votes = vote_counts.get(i, 0)
-                            percentage = (votes / total_votes * 100) if total_votes > 0 else 0
-                            bar_length = int(
-                                percentage / 5 * total_votes / max_votes) if max_votes > 0 else 0
-                            progress_bar = "█" * bar_length + \
-                                "▁" * (20 - bar_length)
-                            embed.add_field(
-                                name=option,
-                                value=f"{progress_bar} {votes}票 ({percentage:.1f}%)",
-                                inline=False
-                            )
+                        title = result["title"]
+                        options_list = result["options"].split(",")
+                        vote_counts = {i: result["vote_counts"][i] for i in range(len(options_list))}
+                        total_votes = result["total_votes"]
 
-                        embed.set_footer(text=f"総投票数: {total_votes}票")
+                        embed = create_result_embed(title, options_list, vote_counts, total_votes)
 
                         await select_interaction.response.send_message("投票を終了したよ", ephemeral=True)
                         await interaction.channel.send(embed=embed)
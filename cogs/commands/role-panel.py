@@ -1,7 +1,7 @@
 import json
 import logging
 import os
-from typing import Optional
+from typing import Dict, Optional, Union
 
 import discord
 from discord import app_commands
@@ -21,6 +21,20 @@ DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = "role_panel"
 
+EmojiKey = Union[int, str]  # カスタム絵文字はID、Unicode絵文字は文字そのもの
+
+
+def emoji_key(emoji: Union[str, discord.PartialEmoji]) -> EmojiKey:
+    """絵文字をリアクションイベントと照合できるキーに変換する"""
+    if isinstance(emoji, str):
+        emoji = discord.PartialEmoji.from_str(emoji)
+    return emoji.id or emoji.name
+
+
+async def _init_connection(conn: asyncpg.Connection):
+    """JSONB列をdictとして読み書きできるようにする"""
+    await conn.set_type_codec("jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
 class RolePanel(commands.Cog):
     """ユーザーがリアクションを通じてロールを取得できるパネルを管理するコグ"""
 
@@ -28,6 +42,8 @@ class RolePanel(commands.Cog):
         self.bot = bot
         self.db_pool: Optional[asyncpg.Pool] = None  # データベース接続プール
         self.panels = {}
+        # パネルID -> {絵文字キー: ロールID}（リアクション時の検索用）
+        self._reaction_roles: Dict[int, Dict[EmojiKey, int]] = {}
 
     async def cog_load(self):
         """Cogがロードされたときにデータベース接続プールを初期化"""
@@ -36,8 +52,10 @@ class RolePanel(commands.Cog):
             port=DB_PORT,
             user=DB_USER,
             password=DB_PASSWORD,
-            database=DB_NAME
+            database=DB_NAME,
+            init=_init_connection
         )
+        await self._init_db()
         await self._load_panels()
 
     async def cog_unload(self):
@@ -45,46 +63,105 @@ class RolePanel(commands.Cog):
         if self.db_pool:
             await self.db_pool.close()
 
+    async def _init_db(self):
+        """テーブルを作成し、roles列をJSONBへ移行する"""
+        async with self.db_pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS role_panels (
+                        panel_id BIGINT PRIMARY KEY,
+                        title TEXT NOT NULL,
+                        description TEXT,
+                        channel_id BIGINT NOT NULL,
+                        guild_id BIGINT NOT NULL,
+                        roles JSONB NOT NULL DEFAULT '{}'
+                    )
+                """)
+                # 以前はTEXTにJSON文字列を保存していた
+                roles_type = await conn.fetchval("""
+                    SELECT data_type FROM information_schema.columns
+                    WHERE table_name = 'role_panels' AND column_name = 'roles'
+                """)
+                if roles_type != "jsonb":
+                    await conn.execute("ALTER TABLE role_panels ALTER COLUMN roles TYPE JSONB USING roles::jsonb")
+                # upsertのため、主キーのない既存テーブルにも一意制約を付ける
+                await conn.execute("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS role_panels_panel_id_idx
+                    ON role_panels (panel_id)
+                """)
+
     async def _load_panels(self):
         """データベースからロールパネル情報を読み込む"""
         try:
             async with self.db_pool.acquire() as conn:
-                rows = await conn.fetch("SELECT * FROM role_panels")
+                rows = await conn.fetch("""
+                    SELECT panel_id, title, description, channel_id, guild_id, roles
+                    FROM role_panels
+                """)
                 self.panels = {
                     row["panel_id"]: {
                         "title": row["title"],
                         "description": row["description"],
                         "channel_id": row["channel_id"],
                         "guild_id": row["guild_id"],
-                        "roles": json.loads(row["roles"])
+                        "roles": row["roles"]
                     }
                     for row in rows
                 }
         except Exception as e:
             logger.error(f"ロールパネルデータの読み込みに失敗しました: {e}")
             self.panels = {}
+        self._reaction_roles = {}
+        for panel_id in self.panels:
+            self._index_panel(panel_id)
+
+    def _index_panel(self, panel_id: int):
+        """パネルのリアクション検索用インデックスを作り直す"""
+        panel_data = self.panels.get(panel_id)
+        if panel_data is None:
+            self._reaction_roles.pop(panel_id, None)
+            return
+        self._reaction_roles[panel_id] = {
+            emoji_key(emoji): role_data["role_id"]
+            for emoji, role_data in panel_data["roles"].items()
+        }
 
-    async def _save_panels(self):
-        """ロールパネル情報をデータベースに保存する"""
+    async def _save_panel(self, panel_id: int):
+        """1つのロールパネル情報をデータベースに保存する"""
+        self._index_panel(panel_id)
+        panel_data = self.panels[panel_id]
         try:
             async with self.db_pool.acquire() as conn:
-                await conn.execute("TRUNCATE TABLE role_panels")
-                for panel_id, panel_data in self.panels.items():
-                    await conn.execute(
-                        """
-                        INSERT INTO role_panels (panel_id, title, description, channel_id, guild_id, roles)
-                        VALUES ($1, $2, $3, $4, $5, $6)
-                        """,
-                        panel_id,
-                        panel_data["title"],
-                        panel_data["description"],
-                        panel_data["channel_id"],
-                        panel_data["guild_id"],
-                        json.dumps(panel_data["roles"])
-                    )
+                await conn.execute(
+                    """
+                    INSERT INTO role_panels (panel_id, title, description, channel_id, guild_id, roles)
+                    VALUES ($1, $2, $3, $4, $5, $6)
+                    ON CONFLICT (panel_id) DO UPDATE SET
+                        title = EXCLUDED.title,
+                        description = EXCLUDED.description,
+                        channel_id = EXCLUDED.channel_id,
+                        guild_id = EXCLUDED.guild_id,
+                        roles = EXCLUDED.roles
+                    """,
+                    panel_id,
+                    panel_data["title"],
+                    panel_data["description"],
+                    panel_data["channel_id"],
+                    panel_data["guild_id"],
+                    panel_data["roles"]
+                )
         except Exception as e:
             logger.error(f"ロールパネルデータの保存に失敗しました: {e}")
 
+    async def _delete_panel(self, panel_id: int):
+        """ロールパネル情報をデータベースから削除する"""
+        self._index_panel(panel_id)
+        try:
+            async with self.db_pool.acquire() as conn:
+                await conn.execute("DELETE FROM role_panels WHERE panel_id = $1", panel_id)
+        except Exception as e:
+            logger.error(f"ロールパネルデータの削除に失敗しました: {e}")
+
     async def get_or_fetch_message(self, channel_id: int, message_id: int) -> Optional[discord.Message]:
         """チャンネルとメッセージIDからメッセージを取得する"""
         try:
@@ -146,7 +223,7 @@ class RolePanel(commands.Cog):
             "guild_id": interaction.guild_id,
             "roles": {}
         }
-        self._save_panels()
+        await self._save_panel(message.id)
 
         await interaction.edit_original_response(
             content=f"ロールパネルが作成されました！\nパネルID: `{message.id}`\n"
@@ -213,7 +290,7 @@ class RolePanel(commands.Cog):
             "role_name": role.name,
             "description": description
         }
-        self._save_panels()
+        await self._save_panel(panel_id)
 
         # パネルの埋め込みを更新
         embed = message.embeds[0]
@@ -281,7 +358,7 @@ class RolePanel(commands.Cog):
 
         # パネルからロールを削除
         del panel_data["roles"][emoji]
-        self._save_panels()
+        await self._save_panel(panel_id)
 
         # リアクションを削除
         try:
@@ -347,7 +424,7 @@ class RolePanel(commands.Cog):
 
         # パネルデータを削除
         del self.panels[panel_id]
-        self._save_panels()
+        await self._delete_panel(panel_id)
 
         await interaction.followup.send(f"ID: `{panel_id}` のロールパネルが削除されました。\n他のパネル管理には `/role-panel list` コマンドをご利用ください。", ephemeral=True)
 
@@ -456,49 +533,29 @@ class RolePanel(commands.Cog):
         if payload.user_id == self.bot.user.id:
             return
 
-        panel_id = payload.message_id
-        if panel_id not in self.panels:
+        reaction_roles = self._reaction_roles.get(payload.message_id)
+        if not reaction_roles:
             return
 
-        # 絵文字が Unicode か カスタム絵文字か確認
-        emoji = payload.emoji.name
-        if payload.emoji.id:
-            emoji = f"<:{payload.emoji.name}:{payload.emoji.id}>"
-
-        panel_data = self.panels[panel_id]
-        if emoji not in panel_data["roles"]:
+        # カスタム絵文字はID、Unicode絵文字は名前で照合
+        role_id = reaction_roles.get(payload.emoji.id or payload.emoji.name)
+        if role_id is None:
             return
 
-        role_id = panel_data["roles"][emoji]["role_id"]
         guild = self.bot.get_guild(payload.guild_id)
         if not guild:
             return
 
-        member = guild.get_member(payload.user_id)
-        if not member:
-            try:
-                member = await guild.fetch_member(payload.user_id)
-            except discord.HTTPException as e:
-                logger.error("Failed to fetch member: %s", e)
-                return
-
         role = guild.get_role(role_id)
         if not role:
             return
 
-        # ロールを付与
-        try:
-            await member.add_roles(role, reason="ロールパネルからの自動ロール付与")
-        except discord.HTTPException as e:
-            logger.error("Failed to add role: %s", e)
-            return
-
-        # DMでフィードバックを送る (任意)
-        try:
-            await member.send(f"**{guild.name}** サーバーで **{role.name}** ロールを取得しました！")
-        except discord.HTTPException:
-            pass  # DMが無効になっている場合は無視
-
+        # ロールの付与はギルドごとのキューでまとめて行う
+        self.bot.role_queue.add_role(
+            guild, payload.user_id, role,
+            reason="ロールパネルからの自動ロール付与",
+            notice=f"**{guild.name}** サーバーで **{role.name}** ロールを取得しました！"
+        )
 
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
@@ -507,48 +564,29 @@ class RolePanel(commands.Cog):
         if payload.user_id == self.bot.user.id:
             return
 
-        panel_id = payload.message_id
-        if panel_id not in self.panels:
+        reaction_roles = self._reaction_roles.get(payload.message_id)
+        if not reaction_roles:
             return
 
-        # 絵文字が Unicode か カスタム絵文字か確認
-        emoji = payload.emoji.name
-        if payload.emoji.id:
-            emoji = f"<:{payload.emoji.name}:{payload.emoji.id}>"
-
-        panel_data = self.panels[panel_id]
-        if emoji not in panel_data["roles"]:
+        # カスタム絵文字はID、Unicode絵文字は名前で照合
+        role_id = reaction_roles.get(payload.emoji.id or payload.emoji.name)
+        if role_id is None:
             return
 
-        role_id = panel_data["roles"][emoji]["role_id"]
         guild = self.bot.get_guild(payload.guild_id)
         if not guild:
             return
 
-        member = guild.get_member(payload.user_id)
-        if not member:
-            try:
-                member = await guild.fetch_member(payload.user_id)
-            except discord.HTTPException as e:
-                logger.error("Failed to fetch member: %s", e)
-                return
-
         role = guild.get_role(role_id)
         if not role:
             return
 
-        # ロールを削除
-        try:
-            await member.remove_roles(role, reason="ロールパネルからの自動ロール削除")
-        except discord.HTTPException as e:
-            logger.error("Failed to remove role: %s", e)
-            return
-
-        # DMでフィードバックを送る (任意)
-        try:
-            await member.send(f"**{guild.name}** サーバーで **{role.name}** ロールを削除しました。")
-        except discord.HTTPException:
-            pass  # DMが無効になっている場合は無視
+        # 直前の付与が未適用なら打ち消される
+        self.bot.role_queue.remove_role(
+            guild, payload.user_id, role,
+            reason="ロールパネルからの自動ロール削除",
+            notice=f"**{guild.name}** サーバーで **{role.name}** ロールを削除しました。"
+        )
 
 async def setup(bot):
     await bot.add_cog(RolePanel(bot))
@@ -11,6 +11,8 @@ import aiohttp
 import discord
 from discord.ext import commands
 
+from module.http_client import HTTPClient
+
 
 API_BASE_URLS: Final[dict] = {
     "python": "https://py-sandbox.evex.land/",
@@ -71,18 +73,18 @@ class CodeExecutor:
 
     async def execute(
         self,
-        session: aiohttp.ClientSession
+        http_client: HTTPClient
     ) -> Tuple[Optional[Dict[str, Any]], Optional[str], float]:
         headers = {"Content-Type": "application/json"}
         payload = {"code": self.code}
 
         try:
             start_time = time.monotonic()
-            async with session.post(
+            async with http_client.post(
                 API_BASE_URLS[self.language],
                 json=payload,
                 headers=headers,
-                timeout=EXECUTION_TIMEOUT
+                timeout=aiohttp.ClientTimeout(total=EXECUTION_TIMEOUT)
             ) as response:
                 end_time = time.monotonic()
                 elapsed_time = end_time - start_time
@@ -114,15 +116,6 @@ class Sandbox(commands.Cog):
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self._session: Optional[aiohttp.ClientSession] = None
-
-    async def cog_load(self) -> None:
-        self._session = aiohttp.ClientSession()
-
-    async def cog_unload(self) -> None:
-        if self._session and not self._session.closed:
-            await self._session.close()
-            self._session = None
 
     async def create_result_embed(
         self,
@@ -211,11 +204,8 @@ class Sandbox(commands.Cog):
 
             # コードの実行
             executor = CodeExecutor(code, language)
-            if not self._session:
-                self._session = aiohttp.ClientSession()
-
             result, error, elapsed_time = await executor.execute(
-                self._session
+                self.bot.http_client
             )
 
             # 結果の送信
@@ -2,7 +2,6 @@ import discord
 from discord.ext import commands
 from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont
-import aiohttp
 from textwrap import wrap
 import re
 from pytz import timezone
@@ -72,9 +71,8 @@ class Snapshot(commands.Cog):
             if getattr(ref_msg.author, "avatar", None)
             else ref_msg.author.default_avatar.url
         )
-        async with aiohttp.ClientSession() as session:
-            async with session.get(str(avatar_url)) as resp:
-                avatar_bytes = await resp.read()
+        async with self.bot.http_client.get(str(avatar_url)) as resp:
+            avatar_bytes = await resp.read()
         avatar = Image.open(BytesIO(avatar_bytes)).convert("RGBA").resize((avatar_size, avatar_size))
 
         mask = Image.new("L", (avatar_size, avatar_size), 0)
@@ -7,6 +7,8 @@ import logging
 from datetime import datetime, timedelta
 import pytz
 
+from module.http_client import HTTPClient
+
 
 API_BASE_URL: Final[str] = "https://api1.sakana11.org/api/ntp"
 RATE_LIMIT_SECONDS: Final[int] = 10
@@ -32,25 +34,14 @@ logger = logging.getLogger(__name__)
 class TimeAPI:
     """時間取得APIを管理するクラス"""
 
-    def __init__(self) -> None:
-        self._session: Optional[aiohttp.ClientSession] = None
-
-    async def initialize(self) -> None:
-        self._session = aiohttp.ClientSession()
-
-    async def cleanup(self) -> None:
-        if self._session:
-            await self._session.close()
-            self._session = None
+    def __init__(self, http_client: HTTPClient) -> None:
+        self._http = http_client
 
     async def get_current_time(self) -> Optional[Dict[str, Any]]:
-        if not self._session:
-            self._session = aiohttp.ClientSession()
-
         try:
-            async with self._session.get(
+            async with self._http.get(
                 API_BASE_URL,
-                timeout=REQUEST_TIMEOUT
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
             ) as response:
                 if response.status == 200:
                     return await response.json()
@@ -74,15 +65,7 @@ class Time(commands.Cog):
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self.api = TimeAPI()
-
-    async def cog_load(self) -> None:
-        """Cogのロード時にAPIを初期化"""
-        await self.api.initialize()
-
-    async def cog_unload(self) -> None:
-        """Cogのアンロード時にAPIをクリーンアップ"""
-        await self.api.cleanup()
+        self.api = TimeAPI(bot.http_client)
 
     def _format_time(self, time_str: str) -> str:
         try:
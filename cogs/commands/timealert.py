@@ -1,28 +1,52 @@
+import asyncio
+import time as time_module
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from datetime import datetime, timedelta, timezone
-from typing import Final, Optional, List
+from typing import Dict, Final, Optional, List, Set
 import logging
 from pathlib import Path
 import asyncpg
 from dotenv import load_dotenv
 import os
 
+from module.metrics import TIME_SIGNAL_DRIFT, TIME_SIGNAL_LATENESS, TIME_SIGNAL_SENDS
+
 
 JST: Final[timezone] = timezone(timedelta(hours=9))
 MAX_ALERTS_PER_CHANNEL: Final[int] = 3
 TIME_FORMAT: Final[str] = "%H:%M"
-CHECK_INTERVAL: Final[int] = 1  # minutes
+MINUTES_PER_DAY: Final[int] = 1440
 RATE_LIMIT_SECONDS: Final[int] = 30
+SEND_CONCURRENCY: Final[int] = 25  # 同時に送信する時報の数（グローバルレートリミット対策）
+MAX_CATCH_UP_MINUTES: Final[int] = 5  # 遅れて起きたときに送り直す分数の上限
 
 CREATE_TABLE_SQL: Final[str] = """
 CREATE TABLE IF NOT EXISTS alerts (
-    channel_id INTEGER,
+    channel_id BIGINT,
     alert_time TEXT,
     PRIMARY KEY (channel_id, alert_time)
 )
 """
 
+# DiscordのチャンネルIDはINTEGERに収まらないため既存テーブルをBIGINTへ移行
+MIGRATE_CHANNEL_ID_SQL: Final[str] = """
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'alerts' AND column_name = 'channel_id' AND data_type = 'integer'
+    ) THEN
+        ALTER TABLE alerts ALTER COLUMN channel_id TYPE BIGINT;
+    END IF;
+END $$
+"""
+
+# ゼロ埋めされていない旧形式（9:00 など）の時刻
+SELECT_UNNORMALIZED_SQL: Final[str] = r"""
+SELECT channel_id, alert_time FROM alerts WHERE alert_time !~ '^\d{2}:\d{2}$'
+"""
+
 ERROR_MESSAGES: Final[dict] = {
     "invalid_time": "時間のフォーマットが正しくありません。正しいフォーマットは HH:MM です。",
     "max_alerts": "このチャンネルにはすでに{}つの時報が設定されています。",
@@ -39,11 +63,28 @@ SUCCESS_MESSAGES: Final[dict] = {
 
 logger = logging.getLogger(__name__)
 
+
+def normalize_time(alert_time: str) -> str:
+    """9:5 のような入力を 09:05 にそろえる"""
+    return datetime.strptime(alert_time, TIME_FORMAT).strftime(TIME_FORMAT)
+
+
+def minute_of_day(alert_time: str) -> int:
+    """HH:MM を 0時からの経過分に変換"""
+    parsed = datetime.strptime(alert_time, TIME_FORMAT)
+    return parsed.hour * 60 + parsed.minute
+
+
 class AlertDatabase:
-    """時報DBを管理するクラス"""
+    """時報DBを管理するクラス
+
+    全件を1分単位の1440個のバケットとしてメモリに保持し、送信時はDBを参照しない。
+    """
 
     def __init__(self) -> None:
         self._pool: Optional[asyncpg.Pool] = None
+        self._buckets: List[Set[int]] = [set() for _ in range(MINUTES_PER_DAY)]
+        self._channel_alerts: Dict[int, Set[str]] = {}
 
     async def initialize(self) -> None:
         load_dotenv()
@@ -60,6 +101,59 @@ class AlertDatabase:
             database=DB_NAME
         )
         await self._pool.execute(CREATE_TABLE_SQL)
+        await self._pool.execute(MIGRATE_CHANNEL_ID_SQL)
+        await self._normalize_stored_times()
+        await self._load_index()
+
+    async def _normalize_stored_times(self) -> None:
+        """旧形式で保存された時刻を HH:MM に書き換える
+
+        以前は入力をそのまま保存していたため、解除コマンド（入力をゼロ埋めする）で
+        消せない行が残っている。書き換えた結果が既存の行と重なる場合は削除する。
+        """
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():
+                rows = await conn.fetch(SELECT_UNNORMALIZED_SQL)
+                for row in rows:
+                    try:
+                        normalized = normalize_time(row["alert_time"])
+                    except ValueError:
+                        continue  # 不正な値は _load_index で警告する
+                    inserted = await conn.fetchval("""
+                        INSERT INTO alerts (channel_id, alert_time) VALUES ($1, $2)
+                        ON CONFLICT (channel_id, alert_time) DO NOTHING
+                        RETURNING 1
+                    """, row["channel_id"], normalized)
+                    await conn.execute(
+                        "DELETE FROM alerts WHERE channel_id = $1 AND alert_time = $2",
+                        row["channel_id"], row["alert_time"]
+                    )
+                    if not inserted:
+                        logger.info("Dropped duplicate alert %r for channel %s", row["alert_time"], row["channel_id"])
+                if rows:
+                    logger.info("Normalized %d legacy alert times", len(rows))
+
+    async def _load_index(self) -> None:
+        rows = await self._pool.fetch("SELECT channel_id, alert_time FROM alerts")
+        self._buckets = [set() for _ in range(MINUTES_PER_DAY)]
+        self._channel_alerts = {}
+        for row in rows:
+            try:
+                self._index(row["channel_id"], row["alert_time"])
+            except ValueError:
+                logger.warning("Ignoring invalid alert time %r for channel %s", row["alert_time"], row["channel_id"])
+
+    def _index(self, channel_id: int, alert_time: str) -> None:
+        self._buckets[minute_of_day(alert_time)].add(channel_id)
+        self._channel_alerts.setdefault(channel_id, set()).add(alert_time)
+
+    def _unindex(self, channel_id: int, alert_time: str) -> None:
+        self._buckets[minute_of_day(alert_time)].discard(channel_id)
+        alerts = self._channel_alerts.get(channel_id)
+        if alerts is not None:
+            alerts.discard(alert_time)
+            if not alerts:
+                del self._channel_alerts[channel_id]
 
     async def cleanup(self) -> None:
         if self._pool:
@@ -69,28 +163,24 @@ class AlertDatabase:
     async def get_alert_count(self, channel_id: int) -> int:
         if not self._pool:
             await self.initialize()
-        async with self._pool.acquire() as conn:
-            count = await conn.fetchval("SELECT COUNT(*) FROM alerts WHERE channel_id = $1", channel_id)
-        return int(count)
+        return len(self._channel_alerts.get(channel_id, ()))
 
     async def add_alert(self, channel_id: int, alert_time: str) -> None:
         if not self._pool:
             await self.initialize()
         async with self._pool.acquire() as conn:
             await conn.execute("INSERT INTO alerts (channel_id, alert_time) VALUES ($1, $2)", channel_id, alert_time)
+        self._index(channel_id, alert_time)
 
     async def remove_alert(self, channel_id: int, alert_time: str) -> None:
         if not self._pool:
             await self.initialize()
         async with self._pool.acquire() as conn:
             await conn.execute("DELETE FROM alerts WHERE channel_id = $1 AND alert_time = $2", channel_id, alert_time)
+        self._unindex(channel_id, alert_time)
 
-    async def get_channels_for_time(self, alert_time: str) -> List[int]:
-        if not self._pool:
-            await self.initialize()
-        async with self._pool.acquire() as conn:
-            rows = await conn.fetch("SELECT channel_id FROM alerts WHERE alert_time = $1", alert_time)
-        return [row["channel_id"] for row in rows]
+    def get_channels_for_minute(self, minute: int) -> List[int]:
+        return list(self._buckets[minute])
 
 class TimeAlert(commands.Cog):
     """時報機能を提供"""
@@ -99,7 +189,14 @@ class TimeAlert(commands.Cog):
         self.bot = bot
         self.db = AlertDatabase()
         self._last_uses = {}
-        self.check_alerts.start()
+        self._scheduler: Optional[asyncio.Task] = None
+        self._send_tasks: Set[asyncio.Task] = set()
+        # 分をまたいで送信が重なっても、全体の同時送信数を抑える
+        self._send_semaphore = asyncio.Semaphore(SEND_CONCURRENCY)
+
+    async def cog_load(self) -> None:
+        await self.db.initialize()
+        self._scheduler = asyncio.create_task(self.run_scheduler())
 
     def _check_rate_limit(
         self,
@@ -120,6 +217,10 @@ class TimeAlert(commands.Cog):
         except ValueError:
             return False
 
+    def _normalize_time(self, time_str: str) -> str:
+        """9:5 のような入力を 09:05 にそろえる"""
+        return normalize_time(time_str)
+
     def _create_alert_embed(
         self,
         channel: discord.TextChannel,
@@ -181,6 +282,7 @@ class TimeAlert(commands.Cog):
                     ephemeral=True
                 )
                 return
+            time = self._normalize_time(time)
 
             # 時報数のチェック
             count = await self.db.get_alert_count(channel.id)
@@ -248,6 +350,7 @@ class TimeAlert(commands.Cog):
                     ephemeral=True
                 )
                 return
+            time = self._normalize_time(time)
 
             # 時報の削除
             await self.db.remove_alert(channel.id, time)
@@ -270,33 +373,71 @@ class TimeAlert(commands.Cog):
                 ephemeral=True
             )
 
-    @tasks.loop(minutes=CHECK_INTERVAL)
-    async def check_alerts(self) -> None:
-        """時報をチェックして送信"""
-        try:
-            now = datetime.now(JST).strftime(TIME_FORMAT)
-            channel_ids = await self.db.get_channels_for_time(now)
-
-            for channel_id in channel_ids:
-                if channel := self.bot.get_channel(channel_id):
-                    embed = discord.Embed(
-                        description=SUCCESS_MESSAGES["time_signal"].format(now),
-                        color=discord.Color.blue()
-                    )
-                    await channel.send(embed=embed)
+    async def run_scheduler(self) -> None:
+        """毎分0秒に起きて、その分のバケットの時報を送信
 
+        起きる時刻は固定の予定から決め、送信は分ごとに別タスクで行う。
+        送信が1分を超えても次の分は遅れず、ループが止まって起きそびれた分は
+        ``MAX_CATCH_UP_MINUTES`` 分まで遡って送る。
+        """
+        await self.bot.wait_until_ready()
+        target = (int(time_module.time()) // 60 + 1) * 60
+        while True:
+            await asyncio.sleep(max(0.0, target - time_module.time()))
+            now = time_module.time()
+            TIME_SIGNAL_DRIFT.observe(max(0.0, now - target))
+            oldest = (int(now) // 60 - MAX_CATCH_UP_MINUTES + 1) * 60
+            if target < oldest:
+                logger.warning("Time signal scheduler skipped %d minutes", (oldest - target) // 60)
+                target = oldest
+            while target <= now:
+                task = asyncio.create_task(self._run_send_alerts(target))
+                self._send_tasks.add(task)
+                task.add_done_callback(self._send_tasks.discard)
+                target += 60
+
+    async def _run_send_alerts(self, target: float) -> None:
+        try:
+            await self.send_alerts(target)
         except Exception as e:
-            logger.error("Error in check_alerts: %s", e, exc_info=True)
+            logger.error("Error in send_alerts: %s", e, exc_info=True)
 
-    @check_alerts.before_loop
-    async def before_check_alerts(self) -> None:
-        """時報チェック開始前の準備"""
-        await self.bot.wait_until_ready()
-        await self.db.initialize()
+    async def send_alerts(self, target: float) -> None:
+        """指定した分の時報を並行して送信"""
+        now = datetime.fromtimestamp(target, JST)
+        channel_ids = self.db.get_channels_for_minute(now.hour * 60 + now.minute)
+        if not channel_ids:
+            return
+
+        embed = discord.Embed(
+            description=SUCCESS_MESSAGES["time_signal"].format(now.strftime(TIME_FORMAT)),
+            color=discord.Color.blue()
+        )
+        async def send(channel: discord.abc.Messageable) -> None:
+            async with self._send_semaphore:
+                try:
+                    await channel.send(embed=embed)
+                except discord.HTTPException as e:
+                    TIME_SIGNAL_SENDS.labels(result="failed").inc()
+                    logger.warning("Failed to send time signal to %s: %s", channel.id, e)
+                    return
+            TIME_SIGNAL_SENDS.labels(result="sent").inc()
+            TIME_SIGNAL_LATENESS.observe(time_module.time() - target)
+
+        channels = []
+        for channel_id in channel_ids:
+            if channel := self.bot.get_channel(channel_id):
+                channels.append(channel)
+            else:
+                TIME_SIGNAL_SENDS.labels(result="missing_channel").inc()
+        await asyncio.gather(*(send(channel) for channel in channels))
 
     async def cog_unload(self) -> None:
         """Cogのアンロード時の処理"""
-        self.check_alerts.cancel()
+        if self._scheduler:
+            self._scheduler.cancel()
+        for task in self._send_tasks:
+            task.cancel()
         await self.db.cleanup()
 
 
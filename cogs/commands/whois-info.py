@@ -2,18 +2,25 @@ from discord.ext import commands
 import discord
 import whois
 from typing import Final, Optional, Dict, Any
+import asyncio
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 
 RATE_LIMIT_SECONDS: Final[int] = 30
+CACHE_TTL: Final[int] = 3600
+NEGATIVE_CACHE_TTL: Final[int] = 600
+WHOIS_TIMEOUT: Final[int] = 15
+WHOIS_WORKERS: Final[int] = 4
 DOMAIN_PATTERN: Final[str] = r"^(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}$"
 
 ERROR_MESSAGES: Final[dict] = {
     "invalid_domain": "無効なドメイン名です。",
     "rate_limit": "レート制限中です。{}秒後にお試しください。",
     "whois_error": "Whois情報の取得に失敗しました: {}",
+    "timeout": "Whoisサーバーからの応答がタイムアウトしました。",
     "unexpected": "予期せぬエラーが発生しました: {}"
 }
 
@@ -59,12 +66,17 @@ class WhoisInfo:
             return "\n".join(str(item) for item in items)
         return str(items) if items else None
 
-    async def fetch(self) -> bool:
+    async def fetch(self, executor: ThreadPoolExecutor) -> bool:
         try:
             if not self._validate_domain():
                 raise ValueError(ERROR_MESSAGES["invalid_domain"])
 
-            self.info = whois.whois(self.domain)
+            # python-whoisは同期ライブラリのため専用スレッドプールで実行
+            loop = asyncio.get_running_loop()
+            self.info = await asyncio.wait_for(
+                loop.run_in_executor(executor, whois.whois, self.domain),
+                timeout=WHOIS_TIMEOUT
+            )
             return True
 
         except Exception as e:
@@ -93,13 +105,34 @@ class WhoisInfo:
 
         return formatted
 
+class WhoisAPI:
+    """Whois問い合わせを非同期に行うクラス"""
+
+    def __init__(self) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=WHOIS_WORKERS,
+            thread_name_prefix="whois"
+        )
+
+    def cleanup(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def lookup(self, domain: str) -> Optional[Dict[str, str]]:
+        whois_info = WhoisInfo(domain)
+        await whois_info.fetch(self._executor)
+        return whois_info.get_formatted_info() or None
+
 class Whois(commands.Cog):
     """Whois情報取得機能を提供"""
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self.api = WhoisAPI()
         self._last_uses = {}
 
+    async def cog_unload(self) -> None:
+        self.api.cleanup()
+
     def _check_rate_limit(
         self,
         user_id: int
@@ -166,14 +199,18 @@ class Whois(commands.Cog):
             await interaction.response.defer(thinking=True)
 
             # Whois情報の取得
-            whois_info = WhoisInfo(domain)
-            await whois_info.fetch()
+            formatted_info = await self.bot.response_cache.get_or_fetch(
+                "whois",
+                domain,
+                lambda: self.api.lookup(domain),
+                ttl=CACHE_TTL,
+                negative_ttl=NEGATIVE_CACHE_TTL
+            )
 
             # レート制限の更新
             self._last_uses[interaction.user.id] = datetime.now()
 
             # 結果の送信
-            formatted_info = whois_info.get_formatted_info()
             if not formatted_info:
                 await interaction.followup.send(
                     ERROR_MESSAGES["whois_error"].format("情報が取得できません"),
@@ -189,6 +226,12 @@ class Whois(commands.Cog):
                 str(e),
                 ephemeral=True
             )
+        except asyncio.TimeoutError:
+            logger.warning("Whois timeout for domain %s", domain)
+            await interaction.followup.send(
+                ERROR_MESSAGES["timeout"],
+                ephemeral=True
+            )
         except Exception as e:
             logger.error("Error in whois command: %s", e, exc_info=True)
             await interaction.followup.send(
@@ -1,7 +1,8 @@
 import asyncio
 import re
-from functools import lru_cache
-from typing import Final, Optional, List, Tuple, Dict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Final, Optional, List, Tuple, Dict
 import logging
 from datetime import datetime, timedelta
 
@@ -14,11 +15,14 @@ from discord.ext import commands
 
 
 WIKIPEDIA_LANG: Final[str] = "ja"
-CACHE_SIZE: Final[int] = 100
 SEARCH_RESULTS_LIMIT: Final[int] = 3
 DISAMBIGUATION_LIMIT: Final[int] = 5
 SUMMARY_SENTENCES: Final[int] = 3
 RATE_LIMIT_SECONDS: Final[int] = 10
+CACHE_TTL: Final[int] = 1800
+NEGATIVE_CACHE_TTL: Final[int] = 600
+REQUEST_TIMEOUT: Final[int] = 10
+EXECUTOR_WORKERS: Final[int] = 4
 
 PATTERNS: Final[Dict[str, str]] = {
     "mention": r"@",
@@ -45,25 +49,33 @@ class WikipediaAPI:
 
     def __init__(self) -> None:
         wikipedia.set_lang(WIKIPEDIA_LANG)
+        # wikipediaライブラリは同期的なため、デフォルトのスレッドプールを占有しないよう専用プールで実行
+        self._executor = ThreadPoolExecutor(
+            max_workers=EXECUTOR_WORKERS,
+            thread_name_prefix="wikipedia"
+        )
+
+    def cleanup(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
-    @lru_cache(maxsize=CACHE_SIZE)
-    def search(self, query: str) -> List[str]:
-        return wikipedia.search(query, results=SEARCH_RESULTS_LIMIT)
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(
+            loop.run_in_executor(self._executor, partial(func, *args, **kwargs)),
+            timeout=REQUEST_TIMEOUT
+        )
+
+    async def search(self, query: str) -> List[str]:
+        return await self._run(wikipedia.search, query, results=SEARCH_RESULTS_LIMIT)
 
     async def get_page_info(
         self,
         title: str
     ) -> Tuple[str, str, str]:
-        loop = asyncio.get_event_loop()
         try:
             page, summary = await asyncio.gather(
-                loop.run_in_executor(None, wikipedia.page, title),
-                loop.run_in_executor(
-                    None,
-                    wikipedia.summary,
-                    title,
-                    SUMMARY_SENTENCES
-                )
+                self._run(wikipedia.page, title),
+                self._run(wikipedia.summary, title, SUMMARY_SENTENCES)
             )
             return page.title, summary, page.url
         except Exception as e:
@@ -71,9 +83,8 @@ class WikipediaAPI:
             raise
 
     async def get_random_page(self) -> Tuple[str, str, str]:
-        loop = asyncio.get_event_loop()
         try:
-            page = await loop.run_in_executor(None, wikipedia.random)
+            page = await self._run(wikipedia.random)
             page_info = await self.get_page_info(page)
             return page_info
         except Exception as e:
@@ -100,6 +111,9 @@ class WikipediaCog(commands.Cog):
         self.api = WikipediaAPI()
         self._last_uses = {}
 
+    async def cog_unload(self) -> None:
+        self.api.cleanup()
+
     def _check_rate_limit(
         self,
         user_id: int
@@ -112,6 +126,12 @@ class WikipediaCog(commands.Cog):
                 return True, remaining
         return False, None
 
+    async def _lookup(self, query: str) -> Optional[Tuple[str, str, str]]:
+        search_results = await self.api.search(query)
+        if not search_results:
+            return None
+        return await self.api.get_page_info(search_results[0])
+
     def _create_search_embed(
         self,
         title: str,
@@ -175,18 +195,20 @@ class WikipediaCog(commands.Cog):
             # 入力のサニタイズ
             query = MessageProcessor.sanitize_input(query)
 
-            # 検索の実行
-            search_results = self.api.search(query)
-            if not search_results:
+            # 検索とページ情報の取得
+            page_info = await self.bot.response_cache.get_or_fetch(
+                "wikipedia",
+                query,
+                lambda: self._lookup(query),
+                ttl=CACHE_TTL,
+                negative_ttl=NEGATIVE_CACHE_TTL
+            )
+            if not page_info:
                 await interaction.followup.send(
                     ERROR_MESSAGES["no_results"].format(query)
                 )
                 return
-
-            # ページ情報の取得
-            title, summary, url = await self.api.get_page_info(
-                search_results[0]
-            )
+            title, summary, url = page_info
 
             # レート制限の更新
             self._last_uses[interaction.user.id] = datetime.now()
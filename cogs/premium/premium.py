@@ -6,6 +6,8 @@ from discord.ext import commands
 import logging
 from datetime import datetime, timedelta
 
+from module.metrics import PREMIUM_USERS
+
 load_dotenv()
 DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "5432")
@@ -29,6 +31,8 @@ class PremiumDatabase:
         self = cls.__new__(cls)
         self.pool = await asyncpg.create_pool(CONN_STR)
         await self._create_table()
+        # 件数は起動時に一度だけ数え、以降は追加・削除のたびに増減させる
+        PREMIUM_USERS.set(await self.pool.fetchval("SELECT COUNT(*) FROM premium_users"))
         return self
 
     async def _create_table(self):
@@ -42,10 +46,13 @@ class PremiumDatabase:
         )
 
     async def add_user(self, user_id: int):
-        await self.pool.execute(
-            "INSERT INTO premium_users (user_id, voice) VALUES ($1, 'ja-JP-NanamiNeural') ON CONFLICT (user_id) DO UPDATE SET voice = EXCLUDED.voice",
+        # xmax = 0 なら新規挿入、それ以外は既存行の更新
+        inserted = await self.pool.fetchval(
+            "INSERT INTO premium_users (user_id, voice) VALUES ($1, 'ja-JP-NanamiNeural') ON CONFLICT (user_id) DO UPDATE SET voice = EXCLUDED.voice RETURNING (xmax = 0)",
             user_id
         )
+        if inserted:
+            PREMIUM_USERS.inc()
 
     async def get_user(self, user_id: int):
         return await self.pool.fetchrow(
@@ -60,10 +67,12 @@ class PremiumDatabase:
         )
 
     async def remove_user(self, user_id: int):
-        await self.pool.execute(
+        status = await self.pool.execute(
             "DELETE FROM premium_users WHERE user_id = $1",
             user_id
         )
+        if status != "DELETE 0":
+            PREMIUM_USERS.dec()
 
 class Premium(commands.Cog):
     """プレミアム機能を管理するクラス"""
@@ -160,6 +169,10 @@ class Premium(commands.Cog):
                     return
 
                 await self.view.cog.db.update_voice(user_id, selected_voice)
+                # 読み上げ側のボイスキャッシュを破棄
+                voice_cog = self.view.cog.bot.get_cog("Voice")
+                if voice_cog:
+                    voice_cog.state.invalidate_voice(user_id)
                 await interaction.response.send_message(f"ボイスを {selected_voice} に設定しました。", ephemeral=True)
 
         class VoiceSelectView(discord.ui.View):
@@ -4,12 +4,15 @@ from discord.ext import commands
 import asyncpg
 import os
 import logging
+from typing import Dict, Optional, Tuple
 from dotenv import load_dotenv
 
 class AutoRole(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db_pool: asyncpg.Pool | None = None
+        # guild_id -> (human_role_id, bot_role_id)。参加時はDBを参照しない
+        self.autoroles: Dict[int, Tuple[Optional[int], Optional[int]]] = {}
 
     async def cog_load(self):
         """Cogがロードされたときにデータベース接続を初期化"""
@@ -22,6 +25,7 @@ class AutoRole(commands.Cog):
             database="autorole"
         )
         await self._ensure_database()
+        await self._load_autoroles()
 
     async def cog_unload(self):
         """Cogがアンロードされたときにデータベース接続を閉じる"""
@@ -39,6 +43,12 @@ class AutoRole(commands.Cog):
             )
             ''')
 
+    async def _load_autoroles(self):
+        """自動ロール設定をすべてメモリに読み込む"""
+        async with self.db_pool.acquire() as conn:
+            rows = await conn.fetch("SELECT guild_id, human_role_id, bot_role_id FROM autoroles")
+        self.autoroles = {row["guild_id"]: (row["human_role_id"], row["bot_role_id"]) for row in rows}
+
     async def _check_admin_permission(self, interaction: discord.Interaction) -> bool:
         """ユーザーが管理者権限を持っているかチェックする"""
         if not interaction.guild:
@@ -80,24 +90,23 @@ class AutoRole(commands.Cog):
             await interaction.response.send_message("指定されたロールがBotの最上位ロールよりも上位にあるため、自動付与できません。", ephemeral=True)
             return
         
-        async with self.db_pool.acquire() as conn:
-            # 現在の設定を取得
-            result = await conn.fetchrow("SELECT human_role_id, bot_role_id FROM autoroles WHERE guild_id = $1", guild_id)
-            
-            human_id = human.id if human else (result["human_role_id"] if result else None)
-            bot_id = bot.id if bot else (result["bot_role_id"] if result else None)
+        # 現在の設定を取得
+        result = self.autoroles.get(guild_id)
+        human_id = human.id if human else (result[0] if result else None)
+        bot_id = bot.id if bot else (result[1] if result else None)
 
-            # 設定を更新または挿入
-            if result:
-                await conn.execute(
-                    "UPDATE autoroles SET human_role_id = $1, bot_role_id = $2 WHERE guild_id = $3",
-                    human_id, bot_id, guild_id
-                )
-            else:
-                await conn.execute(
-                    "INSERT INTO autoroles (guild_id, human_role_id, bot_role_id) VALUES ($1, $2, $3)",
-                    guild_id, human_id, bot_id
-                )
+        # 設定を更新または挿入
+        async with self.db_pool.acquire() as conn:
+            await conn.execute(
+                """
+                INSERT INTO autoroles (guild_id, human_role_id, bot_role_id) VALUES ($1, $2, $3)
+                ON CONFLICT (guild_id) DO UPDATE SET
+                    human_role_id = EXCLUDED.human_role_id,
+                    bot_role_id = EXCLUDED.bot_role_id
+                """,
+                guild_id, human_id, bot_id
+            )
+        self.autoroles[guild_id] = (human_id, bot_id)
         
         # 応答メッセージの作成
         response = []
@@ -121,15 +130,15 @@ class AutoRole(commands.Cog):
             
         guild_id = interaction.guild.id
         
+        # 現在の設定を確認
+        if guild_id not in self.autoroles:
+            await interaction.response.send_message("このサーバーでは自動ロール機能は既に設定されていません。", ephemeral=True)
+            return
+
+        # 設定を削除
         async with self.db_pool.acquire() as conn:
-            # 現在の設定を確認
-            result = await conn.fetchrow("SELECT * FROM autoroles WHERE guild_id = $1", guild_id)
-            if not result:
-                await interaction.response.send_message("このサーバーでは自動ロール機能は既に設定されていません。", ephemeral=True)
-                return
-            
-            # 設定を削除
             await conn.execute("DELETE FROM autoroles WHERE guild_id = $1", guild_id)
+        self.autoroles.pop(guild_id, None)
         
         await interaction.response.send_message("自動ロール機能を無効化しました。新しく参加するメンバーにはロールが自動付与されなくなります。", ephemeral=True)
 
@@ -143,10 +152,8 @@ class AutoRole(commands.Cog):
             
         guild_id = interaction.guild.id
         
-        async with self.db_pool.acquire() as conn:
-            # 現在の設定を取得
-            result = await conn.fetchrow("SELECT human_role_id, bot_role_id FROM autoroles WHERE guild_id = $1", guild_id)
-        
+        # 現在の設定を取得
+        result = self.autoroles.get(guild_id)
         if not result:
             await interaction.response.send_message("このサーバーでは自動ロール機能は設定されていません。", ephemeral=True)
             return
@@ -180,31 +187,29 @@ class AutoRole(commands.Cog):
     async def on_member_join(self, member):
         """メンバーがサーバーに参加したときに適切なロールを付与"""
         try:
-            guild_id = member.guild.id
-            
+            # 未設定のサーバーでは何もしない
+            result = self.autoroles.get(member.guild.id)
+            if not result:
+                return
+
             # Botにロール管理権限があるか確認
             if not member.guild.me.guild_permissions.manage_roles:
                 logging.warning(f"サーバー {member.guild.name} でロール管理権限がありません")
                 return
-                
-            async with self.db_pool.acquire() as conn:
-                result = await conn.fetchrow("SELECT human_role_id, bot_role_id FROM autoroles WHERE guild_id = $1", guild_id)
-            
-            if not result:
-                return
-            
+
             human_role_id, bot_role_id = result
             
+            # 参加が集中してもレートリミットを超えないようキュー経由で付与
             if member.bot and bot_role_id:
                 role = member.guild.get_role(bot_role_id)
                 if role and role.position < member.guild.me.top_role.position:
-                    await member.add_roles(role, reason="自動ロール付与: ボット")
+                    self.bot.role_queue.add_role(member.guild, member.id, role, reason="自動ロール付与: ボット")
                 else:
                     logging.warning(f"サーバー {member.guild.name} でボットロール付与に失敗: ロールが見つからないか、権限不足")
             elif not member.bot and human_role_id:
                 role = member.guild.get_role(human_role_id)
                 if role and role.position < member.guild.me.top_role.position:
-                    await member.add_roles(role, reason="自動ロール付与: 人間")
+                    self.bot.role_queue.add_role(member.guild, member.id, role, reason="自動ロール付与: 人間")
                 else:
                     logging.warning(f"サーバー {member.guild.name} で人間ロール付与に失敗: ロールが見つからないか、権限不足")
         except Exception as e:
@@ -0,0 +1,61 @@
+import logging
+from typing import Dict, Set
+
+import discord
+from discord.ext import commands, tasks
+
+from module.analytics_store import AnalyticsStore, RollupKey, day_of
+
+
+FLUSH_INTERVAL_SECONDS = 60  # メモリ上の集計をDBに書き込む間隔
+
+logger = logging.getLogger(__name__)
+
+class AnalyticsCog(commands.Cog):
+    """サーバーごとの日次メッセージ数・アクティブユーザー数を集計する"""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.store = AnalyticsStore()
+        self._messages: Dict[RollupKey, int] = {}
+        self._users: Dict[RollupKey, Set[int]] = {}
+        self.flush.start()
+
+    async def cog_unload(self):
+        self.flush.cancel()
+        await self._flush()
+        await self.store.close()
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if message.author.bot or not message.guild:
+            return
+        # プライバシーモードのユーザーは集計しない
+        privacy_cog = self.bot.get_cog("Privacy")
+        if privacy_cog and privacy_cog.is_private_user(message.author.id):
+            return
+        key = (message.guild.id, day_of(message.created_at))
+        self._messages[key] = self._messages.get(key, 0) + 1
+        self._users.setdefault(key, set()).add(message.author.id)
+
+    async def _flush(self):
+        if not self._messages:
+            return
+        messages, users = self._messages, self._users
+        self._messages, self._users = {}, {}
+        try:
+            await self.store.add(messages, users)
+        except Exception as e:
+            logger.error("Failed to write analytics rollups: %s", e, exc_info=True)
+            # 次回の書き込みに持ち越す
+            for key, count in messages.items():
+                self._messages[key] = self._messages.get(key, 0) + count
+            for key, user_ids in users.items():
+                self._users.setdefault(key, set()).update(user_ids)
+
+    @tasks.loop(seconds=FLUSH_INTERVAL_SECONDS)
+    async def flush(self):
+        await self._flush()
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(AnalyticsCog(bot))
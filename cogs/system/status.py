@@ -37,28 +37,17 @@ class SystemStatus:
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self._session: Optional[aiohttp.ClientSession] = None
-
-    async def initialize(self) -> None:
-        self._session = aiohttp.ClientSession()
-
-    async def cleanup(self) -> None:
-        if self._session:
-            await self._session.close()
-            self._session = None
 
     def get_discord_latency(self) -> float:
         return round(self.bot.latency * 1000, 2)
 
     async def get_router_latency(self) -> str:
-        if not self._session:
-            self._session = aiohttp.ClientSession()
-
         try:
             start_time = time.time()
-            async with self._session.get(
+            async with self.bot.http_client.get(
                 f"http://{ROUTER_IP}",
-                timeout=TIMEOUT_SECONDS
+                timeout=aiohttp.ClientTimeout(total=TIMEOUT_SECONDS),
+                retries=0
             ):
                 pass
             return f"{round((time.time() - start_time) * 1000, 2)}ms"
@@ -91,12 +80,6 @@ class Status(commands.Cog):
         self.system = SystemStatus(bot)
         self._last_uses = {}
 
-    async def cog_load(self) -> None:
-        await self.system.initialize()
-
-    async def cog_unload(self) -> None:
-        await self.system.cleanup()
-
     def _check_rate_limit(
         self,
         user_id: int
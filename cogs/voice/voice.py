@@ -1,9 +1,14 @@
 import asyncio
+import hashlib
+import io
+import itertools
 import os
 import re
 import tempfile
-import uuid
-from typing import Final, Optional, Dict, List
+import time
+import unicodedata
+from collections import OrderedDict, deque
+from typing import Any, Deque, Final, Optional, Dict, List, Tuple
 import logging
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -14,8 +19,10 @@ import edge_tts
 import discord
 from discord.ext import commands
 from discord import ClientException, ConnectionClosed  # ConnectionClosedをインポート
+from discord.oggparse import OggStream
 
 from cogs.premium.premium import PremiumDatabase
+from module.metrics import TTS_PLAYBACK_GAP, TTS_QUEUE_DEPTH
 
 # .envファイルから環境変数を読み込む
 load_dotenv()
@@ -34,6 +41,13 @@ MAX_MESSAGE_LENGTH: Final[int] = 75
 RATE_LIMIT_SECONDS: Final[int] = 10
 VOLUME_LEVEL: Final[float] = 0.6
 TEMP_DIR: Final[Path] = Path(tempfile.gettempdir()) / "voice_tts"
+TTS_CACHE_DIR: Final[Path] = TEMP_DIR / "cache"
+TTS_CACHE_MAX_BYTES: Final[int] = 256 * 1024 * 1024  # ディスク上のキャッシュ上限
+TTS_MEMORY_CACHE_ITEMS: Final[int] = 64  # メモリ上に保持する音声数
+FFMPEG_EXECUTABLE: Final[str] = "ffmpeg"
+OPUS_BITRATE: Final[str] = "64k"
+PREFETCH_COUNT: Final[int] = 3  # 再生中に先行して合成する件数
+VOICE_CACHE_TTL: Final[int] = 300  # プレミアムボイス設定のキャッシュ時間（秒）
 RECONNECT_ATTEMPTS: Final[int] = 3  # 再接続試行回数
 RECONNECT_DELAY: Final[int] = 5  # 再接続の間隔（秒）
 
@@ -59,81 +73,275 @@ SUCCESS_MESSAGES: Final[dict] = {
 
 logger = logging.getLogger(__name__)
 
+class OggOpusSource(discord.AudioSource):
+    """Ogg Opusのバイト列をそのままDiscordへ送る音声ソース（ffmpeg不要）"""
+
+    def __init__(self, data: bytes) -> None:
+        self._packets = OggStream(io.BytesIO(data)).iter_packets()
+
+    def read(self) -> bytes:
+        for packet in self._packets:
+            # ヘッダーパケットは音声データではないので読み飛ばす
+            if packet.startswith((b"OpusHead", b"OpusTags")):
+                continue
+            return packet
+        return b""
+
+    def is_opus(self) -> bool:
+        return True
+
 class TTSManager:
-    """TTSの管理を行うクラス"""
+    """TTSの管理を行うクラス
+
+    合成結果は (ボイス, 正規化したテキスト) のハッシュをキーに
+    音量調整済みのOgg Opusとしてディスクへ保存し、容量上限を超えたら
+    最も使われていないものから削除する。
+    """
 
     def __init__(self) -> None:
-        TEMP_DIR.mkdir(parents=True, exist_ok=True)
-        self.temp_files: List[str] = []
+        TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """既存のキャッシュファイルを最終使用時刻順に読み込む"""
+        files = sorted(TTS_CACHE_DIR.glob("*.ogg"), key=lambda f: f.stat().st_mtime)
+        for file in files:
+            size = file.stat().st_size
+            self._index[file.stem] = size
+            self._total_bytes += size
+        self._evict()
 
-    def cleanup_temp_files(self) -> None:
-        """一時ファイルを削除"""
-        for file in self.temp_files.copy():
-            if os.path.exists(file):
-                try:
-                    os.remove(file)
-                    self.temp_files.remove(file)
-                except Exception as e:
-                    logger.error("Error removing temp file: %s", e, exc_info=True)
+    @staticmethod
+    def normalize_text(message: str) -> str:
+        # 文字列が有効であることを確認（制御文字などを除去）
+        message = unicodedata.normalize("NFKC", message)
+        message = "".join(char for char in message if char.isprintable() or char.isspace())
+        return " ".join(message.split())
+
+    @staticmethod
+    def cache_key(message: str, voice: str) -> str:
+        return hashlib.sha256(f"{voice}\0{message}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, data: bytes) -> None:
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > TTS_MEMORY_CACHE_ITEMS:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        while self._total_bytes > TTS_CACHE_MAX_BYTES and self._index:
+            key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            self._memory.pop(key, None)
+            try:
+                (TTS_CACHE_DIR / f"{key}.ogg").unlink(missing_ok=True)
+            except Exception as e:
+                logger.error("Error removing cached audio: %s", e, exc_info=True)
+
+    @staticmethod
+    def _read_cached(path: Path) -> bytes:
+        data = path.read_bytes()
+        os.utime(path)  # 再起動後もLRU順を保つため最終使用時刻を更新
+        return data
+
+    @staticmethod
+    def _write_cached(path: Path, data: bytes) -> None:
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    async def _synthesize(self, message: str, voice: str) -> bytes:
+        """edge-ttsで合成し、1回だけffmpegで音量調整済みOpusへ変換"""
+        mp3 = bytearray()
+        max_attempts = 2
+        for attempt in range(max_attempts):
+            try:
+                mp3.clear()
+                tts = edge_tts.Communicate(message, voice)
+                async for chunk in tts.stream():
+                    if chunk["type"] == "audio":
+                        mp3.extend(chunk["data"])
+                break
+            except Exception as e:
+                if attempt < max_attempts - 1:
+                    logger.warning(f"TTS generation failed on attempt {attempt+1}, retrying: {e}")
+                    await asyncio.sleep(1)  # 少し待ってからリトライ
+                else:
+                    raise  # 最大試行回数に達したら例外を再度投げる
+
+        process = await asyncio.create_subprocess_exec(
+            FFMPEG_EXECUTABLE, "-loglevel", "error",
+            "-i", "pipe:0",
+            "-filter:a", f"volume={VOLUME_LEVEL}",
+            "-c:a", "libopus", "-ar", "48000", "-ac", "2",
+            "-b:a", OPUS_BITRATE, "-frame_duration", "20", "-application", "voip",
+            "-f", "ogg", "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        opus, stderr = await process.communicate(bytes(mp3))
+        if process.returncode != 0 or not opus:
+            raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='ignore').strip()}")
+        return opus
+
+    async def _generate_and_store(self, key: str, message: str, voice: str) -> bytes:
+        data = await self._synthesize(message, voice)
+        path = TTS_CACHE_DIR / f"{key}.ogg"
+        await asyncio.to_thread(self._write_cached, path, data)
+        if key not in self._index:
+            self._index[key] = len(data)
+            self._total_bytes += len(data)
+        self._remember(key, data)
+        self._evict()
+        return data
 
     async def generate_audio(
         self,
         message: str,
-        guild_id: int,
         voice: str
-    ) -> Optional[str]:
+    ) -> Optional[bytes]:
+        """読み上げ音声（Ogg Opus）を取得。キャッシュにあれば合成しない"""
         try:
             # メッセージが空か空白のみの場合は処理しない
             if not message or message.isspace():
                 logger.warning("Empty message received for TTS, skipping audio generation")
                 return None
-                
-            # 文字列が有効であることを確認（制御文字などを除去）
-            message = ''.join(char for char in message if char.isprintable() or char.isspace())
+
+            message = self.normalize_text(message)
             if not message:
                 logger.warning("Message contains only non-printable characters, skipping audio generation")
                 return None
 
-            # guild_idとuuidをファイル名に含める
-            unique_id = uuid.uuid4().hex
-            temp_file = TEMP_DIR / f"{guild_id}_{unique_id}.mp3"
-            temp_path = str(temp_file)
-            self.temp_files.append(temp_path)
+            key = self.cache_key(message, voice)
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._index.move_to_end(key)
+                return self._memory[key]
 
-            # 最大試行回数を設定
-            max_attempts = 2
-            for attempt in range(max_attempts):
+            if key in self._index:
+                self._index.move_to_end(key)
                 try:
-                    tts = edge_tts.Communicate(message, voice)
-                    await tts.save(temp_path)
-                    return temp_path
-                except Exception as e:
-                    if attempt < max_attempts - 1:
-                        logger.warning(f"TTS generation failed on attempt {attempt+1}, retrying: {e}")
-                        await asyncio.sleep(1)  # 少し待ってからリトライ
-                    else:
-                        raise  # 最大試行回数に達したら例外を再度投げる
+                    data = await asyncio.to_thread(self._read_cached, TTS_CACHE_DIR / f"{key}.ogg")
+                    self._remember(key, data)
+                    return data
+                except FileNotFoundError:
+                    self._total_bytes -= self._index.pop(key, 0)
+
+            # 同じ文言の同時合成は1回にまとめる
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._generate_and_store(key, message, voice))
+                self._inflight[key] = task
+                task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            return await asyncio.shield(task)
         except Exception as e:
             logger.error(f"Error generating audio: {e}", exc_info=True)
-            # 一時ファイルが作成されていたら削除
-            if 'temp_path' in locals() and os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                    self.temp_files.remove(temp_path)
-                except Exception as cleanup_error:
-                    logger.error(f"Error cleaning up temp file after failed TTS: {cleanup_error}")
             return None
 
+class DictionaryMatcher:
+    """Aho-Corasick法で辞書の単語を一括置換するクラス
+
+    メッセージ全体を1回走査し、各位置で最左最長一致した単語を読みに置き換える。
+    """
+
+    def __init__(self, entries: Dict[str, str]) -> None:
+        self._readings = entries
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[int]] = [[]]  # ノードで終わる単語の長さ
+        for word in entries:
+            if word:
+                self._insert(word)
+        self._build_links()
+
+    def _insert(self, word: str) -> None:
+        node = 0
+        for char in word:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = next_node
+        self._outputs[node].append(len(word))
+
+    def _build_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(char, 0)
+                self._fail[child] = link if link != child else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+                queue.append(child)
+
+    def replace(self, text: str) -> str:
+        if not self._readings or not text:
+            return text
+
+        # 各開始位置で最長の一致を記録
+        longest: Dict[int, int] = {}
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for length in self._outputs[node]:
+                start = index - length + 1
+                if length > longest.get(start, 0):
+                    longest[start] = length
+
+        if not longest:
+            return text
+
+        parts: List[str] = []
+        index = 0
+        while index < len(text):
+            length = longest.get(index)
+            if length:
+                parts.append(self._readings[text[index:index + length]])
+                index += length
+            else:
+                parts.append(text[index])
+                index += 1
+        return "".join(parts)
+
 class DictionaryManager:
-    """辞書管理クラス"""
+    """辞書管理クラス
+
+    辞書全体をメモリ上のマッチャーに保持し、読み上げ時にはDBへ問い合わせない。
+    """
 
     def __init__(self) -> None:
         self.pool = None
+        self._entries: Dict[str, str] = {}
+        self.matcher = DictionaryMatcher({})
 
     async def initialize(self) -> None:
         """データベース接続プールを初期化"""
         self.pool = await asyncpg.create_pool(**DB_CONFIG)
         await self._create_table()
+        await self.reload()
+
+    async def reload(self) -> None:
+        """辞書をDBから読み込み直してマッチャーを再構築"""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch("SELECT word, reading FROM dictionary")
+        self._entries = {row["word"]: row["reading"] for row in rows if row["reading"]}
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        self.matcher = DictionaryMatcher(dict(self._entries))
 
     async def _create_table(self) -> None:
         async with self.pool.acquire() as conn:
@@ -147,6 +355,8 @@ class DictionaryManager:
                 "INSERT INTO dictionary (word, reading) VALUES ($1, $2) ON CONFLICT (word) DO UPDATE SET reading = $2",
                 word, reading
             )
+        self._entries[word] = reading
+        self._rebuild()
 
     async def remove_word(self, word: str) -> None:
         async with self.pool.acquire() as conn:
@@ -154,14 +364,11 @@ class DictionaryManager:
                 "DELETE FROM dictionary WHERE word = $1",
                 word
             )
+        if self._entries.pop(word, None) is not None:
+            self._rebuild()
 
     async def get_reading(self, word: str) -> Optional[str]:
-        async with self.pool.acquire() as conn:
-            result = await conn.fetchrow(
-                "SELECT reading FROM dictionary WHERE word = $1",
-                word
-            )
-            return result["reading"] if result else None
+        return self._entries.get(word)
 
     async def list_words(self, limit: int, offset: int) -> List[tuple]:
         async with self.pool.acquire() as conn:
@@ -210,10 +417,7 @@ class MessageProcessor:
         result = MessageProcessor.sanitize_message(message)
         result = MessageProcessor.limit_message(result)
         if dictionary:
-            for word in result.split():
-                reading = await dictionary.get_reading(word)
-                if reading:
-                    result = result.replace(word, reading)
+            result = dictionary.matcher.replace(result)
         if attachments:
             result += f" {len(attachments)}枚の画像"
         return result
@@ -225,9 +429,10 @@ class GuildTTS:
         self.channel_id = channel_id
         self.voice_client = voice_client
         self.text_channel_id = text_channel_id    # 追加: /joinが実行されたテキストチャンネルID
-        self.tts_queue: List[Dict[str, any]] = []  # メッセージだけでなく、ユーザーIDとボイス情報も格納
+        self.tts_queue: Deque[Dict[str, Any]] = deque()  # メッセージだけでなく、ユーザーIDとボイス情報も格納
         self.lock = asyncio.Lock()
         self.reconnecting = False  # 再接続中かどうかのフラグ
+        self.last_finished: Optional[float] = None  # 直前のクリップの再生終了時刻（無音時間の計測用）
 
 class VoiceState:
     """複数ギルド・複数チャンネルに対応した状態管理クラス"""
@@ -236,6 +441,7 @@ class VoiceState:
         self.guilds: Dict[int, GuildTTS] = {}
         self.tts_manager = TTSManager()
         self.premium_db = None  # PremiumDatabaseのインスタンス (非同期初期化)
+        self._voice_cache: Dict[int, Tuple[float, str]] = {}  # user_id -> (有効期限, ボイス)
 
     async def initialize(self) -> None:
         """状態管理の初期化"""
@@ -305,6 +511,42 @@ class VoiceState:
         
         return False
 
+    async def _resolve_voice(self, user_id: Optional[int]) -> str:
+        """プレミアムユーザーのボイスを取得（メモリ上にTTL付きでキャッシュ）"""
+        if not user_id or not self.premium_db:
+            return VOICE
+
+        now = time.monotonic()
+        cached = self._voice_cache.get(user_id)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        try:
+            user_data = await self.premium_db.get_user(user_id)
+        except Exception as e:
+            logger.error(f"Error fetching premium voice: {e}", exc_info=True)
+            return cached[1] if cached else VOICE
+        voice = user_data[0] if user_data and len(user_data) > 0 else VOICE
+        self._voice_cache[user_id] = (now + VOICE_CACHE_TTL, voice)
+        return voice
+
+    def invalidate_voice(self, user_id: int) -> None:
+        """ボイス設定の変更時にキャッシュを破棄"""
+        self._voice_cache.pop(user_id, None)
+
+    async def _prepare_audio(self, item: Dict[str, Any]) -> Optional[bytes]:
+        voice = item.get("voice") or await self._resolve_voice(item.get("user_id"))
+        return await self.tts_manager.generate_audio(item["message"], voice)
+
+    def _prefetch(self, guild_state: GuildTTS) -> None:
+        """再生中に先頭からPREFETCH_COUNT件の音声を先行して合成"""
+        for item in itertools.islice(guild_state.tts_queue, PREFETCH_COUNT):
+            if item.get("audio") is None:
+                item["audio"] = asyncio.create_task(self._prepare_audio(item))
+
+    def _update_queue_depth(self) -> None:
+        TTS_QUEUE_DEPTH.set(sum(len(state.tts_queue) for state in self.guilds.values()))
+
     async def play_tts(
         self,
         guild_id: int,
@@ -312,70 +554,79 @@ class VoiceState:
         user_id: Optional[int] = None,
         voice: Optional[str] = None
     ) -> None:
+        """読み上げをキューに追加し、再生中でなければ再生を開始"""
         guild_state = self.guilds.get(guild_id)
         if not guild_state:
             return
 
-        voice_client = guild_state.voice_client
-        
-        # ボイスクライアントが接続されていない場合は処理しない
-        if not voice_client or not voice_client.is_connected():
+        guild_state.tts_queue.append({
+            "message": message,
+            "user_id": user_id,
+            "voice": voice,
+            "audio": None,
+            "enqueued_at": time.monotonic()
+        })
+        self._update_queue_depth()
+        self._prefetch(guild_state)
+        await self.play_next(guild_id)
+
+    async def play_next(self, guild_id: int) -> None:
+        """キューの先頭を再生する"""
+        guild_state = self.guilds.get(guild_id)
+        if not guild_state:
             return
 
-        # ボイスが指定されていない場合は、プレミアムユーザーのボイスまたはデフォルトボイスを使用
-        if voice is None:
-            user_data = await self.premium_db.get_user(user_id) if user_id else None
-            voice = user_data[0] if user_data and len(user_data) > 0 else VOICE
+        async with guild_state.lock:
+            voice_client = guild_state.voice_client
+
+            # ボイスクライアントが接続されていない・再生中の場合は処理しない
+            if not voice_client or not voice_client.is_connected() or voice_client.is_playing():
+                return
+
+            audio = None
+            while guild_state.tts_queue and not audio:
+                item = guild_state.tts_queue.popleft()
+                self._prefetch(guild_state)
+                task = item.get("audio") or asyncio.create_task(self._prepare_audio(item))
+                audio = await task
+            self._update_queue_depth()
+            if not audio:
+                return
+
+            # 前のクリップの再生中からキューに入っていた場合のみ無音時間を記録
+            if guild_state.last_finished is not None and item["enqueued_at"] <= guild_state.last_finished:
+                TTS_PLAYBACK_GAP.observe(time.monotonic() - guild_state.last_finished)
+
+            def after_playing(error: Optional[Exception]) -> None:
+                guild_state.last_finished = time.monotonic()
+                if error:
+                    logger.error("Error playing audio: %s", error, exc_info=True)
+                    # ConnectionClosedエラーを検出して再接続ロジックをトリガー
+                    if isinstance(error, ConnectionClosed):
+                        # guild_idがまだ有効か確認してから再接続
+                        if guild_id in self.guilds:
+                            asyncio.run_coroutine_threadsafe(
+                                self._handle_connection_closed(guild_id),
+                                voice_client.loop
+                            )
+                        return
 
-        temp_path = await self.tts_manager.generate_audio(message, guild_id, voice)
-        if not temp_path:
-            return
+                try:
+                    asyncio.run_coroutine_threadsafe(self.play_next(guild_id), voice_client.loop)
+                except Exception as e:
+                    logger.error(f"Error running play_next coroutine: {e}", exc_info=True)
 
-        def after_playing(error: Optional[Exception]) -> None:
-            if error:
-                logger.error("Error playing audio: %s", error, exc_info=True)
-                # ConnectionClosedエラーを検出して再接続ロジックをトリガー
-                if isinstance(error, ConnectionClosed):
-                    # guild_idがまだ有効か確認してから再接続
+            try:
+                voice_client.play(OggOpusSource(audio), after=after_playing)
+            except Exception as e:
+                logger.error(f"Error starting voice playback: {e}", exc_info=True)
+                # 再生中にエラーが発生した場合も再接続を試みる
+                if isinstance(e, ConnectionClosed):
                     if guild_id in self.guilds:
                         try:
                             asyncio.create_task(self._handle_connection_closed(guild_id))
-                        except Exception as e:
-                            logger.error(f"Error scheduling reconnection: {e}", exc_info=True)
-            
-            async def play_next():
-                # guild_idがまだ有効か確認
-                if guild_id in self.guilds and self.guilds[guild_id].voice_client.is_connected():
-                    async with guild_state.lock:
-                        if guild_state.tts_queue:
-                            next_item = guild_state.tts_queue.pop(0)
-                            next_message = next_item["message"]
-                            next_user_id = next_item.get("user_id")
-                            next_voice = next_item.get("voice")
-                            await self.play_tts(guild_id, next_message, next_user_id, next_voice)
-            
-            try:
-                asyncio.run_coroutine_threadsafe(play_next(), voice_client.loop)
-            except Exception as e:
-                logger.error(f"Error running play_next coroutine: {e}", exc_info=True)
-
-        try:
-            voice_client.play(
-                discord.FFmpegPCMAudio(
-                    temp_path,
-                    options=f"-filter:a 'volume={VOLUME_LEVEL}'"
-                ),
-                after=after_playing
-            )
-        except Exception as e:
-            logger.error(f"Error starting voice playback: {e}", exc_info=True)
-            # 再生中にエラーが発生した場合も再接続を試みる
-            if isinstance(e, ConnectionClosed):
-                if guild_id in self.guilds:
-                    try:
-                        asyncio.create_task(self._handle_connection_closed(guild_id))
-                    except Exception as ex:
-                        logger.error(f"Error scheduling reconnection: {ex}", exc_info=True)
+                        except Exception as ex:
+                            logger.error(f"Error scheduling reconnection: {ex}", exc_info=True)
 
     async def _handle_connection_closed(self, guild_id: int):
         """ConnectionClosedエラーを処理し、必要に応じて再接続を試みる"""
@@ -390,17 +641,9 @@ class VoiceState:
                 success = await self.reconnect_voice(guild_id, cog.bot)
                 if success and guild_id in self.guilds:
                     # 再接続に成功した場合、キューに残っているメッセージを処理
-                    guild_state = self.guilds[guild_id]
-                    async with guild_state.lock:
-                        if guild_state.tts_queue:
-                            next_item = guild_state.tts_queue[0]  # キューから削除せずに次のアイテムを取得
-                            guild_state.tts_queue.pop(0)  # キューから削除
-                            await self.play_tts(
-                                guild_id, 
-                                next_item["message"], 
-                                next_item.get("user_id"),
-                                next_item.get("voice")
-                            )
+                    await self.play_next(guild_id)
+                else:
+                    self._update_queue_depth()
                 break
 
 class Voice(commands.Cog):
@@ -419,8 +662,12 @@ class Voice(commands.Cog):
 
     async def cog_unload(self) -> None:
         """Cogがアンロードされたときに呼び出される"""
-        self.state.tts_manager.cleanup_temp_files()
         for guild_state in self.state.guilds.values():
+            # 先行合成中のタスクを破棄
+            for item in guild_state.tts_queue:
+                if item.get("audio") is not None:
+                    item["audio"].cancel()
+            guild_state.tts_queue.clear()
             if guild_state.voice_client.is_connected():
                 await guild_state.voice_client.disconnect()
         await self.dictionary.close()  # 接続プールを閉じる
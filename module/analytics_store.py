@@ -0,0 +1,112 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Final, List, Optional, Set, Tuple
+
+import aiosqlite
+
+
+ANALYTICS_DB_PATH: Final[Path] = Path(__file__).parent.parent / "data/analytics.db"
+JST: Final[timezone] = timezone(timedelta(hours=9))
+USER_RETENTION_DAYS: Final[int] = 2  # 重複排除のためにユーザーIDを保持する日数
+
+# 集計は (guild_id, day) をキーにしたWITHOUT ROWIDテーブルに整数列で持つ。
+# 行がキー順に並ぶため、期間指定はインデックス上の範囲走査だけで済む。
+SCHEMA_SQL: Final[str] = """
+CREATE TABLE IF NOT EXISTS analytics_daily (
+    guild_id INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    messages INTEGER NOT NULL DEFAULT 0,
+    active_users INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (guild_id, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS analytics_daily_users (
+    guild_id INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, day, user_id)
+) WITHOUT ROWID;
+"""
+UPSERT_MESSAGES_SQL: Final[str] = """
+    INSERT INTO analytics_daily (guild_id, day, messages) VALUES (?, ?, ?)
+    ON CONFLICT (guild_id, day) DO UPDATE SET messages = messages + excluded.messages
+"""
+INSERT_USER_SQL: Final[str] = """
+    INSERT OR IGNORE INTO analytics_daily_users (guild_id, day, user_id) VALUES (?, ?, ?)
+"""
+ADD_ACTIVE_USERS_SQL: Final[str] = """
+    UPDATE analytics_daily SET active_users = active_users + ? WHERE guild_id = ? AND day = ?
+"""
+PRUNE_USERS_SQL: Final[str] = "DELETE FROM analytics_daily_users WHERE day < ?"
+SELECT_RANGE_SQL: Final[str] = """
+    SELECT day, messages, active_users FROM analytics_daily
+    WHERE guild_id = ? AND day BETWEEN ? AND ?
+    ORDER BY day
+"""
+
+RollupKey = Tuple[int, int]  # (guild_id, day)
+
+
+def day_of(moment: datetime) -> int:
+    """日時をJSTの日付の序数に変換"""
+    return moment.astimezone(JST).date().toordinal()
+
+
+class AnalyticsStore:
+    """サーバーごとの日次メッセージ数・アクティブユーザー数を保存するクラス
+
+    Botが集計して書き込み、webapi.py が期間を指定して読み出す。
+    """
+
+    def __init__(self, db_path: Path = ANALYTICS_DB_PATH) -> None:
+        self.db_path = db_path
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._lock = asyncio.Lock()
+
+    async def _get_conn(self) -> aiosqlite.Connection:
+        if self._conn is None:
+            async with self._lock:
+                if self._conn is None:
+                    self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                    conn = await aiosqlite.connect(str(self.db_path))
+                    # Botの書き込み中もwebapiが読めるようにする
+                    await conn.execute("PRAGMA journal_mode=WAL")
+                    await conn.executescript(SCHEMA_SQL)
+                    self._conn = conn
+        return self._conn
+
+    async def add(self, messages: Dict[RollupKey, int], users: Dict[RollupKey, Set[int]]) -> None:
+        """メモリ上で集計した差分をまとめて書き込む"""
+        conn = await self._get_conn()
+        try:
+            await conn.executemany(
+                UPSERT_MESSAGES_SQL,
+                [(guild_id, day, count) for (guild_id, day), count in messages.items()]
+            )
+            for (guild_id, day), user_ids in users.items():
+                cursor = await conn.executemany(
+                    INSERT_USER_SQL,
+                    [(guild_id, day, user_id) for user_id in user_ids]
+                )
+                # 当日すでに記録済みのユーザーは数えない
+                if cursor.rowcount > 0:
+                    await conn.execute(ADD_ACTIVE_USERS_SQL, (cursor.rowcount, guild_id, day))
+            oldest = day_of(datetime.now(JST)) - USER_RETENTION_DAYS
+            await conn.execute(PRUNE_USERS_SQL, (oldest,))
+            await conn.commit()
+        except Exception:
+            # 途中まで書いた差分を残さず、呼び出し元が再送できるようにする
+            await conn.rollback()
+            raise
+
+    async def get_range(self, guild_id: int, start: date, end: date) -> List[Tuple[date, int, int]]:
+        """期間内の (日付, メッセージ数, アクティブユーザー数) を日付順に返す"""
+        conn = await self._get_conn()
+        async with conn.execute(SELECT_RANGE_SQL, (guild_id, start.toordinal(), end.toordinal())) as cursor:
+            rows = await cursor.fetchall()
+        return [(date.fromordinal(day), messages, active) for day, messages, active in rows]
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
@@ -0,0 +1,182 @@
+"""Sentryへのエラー送信を間引き、イベントループの外で行う
+
+同じ原因のエラーは指紋（例外の型と発生箇所）でまとめ、``REPORT_INTERVAL`` 秒に1件だけ送る。
+間引いた件数は次に送るイベントに添える。イベントの組み立て（スタックの走査や
+シリアライズ）と送信は専用スレッド1本で行うため、同じバグが大量に発生しても
+Botの応答は遅くならない。
+"""
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Final, Optional, Tuple
+
+import sentry_sdk
+from prometheus_client import Counter
+from sentry_sdk.utils import event_from_exception
+
+
+REPORT_INTERVAL: Final[float] = 60.0  # 同じ指紋のエラーを送る最短間隔（秒）
+FINGERPRINT_CACHE_SIZE: Final[int] = 1024  # 記憶しておく指紋の数（LRU）
+FINGERPRINT_FRAMES: Final[int] = 5  # 指紋に使う末尾のフレーム数
+MAX_PENDING: Final[int] = 100  # 送信待ちの上限（超えた分は捨てる）
+
+SENTRY_EVENTS = Counter(
+    "discord_bot_sentry_events_total",
+    "Error events by outcome (sent, deduplicated, dropped, failed)",
+    ["result"]
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _unwrap(error: BaseException) -> BaseException:
+    # CommandInvokeError などのラッパーは元の例外で判定する
+    while getattr(error, "original", None) is not None:
+        error = error.original
+    return error
+
+
+def fingerprint(error: BaseException) -> str:
+    """例外の型と、末尾のフレームの (ファイル, 関数, 行) から指紋を作る"""
+    error = _unwrap(error)
+    frames = []
+    tb = error.__traceback__
+    while tb is not None:
+        code = tb.tb_frame.f_code
+        frames.append(f"{code.co_filename}:{code.co_name}:{tb.tb_lineno}")
+        tb = tb.tb_next
+    error_type = type(error)
+    parts = [f"{error_type.__module__}.{error_type.__qualname__}", *frames[-FINGERPRINT_FRAMES:]]
+    return hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=8).hexdigest()
+
+
+@dataclass
+class _Entry:
+    event_id: str
+    last_sent: float
+    suppressed: int = 0
+
+
+class ErrorReporter:
+    """指紋ごとに間引いたエラーをバックグラウンドでSentryに送る"""
+
+    def __init__(
+        self,
+        interval: float = REPORT_INTERVAL,
+        cache_size: int = FINGERPRINT_CACHE_SIZE,
+        max_pending: int = MAX_PENDING
+    ) -> None:
+        self.interval = interval
+        self.cache_size = cache_size
+        self.max_pending = max_pending
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # before_send は監視スレッドなどループ外からも呼ばれるためロックで守る
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sentry-reporter")
+
+    def _admit(self, key: str, queued: bool = False) -> Tuple[str, Optional[str], int]:
+        """(結果, イベントID, 前回から間引いた件数) を返す
+
+        結果は ``sent``（送る）、``deduplicated``（間引く。そのエラーとして最後に送った
+        イベントのIDを返す）、``dropped``（送信待ちがあふれた。IDは ``None``）のいずれか。
+        ``queued`` の場合は送信待ちの枠も確保し、捨てたときは送ったものとして記録しない。
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if now - entry.last_sent < self.interval:
+                    entry.suppressed += 1
+                    return "deduplicated", entry.event_id, 0
+            if queued:
+                if self._pending >= self.max_pending:
+                    return "dropped", None, 0
+                self._pending += 1
+            suppressed = entry.suppressed if entry is not None else 0
+            event_id = uuid.uuid4().hex
+            self._entries[key] = _Entry(event_id, now)
+            if len(self._entries) > self.cache_size:
+                self._entries.popitem(last=False)
+            return "sent", event_id, suppressed
+
+    def capture_exception(
+        self,
+        error: BaseException,
+        *,
+        tags: Optional[Dict[str, str]] = None,
+        user: Optional[Dict[str, str]] = None,
+        extras: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """エラーを送信キューに積み、ユーザーに表示するイベントIDを返す
+
+        Sentryが初期化されていない場合や、送信待ちがあふれて捨てた場合は ``None`` を返す。
+        """
+        if not sentry_sdk.Hub.current.client:
+            return None
+        result, event_id, suppressed = self._admit(fingerprint(error), queued=True)
+        if result != "sent":
+            SENTRY_EVENTS.labels(result=result).inc()
+            return event_id
+        self._executor.submit(self._send, error, event_id, tags or {}, user, extras or {}, suppressed)
+        return event_id
+
+    def admit_log_record(self, record: logging.LogRecord) -> bool:
+        """LoggingIntegration 経由のイベントを送るかどうか（``before_send`` から呼ぶ）
+
+        ``%`` で書式化する前のテンプレート（``record.msg``）で判定するため、
+        引数だけが異なるログは同じものとして扱う。
+        """
+        key = f"log|{record.name}|{record.msg!s}"
+        if record.exc_info and record.exc_info[1] is not None:
+            key += f"|{fingerprint(record.exc_info[1])}"
+        result, _, _ = self._admit(key)
+        if result != "sent":
+            SENTRY_EVENTS.labels(result=result).inc()
+        return result == "sent"
+
+    def _send(
+        self,
+        error: BaseException,
+        event_id: str,
+        tags: Dict[str, str],
+        user: Optional[Dict[str, str]],
+        extras: Dict[str, Any],
+        suppressed: int
+    ) -> None:
+        try:
+            client = sentry_sdk.Hub.current.client
+            if client is None:
+                return
+            event, hint = event_from_exception(error, client_options=client.options)
+            event["event_id"] = event_id
+            with sentry_sdk.push_scope() as scope:
+                for key, value in tags.items():
+                    scope.set_tag(key, value)
+                if user:
+                    scope.set_user(user)
+                for key, value in extras.items():
+                    scope.set_extra(key, value)
+                if suppressed:
+                    scope.set_extra("suppressed_duplicates", suppressed)
+                sentry_sdk.capture_event(event, hint=hint)
+            SENTRY_EVENTS.labels(result="sent").inc()
+        except Exception as e:
+            SENTRY_EVENTS.labels(result="failed").inc()
+            # ERRORで記録するとLoggingIntegrationがまたイベントを作るためWARNINGにする
+            logger.warning("Failed to report error to Sentry: %s", e)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def close(self, timeout: float = 2.0) -> None:
+        """送信待ちを捨てずに書き出して終了"""
+        self._executor.shutdown(wait=True)
+        if sentry_sdk.Hub.current.client:
+            sentry_sdk.flush(timeout=timeout)
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Final, FrozenSet, Optional
+
+import aiohttp
+from prometheus_client import Counter, Histogram
+from yarl import URL
+
+
+TOTAL_CONNECTION_LIMIT: Final[int] = 100
+PER_HOST_CONNECTION_LIMIT: Final[int] = 10
+DNS_CACHE_TTL: Final[int] = 300
+KEEPALIVE_TIMEOUT: Final[int] = 30
+
+DEFAULT_TIMEOUT: Final[aiohttp.ClientTimeout] = aiohttp.ClientTimeout(
+    total=15,
+    connect=5,
+    sock_read=10
+)
+
+DEFAULT_RETRIES: Final[int] = 2
+RETRY_BACKOFF_BASE: Final[float] = 0.5
+RETRY_AFTER_MAX: Final[float] = 5.0
+RETRY_STATUSES: Final[FrozenSet[int]] = frozenset({429, 502, 503, 504})
+IDEMPOTENT_METHODS: Final[FrozenSet[str]] = frozenset({"GET", "HEAD", "OPTIONS"})
+
+HTTP_REQUEST_LATENCY = Histogram(
+    "discord_bot_http_request_duration_seconds",
+    "Latency of outgoing HTTP requests until response headers are received",
+    ["host"]
+)
+HTTP_REQUEST_ERRORS = Counter(
+    "discord_bot_http_request_errors_total",
+    "Number of failed outgoing HTTP requests",
+    ["host", "reason"]
+)
+HTTP_REQUEST_RETRIES = Counter(
+    "discord_bot_http_request_retries_total",
+    "Number of retried outgoing HTTP requests",
+    ["host"]
+)
+
+logger = logging.getLogger(__name__)
+
+class HTTPClient:
+    """Bot全体で共有するHTTPクライアント
+
+    コネクションプール・DNSキャッシュ・タイムアウト・リトライを一元管理し、
+    各Cogは ``bot.http_client`` を借りて外部APIへアクセスする。
+    """
+
+    def __init__(self) -> None:
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """共有セッション（未作成・クローズ済みなら作り直す）"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=TOTAL_CONNECTION_LIMIT,
+                limit_per_host=PER_HOST_CONNECTION_LIMIT,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                use_dns_cache=True,
+                keepalive_timeout=KEEPALIVE_TIMEOUT
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=DEFAULT_TIMEOUT
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @staticmethod
+    def _retry_delay(attempt: int, response: Optional[aiohttp.ClientResponse]) -> float:
+        if response is not None and response.status == 429:
+            retry_after = response.headers.get("Retry-After")
+            try:
+                return min(float(retry_after), RETRY_AFTER_MAX)
+            except (TypeError, ValueError):
+                pass
+        return RETRY_BACKOFF_BASE * (2 ** attempt)
+
+    @asynccontextmanager
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        retries: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """リクエストを送信し、レスポンスを返すコンテキストマネージャ
+
+        冪等なメソッドは接続エラー・タイムアウト・一時的なステータスで
+        指数バックオフ付きでリトライする。
+        """
+        method = method.upper()
+        host = URL(str(url)).host or "unknown"
+        if retries is None:
+            retries = DEFAULT_RETRIES if method in IDEMPOTENT_METHODS else 0
+
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = await self.session.request(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                HTTP_REQUEST_ERRORS.labels(host=host, reason=type(e).__name__).inc()
+                if attempt >= retries:
+                    raise
+                HTTP_REQUEST_RETRIES.labels(host=host).inc()
+                await asyncio.sleep(self._retry_delay(attempt, None))
+                attempt += 1
+                continue
+            except aiohttp.ClientError as e:
+                HTTP_REQUEST_ERRORS.labels(host=host, reason=type(e).__name__).inc()
+                raise
+
+            HTTP_REQUEST_LATENCY.labels(host=host).observe(time.perf_counter() - start)
+            if response.status >= 400:
+                HTTP_REQUEST_ERRORS.labels(host=host, reason=str(response.status)).inc()
+            if response.status in RETRY_STATUSES and attempt < retries:
+                delay = self._retry_delay(attempt, response)
+                response.release()
+                logger.debug("Retrying %s %s after status %d", method, host, response.status)
+                HTTP_REQUEST_RETRIES.labels(host=host).inc()
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            break
+
+        try:
+            yield response
+        finally:
+            response.release()
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
@@ -0,0 +1,141 @@
+"""ホットパスの計測（コマンドの応答時間・イベントループの遅延・イベントハンドラの処理時間）
+
+どれも ``time.perf_counter`` の差分をHistogramに入れるだけで、1回あたりのコストは数マイクロ秒。
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Final, Optional
+
+import discord
+from discord import app_commands
+from prometheus_client import Histogram
+
+
+LAG_PROBE_INTERVAL: Final[float] = 0.5  # イベントループ遅延の計測間隔（秒）
+
+APP_COMMAND_FIRST_RESPONSE = Histogram(
+    "discord_bot_app_command_first_response_seconds",
+    "Time from handler start until the first interaction response (defer, message, modal) is acknowledged",
+    ["command_name"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 5.0)
+)
+APP_COMMAND_HANDLER_DURATION = Histogram(
+    "discord_bot_app_command_handler_seconds",
+    "Total time spent in an app command handler",
+    ["command_name"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+EVENT_LOOP_LAG = Histogram(
+    "discord_bot_event_loop_lag_seconds",
+    "Delay between the scheduled and actual wakeup of a periodic probe task",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+EVENT_HANDLER_DURATION = Histogram(
+    "discord_bot_event_handler_seconds",
+    "Time spent in a gateway event handler, by event and handler",
+    ["event", "handler"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+)
+
+logger = logging.getLogger(__name__)
+
+# 以下はdiscord.pyの非公開APIに依存する（2.x系で確認）。名前が変わっていたら
+# コマンドの実行を壊さないよう、計測できる範囲に縮退する
+_TREE_HAS_CALL = hasattr(app_commands.CommandTree, "_call")
+_CAN_TIME_FIRST_RESPONSE = "_cs_response" in getattr(discord.Interaction, "__slots__", ())
+if not _TREE_HAS_CALL:
+    logger.warning("CommandTree._call not found; app command latency metrics are disabled")
+elif not _CAN_TIME_FIRST_RESPONSE:
+    logger.warning("Interaction._cs_response not found; only app command handler time is measured")
+
+
+def _command_name(interaction: discord.Interaction) -> str:
+    if interaction.command is not None:
+        return interaction.command.qualified_name
+    data = interaction.data or {}
+    return data.get("name", "unknown")
+
+
+class _TimedInteractionResponse(discord.InteractionResponse):
+    """最初の応答が完了した時刻を記録するInteractionResponse"""
+
+    __slots__ = ("_on_first_response",)
+
+    def __init__(self, parent: discord.Interaction, on_first_response: Callable[[], None]) -> None:
+        super().__init__(parent)
+        self._on_first_response: Optional[Callable[[], None]] = on_first_response
+
+    def _record(self) -> None:
+        if self._on_first_response is not None:
+            callback, self._on_first_response = self._on_first_response, None
+            callback()
+
+    async def defer(self, *args: Any, **kwargs: Any) -> Any:
+        result = await super().defer(*args, **kwargs)
+        self._record()
+        return result
+
+    async def send_message(self, *args: Any, **kwargs: Any) -> Any:
+        result = await super().send_message(*args, **kwargs)
+        self._record()
+        return result
+
+    async def send_modal(self, *args: Any, **kwargs: Any) -> Any:
+        result = await super().send_modal(*args, **kwargs)
+        self._record()
+        return result
+
+    async def edit_message(self, *args: Any, **kwargs: Any) -> Any:
+        result = await super().edit_message(*args, **kwargs)
+        self._record()
+        return result
+
+
+class InstrumentedCommandTree(app_commands.CommandTree):
+    """アプリケーションコマンドの初回応答時間と処理時間を計測するCommandTree
+
+    ``CommandTree._call`` がない版では上書きが呼ばれず、通常のCommandTreeとして動く。
+    """
+
+    async def _call(self, interaction: discord.Interaction) -> None:
+        if interaction.type is not discord.InteractionType.application_command:
+            return await super()._call(interaction)
+
+        started = time.perf_counter()
+
+        def on_first_response() -> None:
+            APP_COMMAND_FIRST_RESPONSE.labels(command_name=_command_name(interaction)).observe(
+                time.perf_counter() - started
+            )
+
+        if _CAN_TIME_FIRST_RESPONSE:
+            # Interaction.response はキャッシュされるスロットなので、先に差し替えておく
+            interaction._cs_response = _TimedInteractionResponse(interaction, on_first_response)
+        try:
+            await super()._call(interaction)
+        finally:
+            APP_COMMAND_HANDLER_DURATION.labels(command_name=_command_name(interaction)).observe(
+                time.perf_counter() - started
+            )
+
+
+async def observe_event_handler(run: Callable[[], Any], event_name: str, coro: Callable[..., Any]) -> None:
+    """イベントハンドラを実行し、処理時間を記録"""
+    started = time.perf_counter()
+    try:
+        await run()
+    finally:
+        handler = getattr(coro, "__qualname__", event_name)
+        EVENT_HANDLER_DURATION.labels(event=event_name, handler=handler).observe(time.perf_counter() - started)
+
+
+async def run_loop_lag_probe() -> None:
+    """一定間隔で眠り、予定より遅れて起きた時間をイベントループの遅延として記録"""
+    while True:
+        expected = time.perf_counter() + LAG_PROBE_INTERVAL
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        lag = time.perf_counter() - expected
+        EVENT_LOOP_LAG.observe(max(0.0, lag))
+        if lag > 1.0:
+            logger.warning("Event loop was blocked for %.2fs", lag)
@@ -0,0 +1,151 @@
+"""イベントループを止めないロギング
+
+ロガーにはキューに積むだけのハンドラを付け、整形とディスクへの書き込みは
+``QueueListener`` の専用スレッド1本で行う。キューが満杯のときは待たずに捨てて数える。
+"""
+import copy
+import json
+import logging
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from pathlib import Path
+from typing import Dict, Final, Iterable, Optional
+
+from prometheus_client import Counter
+
+
+LOG_QUEUE_SIZE: Final[int] = 10000  # 書き込み待ちのログの上限
+LOG_FILES: Final[tuple] = ("logs", "commands")
+
+# うるさいロガーはINFO以下をN件に1件だけ残す（WARNING以上は常に残す）
+LOG_SAMPLING: Final[Dict[str, int]] = {
+    "discord.gateway": 10,
+    "discord.http": 10,
+    "aiosqlite": 100,
+    "PIL": 100
+}
+
+LOG_RECORDS_DROPPED = Counter(
+    "discord_bot_log_records_dropped_total",
+    "Log records discarded because the logging queue was full"
+)
+LOG_RECORDS_SAMPLED_OUT = Counter(
+    "discord_bot_log_records_sampled_out_total",
+    "Log records discarded by per-logger sampling",
+    ["logger"]
+)
+
+
+class JSONFormatter(logging.Formatter):
+    """1レコードを1行のJSONにする"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """``LOG_SAMPLING`` に従ってINFO以下のレコードを間引く"""
+
+    def __init__(self, rates: Dict[str, int]) -> None:
+        super().__init__()
+        self.rates = rates
+        self._seen: Dict[str, int] = {}
+
+    def _rate_for(self, name: str) -> Optional[str]:
+        # 最も長く一致するロガー名の設定を使う
+        while name:
+            if name in self.rates:
+                return name
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = self._rate_for(record.name)
+        if key is None:
+            return True
+        seen = self._seen.get(key, 0)
+        self._seen[key] = seen + 1
+        if seen % self.rates[key] == 0:
+            return True
+        LOG_RECORDS_SAMPLED_OUT.labels(logger=key).inc()
+        return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    """キューが満杯なら待たずにレコードを捨てるQueueHandler"""
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 同じプロセス内のスレッドに渡すだけなので、整形はリスナー側に任せる。
+        # 引数だけは後から変更されないように文字列にしておく。
+        # 元のレコードはこの後もSentryのLoggingIntegrationなどが書式化前の
+        # msg/args を使うため、コピーを書き換える（標準のQueueHandlerと同じ）
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+
+def setup_logging(
+    log_dir: Path,
+    retention_days: int,
+    logger_names: Iterable[str],
+    console_format: str,
+    level: int = logging.INFO
+) -> QueueListener:
+    """指定したロガーをキュー経由のパイプラインにつなぎ、未開始のリスナーを返す"""
+    log_dir.mkdir(exist_ok=True)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(level)
+    console_handler.setFormatter(logging.Formatter(console_format, datefmt='%Y-%m-%d %H:%M:%S'))
+
+    handlers = [console_handler]
+    for name in LOG_FILES:
+        handler = TimedRotatingFileHandler(
+            log_dir / f"{name}.log",
+            when="midnight",
+            interval=1,
+            backupCount=retention_days,
+            encoding="utf-8"
+        )
+        handler.setLevel(level)
+        handler.setFormatter(JSONFormatter())
+        handlers.append(handler)
+
+    log_queue: queue.Queue = queue.Queue(LOG_QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(LOG_SAMPLING))
+
+    # 互いに親子関係のないロガーにだけ付けるので、1レコードは1回だけキューに入る
+    for name in logger_names:
+        target = logging.getLogger(name)
+        target.setLevel(level)
+        target.addHandler(queue_handler)
+
+    return QueueListener(log_queue, *handlers, respect_handler_level=True)
@@ -1,7 +1,7 @@
 import logging
 import os
 import sys
-from typing import Optional
+from typing import Any, Optional, Tuple
 from dotenv import load_dotenv
 
 import discord
@@ -9,9 +9,17 @@ import sentry_sdk
 from discord.ext import commands
 from sentry_sdk.integrations.logging import LoggingIntegration
 
+from module.error_reporter import ErrorReporter
+
 # 環境変数を読み込む
 load_dotenv()
 
+ERROR_NOTICE = (
+    "エラーID: `{}`\n問い合わせの際は、エラーIDも一緒にしていただけると幸いです。\n\n"
+    "すでにエラーは開発者に報告されていますが、以下のボタンで詳細なユーザーレポートを送信できます。"
+)
+ERROR_NOTICE_WITHOUT_ID = "時間をおいて再度お試しください。"
+
 # エラーレポート用のUIコンポーネント
 class ErrorReportButton(discord.ui.Button):
     def __init__(self, error_id: str):
@@ -106,6 +114,7 @@ class LoggingCog(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
         self.logger = logging.getLogger("bot")
+        self.reporter = ErrorReporter()  # 間引きと送信を担当
         self._init_sentry()
         
         # グローバルエラーハンドラを設定
@@ -152,8 +161,26 @@ class LoggingCog(commands.Cog):
         except Exception as e:
             self.logger.error(f"Failed to send test event to Sentry: {e}")
             
+    def cog_unload(self) -> None:
+        self.reporter.close()
+
+    def _error_notice(self, title: str, event_id: Optional[str]) -> Tuple[discord.Embed, Any]:
+        """ユーザーに表示するエラー通知のEmbedとView
+
+        送信待ちがあふれてSentryに送らなかった場合（IDがない場合）は、
+        存在しないイベントを案内しないようIDとレポートボタンを付けない。
+        """
+        if event_id is None:
+            embed = discord.Embed(title=title, description=ERROR_NOTICE_WITHOUT_ID, color=discord.Color.red())
+            return embed, discord.utils.MISSING
+        embed = discord.Embed(title=title, description=ERROR_NOTICE.format(event_id), color=discord.Color.red())
+        return embed, ErrorReportView(event_id)
+
     def _before_send_event(self, event: dict, hint: Optional[dict]) -> dict:
         """Sentryイベント送信前の処理"""
+        # ログ由来のイベントも同じ内容なら間引く
+        if hint and "log_record" in hint and not self.reporter.admit_log_record(hint["log_record"]):
+            return None
         if hint and "exc_info" in hint:
             exc_type, exc_value, tb = hint["exc_info"]
             # エラーの種類によって処理を分けることができる
@@ -212,34 +239,25 @@ class LoggingCog(commands.Cog):
             
         # Sentryにエラーイベントを明示的に送信
         if sentry_sdk.Hub.current.client:
-            with sentry_sdk.push_scope() as scope:
-                # コンテキスト情報を追加
-                scope.set_tag("command", str(ctx.command) if ctx.command else "Unknown")
-                scope.set_tag("guild", guild_name)
-                scope.set_user({"id": str(ctx.author.id), "username": str(ctx.author.id)})  # ユーザーネームの代わりにユーザーIDを設定
-                scope.set_extra("message_content", ctx.message.content if hasattr(ctx.message, "content") else "No content")
-                
-                # エラーをキャプチャしてIDを取得
-                event_id = sentry_sdk.capture_exception(error)
-                self.logger.info(f"Sent error event to Sentry with ID: {event_id}")
-                
-                # ユーザーにエラーIDを通知
+            event_id = self.reporter.capture_exception(
+                error,
+                tags={"command": str(ctx.command) if ctx.command else "Unknown", "guild": guild_name},
+                user={"id": str(ctx.author.id), "username": str(ctx.author.id)},  # ユーザーネームの代わりにユーザーIDを設定
+                extras={"message_content": ctx.message.content if hasattr(ctx.message, "content") else "No content"}
+            )
+            self.logger.info(f"Queued error event for Sentry with ID: {event_id}")
+            
+            # ユーザーにエラーIDを通知
+            try:
+                embed, view = self._error_notice("エラーが発生しました", event_id)
+                await ctx.send(embed=embed, view=view, ephemeral=True)
+            except Exception as e:
+                self.logger.error(f"Failed to send error message to user: {e}")
+                # バックアップとして通常のメッセージを試す
                 try:
-                    embed = discord.Embed(
-                        title="エラーが発生しました",
-                        description=f"エラーID: `{event_id}`\n問い合わせの際は、エラーIDも一緒にしていただけると幸いです。\n\nすでにエラーは開発者に報告されていますが、以下のボタンで詳細なユーザーレポートを送信できます。",
-                        color=discord.Color.red()
-                    )
-                    # エラーレポートボタンを追加
-                    view = ErrorReportView(event_id)
-                    await ctx.send(embed=embed, view=view, ephemeral=True)
-                except Exception as e:
-                    self.logger.error(f"Failed to send error message to user: {e}")
-                    # バックアップとして通常のメッセージを試す
-                    try:
-                        await ctx.send(f"エラーが発生しました。\nエラーID: `{event_id}`")
-                    except Exception:
-                        pass
+                    await ctx.send(f"エラーが発生しました。\nエラーID: `{event_id}`" if event_id else "エラーが発生しました。")
+                except Exception:
+                    pass
 
     @commands.Cog.listener()
     async def on_app_command_completion(self, interaction: discord.Interaction, command: discord.app_commands.Command) -> None:
@@ -254,42 +272,32 @@ class LoggingCog(commands.Cog):
         
         # Sentryにエラーイベントを明示的に送信
         if sentry_sdk.Hub.current.client:
-            with sentry_sdk.push_scope() as scope:
-                # コンテキスト情報を追加
-                scope.set_tag("command", command_name)
-                scope.set_tag("guild", guild_name)
-                scope.set_user({"id": str(interaction.user.id), "username": str(interaction.user.id)})  # ユーザーネームの代わりにユーザーIDを設定
-                scope.set_extra("interaction_data", str(interaction.data) if hasattr(interaction, "data") else "No data")
-                
-                # エラーをキャプチャしてIDを取得
-                event_id = sentry_sdk.capture_exception(error)
-                self.logger.info(f"Sent error event to Sentry with ID: {event_id}")
+            event_id = self.reporter.capture_exception(
+                error,
+                tags={"command": command_name, "guild": guild_name},
+                user={"id": str(interaction.user.id), "username": str(interaction.user.id)},  # ユーザーネームの代わりにユーザーIDを設定
+                extras={"interaction_data": str(interaction.data) if hasattr(interaction, "data") else "No data"}
+            )
+            self.logger.info(f"Queued error event for Sentry with ID: {event_id}")
+            
+            # ユーザーにエラーIDを通知（インタラクションを優先し、失敗したらDMへ）
+            try:
+                embed, view = self._error_notice("コマンド実行でエラーが発生しました", event_id)
                 
-                # ユーザーにエラーIDを通知（インタラクションを優先し、失敗したらDMへ）
+                # インタラクションの応答状態を確認
+                if not interaction.response.is_done():
+                    # まだ応答していない場合は通常の応答として送信
+                    await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+                else:
+                    # 既に応答済みの場合はフォローアップとして送信
+                    await interaction.followup.send(embed=embed, view=view, ephemeral=True)
+            except Exception as e:
+                self.logger.error(f"Failed to send error message via interaction: {e}")
+                # DMを試みる
                 try:
-                    embed = discord.Embed(
-                        title="コマンド実行でエラーが発生しました",
-                        description=f"エラーID: `{event_id}`\n問い合わせの際は、エラーIDも一緒にしていただけると幸いです。\n\nすでにエラーは開発者に報告されていますが、以下のボタンで詳細なユーザーレポートを送信できます。",
-                        color=discord.Color.red()
-                    )
-                    
-                    # エラーレポートボタンを追加
-                    view = ErrorReportView(event_id)
-                    
-                    # インタラクションの応答状態を確認
-                    if not interaction.response.is_done():
-                        # まだ応答していない場合は通常の応答として送信
-                        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
-                    else:
-                        # 既に応答済みの場合はフォローアップとして送信
-                        await interaction.followup.send(embed=embed, view=view, ephemeral=True)
-                except Exception as e:
-                    self.logger.error(f"Failed to send error message via interaction: {e}")
-                    # DMを試みる
-                    try:
-                        await interaction.user.send(embed=embed, view=view)
-                    except Exception as dm_error:
-                        self.logger.error(f"Failed to send DM with error message: {dm_error}")
+                    await interaction.user.send(embed=embed, view=view)
+                except Exception as dm_error:
+                    self.logger.error(f"Failed to send DM with error message: {dm_error}")
 
     async def on_global_error(self, event_method: str, *args, **kwargs) -> None:
         """グローバルな未処理例外ハンドラ"""
@@ -298,55 +306,44 @@ class LoggingCog(commands.Cog):
         
         # Sentryにエラーを送信
         if sentry_sdk.Hub.current.client:
-            with sentry_sdk.push_scope() as scope:
-                scope.set_tag("event", event_method)
-                scope.set_extra("traceback", f"{error_type.__name__}: {error_value}")
-                
-                # エラーをキャプチャ
-                event_id = sentry_sdk.capture_exception()
-                self.logger.info(f"Sent uncaught error to Sentry with ID: {event_id}")
-                
-                # コマンド種類を特定してユーザーに通知
-                try:
-                    if args and len(args) > 0:
-                        if isinstance(args[0], commands.Context):
-                            # 伝統的なコマンドの場合
-                            ctx = args[0]
-                            embed = discord.Embed(
-                                title="エラーが発生しました",
-                                description=f"エラーID: `{event_id}`\n問い合わせの際は、エラーIDも一緒にしていただけると幸いです。\n\nすでにエラーは開発者に報告されていますが、以下のボタンで詳細なユーザーレポートを送信できます。",
-                                color=discord.Color.red()
-                            )
-                            view = ErrorReportView(event_id)
-                            await ctx.send(embed=embed, view=view, ephemeral=True)
-                        elif isinstance(args[0], discord.Interaction):
-                            # スラッシュコマンドの場合
-                            interaction = args[0]
+            event_id = self.reporter.capture_exception(
+                error_value,
+                tags={"event": event_method},
+                extras={"traceback": f"{error_type.__name__}: {error_value}"}
+            )
+            self.logger.info(f"Queued uncaught error for Sentry with ID: {event_id}")
+            
+            # コマンド種類を特定してユーザーに通知
+            try:
+                if args and len(args) > 0:
+                    if isinstance(args[0], commands.Context):
+                        # 伝統的なコマンドの場合
+                        ctx = args[0]
+                        embed, view = self._error_notice("エラーが発生しました", event_id)
+                        await ctx.send(embed=embed, view=view, ephemeral=True)
+                    elif isinstance(args[0], discord.Interaction):
+                        # スラッシュコマンドの場合
+                        interaction = args[0]
+                        try:
+                            embed, view = self._error_notice("エラーが発生しました", event_id)
+                            
+                            if interaction.response.is_done():
+                                # 既に応答済みの場合はフォローアップとして送信
+                                await interaction.followup.send(embed=embed, view=view, ephemeral=True)
+                            else:
+                                # まだ応答していない場合は通常の応答として送信
+                                await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+                        except Exception as e:
+                            # インタラクションへの応答が失敗した場合はDMを試みる
+                            self.logger.error(f"Failed to send error message via interaction: {e}")
                             try:
-                                embed = discord.Embed(
-                                    title="エラーが発生しました",
-                                    description=f"エラーID: `{event_id}`\n問い合わせの際は、エラーIDも一緒にしていただけると幸いです。\n\nすでにエラーは開発者に報告されていますが、以下のボタンで詳細なユーザーレポートを送信できます。",
-                                    color=discord.Color.red()
+                                await interaction.user.send(
+                                    embed=embed, view=view
                                 )
-                                view = ErrorReportView(event_id)
-                                
-                                if interaction.response.is_done():
-                                    # 既に応答済みの場合はフォローアップとして送信
-                                    await interaction.followup.send(embed=embed, view=view, ephemeral=True)
-                                else:
-                                    # まだ応答していない場合は通常の応答として送信
-                                    await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
-                            except Exception as e:
-                                # インタラクションへの応答が失敗した場合はDMを試みる
-                                self.logger.error(f"Failed to send error message via interaction: {e}")
-                                try:
-                                    await interaction.user.send(
-                                        embed=embed, view=view
-                                    )
-                                except Exception as dm_error:
-                                    self.logger.error(f"Failed to send DM with error message: {dm_error}")
-                except Exception as notify_error:
-                    self.logger.error(f"Failed to notify user about error: {notify_error}")
+                            except Exception as dm_error:
+                                self.logger.error(f"Failed to send DM with error message: {dm_error}")
+            except Exception as notify_error:
+                self.logger.error(f"Failed to notify user about error: {notify_error}")
         
         # 必要に応じて元のエラーハンドラを呼び出す
         if self.old_on_error:
@@ -363,40 +360,29 @@ class LoggingCog(commands.Cog):
         
         # Sentryにエラーイベントを明示的に送信
         if sentry_sdk.Hub.current.client:
-            with sentry_sdk.push_scope() as scope:
-                # コンテキスト情報を追加
-                scope.set_tag("command", command_name)
-                scope.set_tag("command_type", "app_command")
-                scope.set_tag("guild", interaction.guild.name if interaction.guild else "DM")
-                scope.set_user({"id": str(interaction.user.id), "username": str(interaction.user.id)})  # ユーザーネームの代わりにユーザーIDを設定
-                scope.set_extra("interaction_data", str(interaction.data) if hasattr(interaction, "data") else "No data")
-                
-                # エラーをキャプチャしてIDを取得
-                event_id = sentry_sdk.capture_exception(error)
-                self.logger.info(f"Sent app command tree error to Sentry with ID: {event_id}")
+            event_id = self.reporter.capture_exception(
+                error,
+                tags={"command": command_name, "command_type": "app_command", "guild": interaction.guild.name if interaction.guild else "DM"},
+                user={"id": str(interaction.user.id), "username": str(interaction.user.id)},  # ユーザーネームの代わりにユーザーIDを設定
+                extras={"interaction_data": str(interaction.data) if hasattr(interaction, "data") else "No data"}
+            )
+            self.logger.info(f"Queued app command tree error for Sentry with ID: {event_id}")
+            
+            # ユーザーにエラーIDを通知
+            try:
+                embed, view = self._error_notice("コマンド実行中にエラーが発生しました", event_id)
                 
-                # ユーザーにエラーIDを通知
+                if not interaction.response.is_done():
+                    await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+                else:
+                    await interaction.followup.send(embed=embed, view=view, ephemeral=True)
+            except Exception as e:
+                self.logger.error(f"Failed to send error message via interaction: {e}")
                 try:
-                    embed = discord.Embed(
-                        title="コマンド実行中にエラーが発生しました",
-                        description=f"エラーID: `{event_id}`\n問い合わせの際は、エラーIDも一緒にしていただけると幸いです。\n\nすでにエラーは開発者に報告されていますが、以下のボタンで詳細なユーザーレポートを送信できます。",
-                        color=discord.Color.red()
-                    )
-                    
-                    # エラーレポートボタンを追加
-                    view = ErrorReportView(event_id)
-                    
-                    if not interaction.response.is_done():
-                        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
-                    else:
-                        await interaction.followup.send(embed=embed, view=view, ephemeral=True)
-                except Exception as e:
-                    self.logger.error(f"Failed to send error message via interaction: {e}")
-                    try:
-                        # DMを試みる
-                        await interaction.user.send(embed=embed, view=view)
-                    except Exception as dm_error:
-                        self.logger.error(f"Failed to send DM with error message: {dm_error}")
+                    # DMを試みる
+                    await interaction.user.send(embed=embed, view=view)
+                except Exception as dm_error:
+                    self.logger.error(f"Failed to send DM with error message: {dm_error}")
 
     @commands.command(name="test_sentry")
     async def test_sentry(self, ctx: commands.Context) -> None:
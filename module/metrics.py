@@ -0,0 +1,48 @@
+"""Cogから利用するPrometheusメトリクス
+
+cogs配下のモジュールはホットリロードされるため、メトリクスをそこで定義すると
+再登録でエラーになる。リロードされないこのモジュールで一度だけ定義する。
+"""
+from prometheus_client import Counter, Gauge, Histogram
+
+
+# 読み上げ (cogs/voice/voice.py)
+TTS_QUEUE_DEPTH = Gauge(
+    "discord_bot_tts_queue_depth",
+    "Number of utterances waiting to be played across all guilds"
+)
+TTS_PLAYBACK_GAP = Histogram(
+    "discord_bot_tts_playback_gap_seconds",
+    "Silence between the end of one queued clip and the start of the next",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+# 時報 (cogs/commands/timealert.py)
+TIME_SIGNAL_DRIFT = Histogram(
+    "discord_bot_time_signal_scheduler_drift_seconds",
+    "Delay between the minute boundary and the scheduler waking up",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+TIME_SIGNAL_LATENESS = Histogram(
+    "discord_bot_time_signal_lateness_seconds",
+    "Delay between the minute boundary and a time signal being delivered",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+)
+TIME_SIGNAL_SENDS = Counter(
+    "discord_bot_time_signal_sends_total",
+    "Time signal deliveries by result (sent, failed, missing_channel)",
+    ["result"]
+)
+
+# 掲示板 (cogs/board/board.py)
+UP_REMINDERS = Counter(
+    "discord_bot_up_reminders_total",
+    "/up reminders by result (sent, failed, missing_channel, db_error)",
+    ["result"]
+)
+
+# プレミアム (cogs/premium/premium.py)
+PREMIUM_USERS = Gauge(
+    "discord_bot_premium_users_total",
+    "Total number of premium users"
+)
@@ -1,19 +1,17 @@
 import discord
 from discord.ext import commands, tasks
-from prometheus_client import Counter, Gauge, start_http_server
-import json
-import os
-from asyncio import Lock
-import asyncpg
-from dotenv import load_dotenv
-
-load_dotenv()
-DB_HOST = os.getenv("DB_HOST", "localhost")
-DB_PORT = os.getenv("DB_PORT", "5432")
-DB_USER = os.getenv("DB_USER", "user")
-DB_PASSWORD = os.getenv("DB_PASSWORD", "password")
-DB_NAME = "premium"
-CONN_STR = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+import time
+from typing import Dict, Optional, Tuple
+
+from module.sketches import HyperLogLog, RateRing, SpaceSaving
+
+TOP_USERS = 10  # 実行回数の多いユーザーとして公開する件数
+TOP_USERS_CAPACITY = 100  # 上位ユーザーの推定に使うカウンタ数
+GUILD_BUCKETS = 16  # メッセージ数を集計するギルドのバケット数（guild_id % GUILD_BUCKETS）
+RATE_WINDOWS = {"1m": 60, "5m": 300}  # 公開する移動平均の期間（秒）
+RATE_RING_SECONDS = 301  # 最長の期間 + 集計中の1秒
+COMMAND_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
 
 class PrometheusCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -25,10 +23,21 @@ class PrometheusCog(commands.Cog):
             'Total number of executed commands',
             ['command_name']
         )
-        self.user_command_count = Counter(
-            'discord_bot_user_commands_total',
-            'Total number of commands executed per user',
-            ['user_id']
+        # ユーザーごとのCounterは系列数が際限なく増えるため、近似集計で上限を設ける
+        self.command_users_estimate = Gauge(
+            'discord_bot_command_unique_users_estimate',
+            'Estimated number of distinct users who have executed commands (HyperLogLog)'
+        )
+        self.top_command_users = Gauge(
+            'discord_bot_command_top_users',
+            'Command executions of the most active users (top-K, approximate)',
+            ['rank', 'user_id']
+        )
+        self.command_latency = Histogram(
+            'discord_bot_command_duration_seconds',
+            'Time from invocation to completion per prefix command (app commands: discord_bot_app_command_handler_seconds)',
+            ['command_name', 'command_type'],
+            buckets=COMMAND_LATENCY_BUCKETS
         )
         self.error_count = Counter(
             'discord_bot_command_errors_total',
@@ -47,6 +56,16 @@ class PrometheusCog(commands.Cog):
             'discord_bot_messages_received_per_minute',
             'Number of messages received per minute'
         )
+        self.messages_received = Counter(
+            'discord_bot_messages_received_total',
+            'Total number of messages received, by shard and guild bucket',
+            ['shard', 'bucket']
+        )
+        self.message_rate = Gauge(
+            'discord_bot_messages_received_rate',
+            'Rolling messages per second, by shard and window',
+            ['shard', 'window']
+        )
         self.vc_join_count = Counter(
             'discord_bot_vc_joins_total',
             'Total number of voice channel joins'
@@ -55,18 +74,19 @@ class PrometheusCog(commands.Cog):
             'discord_bot_vc_active_count',
             'Number of active voice channels the bot is currently in'
         )
-        self.premium_user_count = Gauge(
-            'discord_bot_premium_users_total',
-            'Total number of premium users'
-        )
 
-        # Temporary message counter
-        self._message_count_temp = 0
-        self._message_count_lock = Lock()
+        # (shard, bucket) ごとの1秒単位のメッセージ数
+        # asyncioは単一スレッドなのでロックは不要
+        self._message_rings: Dict[Tuple[int, int], RateRing] = {}
+        self._message_counters: Dict[Tuple[int, int], Counter] = {}
 
         # Track active voice channels
         self._active_vcs = set()
 
+        # Sketches for command users
+        self._command_users = HyperLogLog()
+        self._top_users = SpaceSaving(TOP_USERS_CAPACITY)
+
         # Start Prometheus HTTP server on port 8000
         start_http_server(8491)
 
@@ -76,18 +96,33 @@ class PrometheusCog(commands.Cog):
     def cog_unload(self):
         self.update_gauges.cancel()
 
+    def _record_command(self, command_name: str, command_type: str, user_id: int, duration: Optional[float] = None):
+        # Increment command execution counter per command
+        self.command_count.labels(command_name=command_name).inc()
+        if duration is not None:
+            self.command_latency.labels(command_name=command_name, command_type=command_type).observe(duration)
+
+        # Track command users with bounded memory
+        self._command_users.add(user_id)
+        self._top_users.add(user_id)
+
+    @commands.Cog.listener()
+    async def on_command(self, ctx: commands.Context):
+        ctx.invoked_at = time.perf_counter()
+
     @commands.Cog.listener()
     async def on_command_completion(self, ctx: commands.Context):
         if not ctx.command:
             return
 
-        command_name = ctx.command.qualified_name
-        # Increment command execution counter per command
-        self.command_count.labels(command_name=command_name).inc()
+        started = getattr(ctx, 'invoked_at', None)
+        duration = time.perf_counter() - started if started is not None else None
+        self._record_command(ctx.command.qualified_name, 'prefix', ctx.author.id, duration)
 
-        # Track per-user command usage
-        user_id = str(ctx.author.id)
-        self.user_command_count.labels(user_id=user_id).inc()
+    @commands.Cog.listener()
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        # 処理時間は InstrumentedCommandTree が計測する（module/instrumentation.py）
+        self._record_command(command.qualified_name, 'app', interaction.user.id)
 
     @commands.Cog.listener()
     async def on_command_error(self, ctx: commands.Context, error):
@@ -100,10 +135,16 @@ class PrometheusCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
-        # Increment temporary message counter
-        if not message.author.bot:  # Ignore bot messages
-            async with self._message_count_lock:
-                self._message_count_temp += 1
+        if message.author.bot:  # Ignore bot messages
+            return
+        guild = message.guild
+        key = (guild.shard_id, guild.id % GUILD_BUCKETS) if guild else (0, 0)
+        ring = self._message_rings.get(key)
+        if ring is None:
+            ring = self._message_rings[key] = RateRing(RATE_RING_SECONDS)
+            self._message_counters[key] = self.messages_received.labels(shard=str(key[0]), bucket=str(key[1]))
+        ring.add(int(time.monotonic()))
+        self._message_counters[key].inc()
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
@@ -127,41 +168,30 @@ class PrometheusCog(commands.Cog):
         # Update server count gauge every 60 seconds
         self.server_count.set(len(self.bot.guilds))
 
-        # Update unique user count from JSON file
-        user_count = self.get_unique_user_count()
-        self.unique_users.set(user_count)
+        # Update unique user count from the in-process stats service
+        self.unique_users.set(self.bot.stats.user_count)
+
+        # Export command user sketches as bounded gauges
+        self.command_users_estimate.set(self._command_users.count())
+        self.top_command_users.clear()
+        for rank, (user_id, count) in enumerate(self._top_users.top(TOP_USERS), start=1):
+            self.top_command_users.labels(rank=str(rank), user_id=str(user_id)).set(count)
 
         # Update message count per minute
-        async with self._message_count_lock:
-            self.message_count_per_minute.set(self._message_count_temp)
-            self._message_count_temp = 0
-
-        # Update premium user count
-        premium_user_count = await self.get_premium_user_count()
-        self.premium_user_count.set(premium_user_count)
-
-    async def get_premium_user_count(self):
-        # Load premium user count from the database
-        try:
-            async with asyncpg.create_pool(CONN_STR) as pool:
-                async with pool.acquire() as conn:
-                    count = await conn.fetchval("SELECT COUNT(*) FROM premium_users")
-                    return count
-        except asyncpg.PostgresError:
-            return 0
+        now = int(time.monotonic())
+        shard_rates: Dict[int, Dict[str, float]] = {}
+        for (shard_id, _), ring in self._message_rings.items():
+            rates = shard_rates.setdefault(shard_id, dict.fromkeys(RATE_WINDOWS, 0.0))
+            for window, seconds in RATE_WINDOWS.items():
+                rates[window] += ring.rate(now, seconds)
+        for shard_id, rates in shard_rates.items():
+            for window, rate in rates.items():
+                self.message_rate.labels(shard=str(shard_id), window=window).set(rate)
+        self.message_count_per_minute.set(round(sum(rates["1m"] for rates in shard_rates.values()) * 60))
 
     @update_gauges.before_loop
     async def before_update_gauges(self):
         await self.bot.wait_until_ready()
 
-    def get_unique_user_count(self):
-        # Load unique user count from JSON file
-        try:
-            with open('data/user_count.json', 'r') as f:
-                data = json.load(f)
-                return data.get('total_users', 0)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return 0
-
 async def setup(bot: commands.Bot):
     await bot.add_cog(PrometheusCog(bot))
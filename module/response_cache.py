@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Final, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+
+
+MAX_ENTRIES: Final[int] = 5000
+DEFAULT_TTL: Final[float] = 300.0
+DEFAULT_NEGATIVE_TTL: Final[float] = 60.0
+
+CACHE_REQUESTS = Counter(
+    "discord_bot_response_cache_requests_total",
+    "Number of response cache lookups by result (hit, negative_hit, coalesced, miss)",
+    ["command", "result"]
+)
+CACHE_HIT_RATIO = Gauge(
+    "discord_bot_response_cache_hit_ratio",
+    "Ratio of lookups served without a new upstream request",
+    ["command"]
+)
+CACHE_ENTRIES = Gauge(
+    "discord_bot_response_cache_entries",
+    "Number of entries currently held in the response cache"
+)
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str]
+
+class ResponseCache:
+    """外部APIの応答をコマンド単位でキャッシュするクラス
+
+    キーは (コマンド名, 正規化した引数)。同一キーへの同時リクエストは
+    1回の上流呼び出しにまとめ（シングルフライト）、``None`` の結果は
+    「見つからない」として短いTTLでネガティブキャッシュする。
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES) -> None:
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Task] = {}
+        self._stats: Dict[str, list] = {}
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        return value.strip().casefold()
+
+    def _record(self, command: str, result: str) -> None:
+        CACHE_REQUESTS.labels(command=command, result=result).inc()
+        stats = self._stats.setdefault(command, [0, 0])
+        stats[0 if result == "miss" else 1] += 1
+        CACHE_HIT_RATIO.labels(command=command).set(stats[1] / (stats[0] + stats[1]))
+
+    def _lookup(self, key: CacheKey) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key: CacheKey, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        CACHE_ENTRIES.set(len(self._entries))
+
+    async def get_or_fetch(
+        self,
+        command: str,
+        argument: str,
+        fetcher: Callable[[], Awaitable[Any]],
+        *,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL
+    ) -> Any:
+        """キャッシュ済みの値を返すか、``fetcher`` で取得してキャッシュする
+
+        ``fetcher`` が例外を送出した場合はキャッシュせず、待機中の全員に伝播する。
+        """
+        key = (command, self.normalize(argument))
+
+        found, value = self._lookup(key)
+        if found:
+            self._record(command, "negative_hit" if value is None else "hit")
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._record(command, "coalesced")
+        else:
+            self._record(command, "miss")
+            task = asyncio.ensure_future(fetcher())
+            self._inflight[key] = task
+
+            def _on_done(done: asyncio.Task) -> None:
+                self._inflight.pop(key, None)
+                if done.cancelled() or done.exception() is not None:
+                    return
+                result = done.result()
+                self._store(key, result, negative_ttl if result is None else ttl)
+
+            task.add_done_callback(_on_done)
+
+        # 呼び出し元がキャンセルされても上流リクエストは他の待機者のために継続する
+        return await asyncio.shield(task)
+
+    def invalidate(self, command: str, argument: Optional[str] = None) -> None:
+        """指定したコマンド（と引数）のキャッシュを破棄"""
+        if argument is not None:
+            self._entries.pop((command, self.normalize(argument)), None)
+        else:
+            for key in [k for k in self._entries if k[0] == command]:
+                del self._entries[key]
+        CACHE_ENTRIES.set(len(self._entries))
@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Final, List, Optional, Set
+
+import discord
+from prometheus_client import Counter, Gauge, Histogram
+
+
+DM_LOAD_THRESHOLD: Final[int] = 10  # 待ちメンバー数がこれを超えたらDM通知を省略
+IDLE_TIMEOUT: Final[float] = 60.0  # 空になったギルドのワーカーを終了するまでの秒数
+
+ROLE_QUEUE_DEPTH = Gauge(
+    "discord_bot_role_queue_depth",
+    "Number of members with pending role changes across all guilds"
+)
+ROLE_QUEUE_LAG = Histogram(
+    "discord_bot_role_queue_lag_seconds",
+    "Time from enqueueing a role change until it is applied",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+)
+ROLE_MUTATIONS = Counter(
+    "discord_bot_role_mutations_total",
+    "Role changes by result (applied, cancelled, failed)",
+    ["result"]
+)
+ROLE_DM_SKIPPED = Counter(
+    "discord_bot_role_dm_skipped_total",
+    "Role change notifications not sent because the guild queue was under load"
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _Mutation:
+    __slots__ = ("add", "reason", "notice", "enqueued_at")
+
+    def __init__(self, add: bool, reason: Optional[str], notice: Optional[str]) -> None:
+        self.add = add
+        self.reason = reason
+        self.notice = notice
+        self.enqueued_at = time.monotonic()
+
+
+class _GuildQueue:
+    def __init__(self) -> None:
+        # メンバーID -> {ロールID: 変更内容}（到着順）
+        self.pending: "OrderedDict[int, Dict[int, _Mutation]]" = OrderedDict()
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+
+class RoleMutationQueue:
+    """ギルドごとにロールの付与・削除をまとめて順に適用するキュー
+
+    同じメンバーへの変更は1件にまとめ、付与の直後に削除された場合は相殺する。
+    ギルドごとに1つのワーカーが直列に適用するため、同時に大量のイベントが
+    来てもDiscordのレートリミットのバケットを一度に使い切らない。
+    """
+
+    def __init__(self, bot: discord.Client) -> None:
+        self.bot = bot
+        self._guilds: Dict[int, _GuildQueue] = {}
+        self._depth = 0
+        self._notify_tasks: Set[asyncio.Task] = set()
+
+    def add_role(self, guild: discord.Guild, member_id: int, role: discord.Role,
+                 *, reason: Optional[str] = None, notice: Optional[str] = None) -> None:
+        """ロールの付与を予約（``notice`` は負荷が低いときだけDMで送る）"""
+        self._enqueue(guild, member_id, role.id, True, reason, notice)
+
+    def remove_role(self, guild: discord.Guild, member_id: int, role: discord.Role,
+                    *, reason: Optional[str] = None, notice: Optional[str] = None) -> None:
+        """ロールの削除を予約"""
+        self._enqueue(guild, member_id, role.id, False, reason, notice)
+
+    def _enqueue(self, guild: discord.Guild, member_id: int, role_id: int,
+                 add: bool, reason: Optional[str], notice: Optional[str]) -> None:
+        queue = self._guilds.get(guild.id)
+        if queue is None:
+            queue = self._guilds[guild.id] = _GuildQueue()
+
+        changes = queue.pending.get(member_id)
+        if changes is None:
+            changes = queue.pending[member_id] = {}
+            self._set_depth(1)
+
+        previous = changes.get(role_id)
+        if previous is not None and previous.add != add:
+            # 未適用の変更と逆の操作なので打ち消し合う
+            del changes[role_id]
+            ROLE_MUTATIONS.labels(result="cancelled").inc(2)
+            if not changes:
+                del queue.pending[member_id]
+                self._set_depth(-1)
+            return
+        changes[role_id] = _Mutation(add, reason, notice)
+
+        queue.wakeup.set()
+        if queue.task is None or queue.task.done():
+            queue.task = asyncio.create_task(self._run(guild.id, queue))
+
+    def _set_depth(self, delta: int) -> None:
+        self._depth += delta
+        ROLE_QUEUE_DEPTH.set(self._depth)
+
+    async def _run(self, guild_id: int, queue: _GuildQueue) -> None:
+        while True:
+            if not queue.pending:
+                queue.wakeup.clear()
+                try:
+                    await asyncio.wait_for(queue.wakeup.wait(), timeout=IDLE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    if not queue.pending:
+                        self._guilds.pop(guild_id, None)
+                        return
+                continue
+
+            member_id, changes = queue.pending.popitem(last=False)
+            self._set_depth(-1)
+            under_load = len(queue.pending) >= DM_LOAD_THRESHOLD
+            try:
+                await self._apply(guild_id, member_id, changes, under_load)
+            except Exception as e:
+                ROLE_MUTATIONS.labels(result="failed").inc(len(changes))
+                logger.error("Failed to update roles for member %s in guild %s: %s", member_id, guild_id, e)
+
+    async def _apply(self, guild_id: int, member_id: int,
+                     changes: Dict[int, _Mutation], under_load: bool) -> None:
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            return
+        member = guild.get_member(member_id)
+        if member is None:
+            member = await guild.fetch_member(member_id)
+
+        to_add: List[discord.Role] = []
+        to_remove: List[discord.Role] = []
+        for role_id, mutation in changes.items():
+            role = guild.get_role(role_id)
+            if role is None:
+                continue
+            (to_add if mutation.add else to_remove).append(role)
+        reason = next((m.reason for m in changes.values() if m.reason), None)
+
+        # ロール単位のエンドポイントで適用する。キャッシュのロール一覧で全体を
+        # 置き換えると、待っている間に他のBotや管理者が行った変更を消してしまう
+        if to_add:
+            await member.add_roles(*to_add, reason=reason)
+        if to_remove:
+            await member.remove_roles(*to_remove, reason=reason)
+
+        now = time.monotonic()
+        for mutation in changes.values():
+            ROLE_QUEUE_LAG.observe(now - mutation.enqueued_at)
+        ROLE_MUTATIONS.labels(result="applied").inc(len(to_add) + len(to_remove))
+
+        notices = [m.notice for m in changes.values() if m.notice]
+        if not notices:
+            return
+        if under_load:
+            ROLE_DM_SKIPPED.inc()
+            return
+        # DMは別のバケットなのでワーカーを待たせない
+        task = asyncio.create_task(self._notify(member, "\n".join(notices)))
+        self._notify_tasks.add(task)
+        task.add_done_callback(self._notify_tasks.discard)
+
+    @staticmethod
+    async def _notify(member: discord.Member, content: str) -> None:
+        try:
+            await member.send(content)
+        except discord.HTTPException:
+            pass  # DMが無効になっている場合は無視
+
+    def close(self) -> None:
+        for queue in self._guilds.values():
+            if queue.task:
+                queue.task.cancel()
+        self._guilds.clear()
+        for task in self._notify_tasks:
+            task.cancel()
+        self._depth = 0
+        ROLE_QUEUE_DEPTH.set(0)
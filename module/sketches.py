@@ -0,0 +1,91 @@
+"""メモリ使用量が一定の近似集計（メトリクス用）"""
+import hashlib
+import math
+from typing import Dict, Final, Hashable, List, Tuple
+
+
+HLL_PRECISION: Final[int] = 14  # レジスタ数 2^14（標準誤差 約0.8%、16KB）
+
+
+def _hash64(value: Hashable) -> int:
+    digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HyperLogLog:
+    """要素数に関わらず一定のメモリでユニーク数を推定する"""
+
+    def __init__(self, precision: int = HLL_PRECISION) -> None:
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+        self._alpha = 0.7213 / (1 + 1.079 / self.size)
+
+    def add(self, value: Hashable) -> None:
+        x = _hash64(value)
+        index = x >> (64 - self.precision)
+        rest = x & ((1 << (64 - self.precision)) - 1)
+        # 残りのビットの先頭から数えた最初の1の位置
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        estimate = self._alpha * self.size * self.size / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.size and zeros:
+            # 小さい値は線形カウントの方が正確
+            estimate = self.size * math.log(self.size / zeros)
+        return int(estimate)
+
+
+class SpaceSaving:
+    """上位K件の頻出要素を一定のメモリで追跡する（Space-Savingアルゴリズム）
+
+    ``capacity`` 個のカウンタだけを持ち、あふれたら最小のカウンタを置き換える。
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._counts: Dict[Hashable, int] = {}
+
+    def add(self, item: Hashable) -> None:
+        if item in self._counts:
+            self._counts[item] += 1
+        elif len(self._counts) < self.capacity:
+            self._counts[item] = 1
+        else:
+            victim = min(self._counts, key=self._counts.__getitem__)
+            self._counts[item] = self._counts.pop(victim) + 1
+
+    def top(self, k: int) -> List[Tuple[Hashable, int]]:
+        return sorted(self._counts.items(), key=lambda kv: kv[1], reverse=True)[:k]
+
+
+class RateRing:
+    """直近 ``size`` 秒間の1秒ごとの件数を固定長のリングに持つ
+
+    古いスロットは時刻が進んだときにまとめて0に戻すため、記録は定数時間で済む。
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._counts = [0] * size
+        self._head = 0  # 最後に記録した秒
+
+    def _advance(self, now: int) -> None:
+        if now <= self._head:
+            return
+        for second in range(max(self._head + 1, now - self.size + 1), now + 1):
+            self._counts[second % self.size] = 0
+        self._head = now
+
+    def add(self, now: int, count: int = 1) -> None:
+        self._advance(now)
+        self._counts[now % self.size] += count
+
+    def rate(self, now: int, window: int) -> float:
+        """``now`` の直前 ``window`` 秒間（集計中の現在秒を除く）の1秒あたりの件数"""
+        self._advance(now)
+        window = min(window, self.size - 1)
+        return sum(self._counts[(now - k) % self.size] for k in range(1, window + 1)) / window
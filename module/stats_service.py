@@ -0,0 +1,97 @@
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+from typing import Any, Dict, Final, Optional
+
+from aiohttp import web
+from discord.ext import commands
+
+
+STATS_HOST: Final[str] = os.getenv("STATS_SERVICE_HOST", "127.0.0.1")
+STATS_PORT: Final[int] = int(os.getenv("STATS_SERVICE_PORT", "8492"))
+PUSH_INTERVAL: Final[float] = 5.0  # 変化がなくてもSSEで送る間隔（秒）
+
+logger = logging.getLogger(__name__)
+
+
+def _latency_ms(latency: float) -> Optional[float]:
+    return round(latency * 1000, 2) if math.isfinite(latency) else None
+
+
+class StatsService:
+    """Botの稼働状況をメモリに持ち、ローカルHTTPで公開するサービス
+
+    ``GET /stats`` で現在の値を、``GET /stats/stream`` でServer-Sent Eventsとして
+    変化のたびに（最低でも ``PUSH_INTERVAL`` 秒ごとに）配信する。
+    webapi.py はこのストリームを購読し、ファイルを介さずに値を受け取る。
+    """
+
+    def __init__(self, bot: commands.AutoShardedBot) -> None:
+        self.bot = bot
+        self.user_count = 0
+        self._changed = asyncio.Event()
+        self._runner: Optional[web.AppRunner] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """現在の統計情報"""
+        return {
+            "latency_ms": _latency_ms(self.bot.latency),
+            "server_count": len(self.bot.guilds),
+            "total_users": self.user_count,
+            "shards": {
+                str(shard_id): {
+                    "latency_ms": _latency_ms(shard.latency),
+                    "closed": shard.is_closed()
+                }
+                for shard_id, shard in self.bot.shards.items()
+            },
+            "updated_at": time.time()
+        }
+
+    def set_user_count(self, count: int) -> None:
+        if count != self.user_count:
+            self.user_count = count
+            self.notify()
+
+    def notify(self) -> None:
+        """購読者に即時配信する"""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def _handle_stats(self, _: web.Request) -> web.Response:
+        return web.json_response(self.snapshot())
+
+    async def _handle_stream(self, request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(headers={
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache"
+        })
+        await response.prepare(request)
+        try:
+            while True:
+                payload = json.dumps(self.snapshot(), ensure_ascii=False)
+                await response.write(f"data: {payload}\n\n".encode("utf-8"))
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=PUSH_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+        except ConnectionResetError:
+            pass  # 購読者が切断した
+        return response
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/stats", self._handle_stats)
+        app.router.add_get("/stats/stream", self._handle_stream)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, STATS_HOST, STATS_PORT).start()
+        logger.info("Stats service listening on %s:%s", STATS_HOST, STATS_PORT)
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
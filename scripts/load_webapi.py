@@ -0,0 +1,102 @@
+"""webapi.py の負荷試験
+
+locustのように重み付きのタスクを多数の仮想ユーザーで繰り返し実行し、
+エンドポイントごとのリクエスト数・エラー数・レイテンシを表示する。
+
+    uvicorn webapi:app --port 8000 &
+    python scripts/load_webapi.py --base-url http://localhost:8000 --users 200 --duration 30
+
+--etag を付けると、前回のETagを If-None-Match で送るブラウザの挙動を再現する。
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import aiohttp
+
+
+# (名前, パス, 重み)
+TASKS: List[Tuple[str, str, int]] = [
+    ("latency", "/api/latency", 5),
+    ("server_count", "/api/server_count", 5),
+    ("users", "/api/users", 5),
+    ("servers", "/api/servers", 3),
+]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run(args: argparse.Namespace) -> None:
+    tasks = list(TASKS)
+    if args.analytics_guild:
+        tasks.append(("analytics", f"/api/analytics/?guildid={args.analytics_guild}", 2))
+    names = [t[0] for t in tasks]
+    weights = [t[2] for t in tasks]
+    paths = {t[0]: t[1] for t in tasks}
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    errors: Dict[str, int] = defaultdict(int)
+    deadline = time.monotonic() + args.duration
+
+    async def user(session: aiohttp.ClientSession) -> None:
+        etags: Dict[str, str] = {}
+        while time.monotonic() < deadline:
+            name = random.choices(names, weights)[0]
+            headers = {}
+            if args.etag and name in etags:
+                headers["If-None-Match"] = etags[name]
+            start = time.perf_counter()
+            try:
+                async with session.get(args.base_url + paths[name], headers=headers) as response:
+                    await response.read()
+                    if etag := response.headers.get("ETag"):
+                        etags[name] = etag
+                    statuses[name][response.status] += 1
+            except aiohttp.ClientError:
+                errors[name] += 1
+                continue
+            latencies[name].append(time.perf_counter() - start)
+            if args.wait:
+                await asyncio.sleep(random.uniform(0, args.wait))
+
+    connector = aiohttp.TCPConnector(limit=args.users)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        started = time.perf_counter()
+        await asyncio.gather(*(user(session) for _ in range(args.users)))
+        elapsed = time.perf_counter() - started
+
+    print(f"{'name':<14}{'reqs':>8}{'req/s':>9}{'errors':>8}{'p50 ms':>9}{'p99 ms':>9}  statuses")
+    for name in names:
+        samples = latencies[name]
+        if not samples and not errors[name]:
+            continue
+        p50 = statistics.median(samples) * 1000 if samples else 0
+        p99 = percentile(samples, 99) * 1000 if samples else 0
+        status_text = ", ".join(f"{code}:{count}" for code, count in sorted(statuses[name].items()))
+        print(f"{name:<14}{len(samples):>8}{len(samples) / elapsed:>9.0f}{errors[name]:>8}{p50:>9.1f}{p99:>9.1f}  {status_text}")
+    total = sum(len(v) for v in latencies.values())
+    print(f"total: {total} requests in {elapsed:.1f}s ({total / elapsed:.0f} req/s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=100, help="仮想ユーザー数")
+    parser.add_argument("--duration", type=float, default=30, help="実行秒数")
+    parser.add_argument("--wait", type=float, default=0.0, help="リクエスト間の最大待機秒数")
+    parser.add_argument("--etag", action="store_true", help="If-None-Matchを送る")
+    parser.add_argument("--analytics-guild", type=int, help="/api/analytics/ に使うguildid")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
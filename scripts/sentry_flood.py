@@ -0,0 +1,122 @@
+"""Sentryへのエラー送信の負荷試験
+
+ローカルにSentryのDSNを模したスタブサーバーを立て、同じエラーを大量に発生させたときに
+ErrorReporter がどれだけイベントを送るか、そしてイベントループがどれだけ遅れるかを計測する。
+
+    python scripts/sentry_flood.py --errors 5000 --sites 3
+    python scripts/sentry_flood.py --errors 5000 --sites 3 --direct   # 従来の同期送信と比較
+
+本物のSentryには送らない（DSNは常にスタブサーバーを指す）。
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import List
+
+import sentry_sdk
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from module.error_reporter import ErrorReporter  # noqa: E402
+
+
+LAG_PROBE_INTERVAL = 0.01
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def make_error(site: int) -> Exception:
+    # 発生箇所ごとに別の指紋になるよう、行を分けて例外を作る
+    try:
+        if site == 0:
+            raise ValueError("flood")
+        if site == 1:
+            raise KeyError("flood")
+        raise RuntimeError(f"flood from site {site}")
+    except Exception as e:
+        return e
+
+
+async def start_stub(port: int, received: List[int]) -> web.AppRunner:
+    async def handle(request: web.Request) -> web.Response:
+        await request.read()
+        received[0] += 1
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_post("/api/{project}/envelope/", handle)
+    app.router.add_post("/api/{project}/store/", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+
+async def probe_lag(samples: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        expected = time.perf_counter() + LAG_PROBE_INTERVAL
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        samples.append(max(0.0, time.perf_counter() - expected))
+
+
+async def run(args: argparse.Namespace) -> None:
+    received = [0]
+    runner = await start_stub(args.port, received)
+    sentry_sdk.init(dsn=f"http://public@127.0.0.1:{args.port}/1", default_integrations=False)
+    reporter = ErrorReporter(interval=args.interval)
+
+    lag: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_lag(lag, stop))
+    await asyncio.sleep(0.1)
+
+    started = time.perf_counter()
+    for i in range(args.errors):
+        error = make_error(i % args.sites)
+        if args.direct:
+            sentry_sdk.capture_exception(error)
+        else:
+            reporter.capture_exception(error, tags={"command": "flood"})
+        if i % args.batch == 0:
+            await asyncio.sleep(0)  # 他のタスクに制御を渡す（実際のBotと同じく1件ずつ処理される）
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe
+    await asyncio.get_running_loop().run_in_executor(None, reporter.close)
+    await asyncio.sleep(0.5)
+    await runner.cleanup()
+
+    mode = "direct" if args.direct else "reporter"
+    print(f"mode: {mode}")
+    print(f"errors raised: {args.errors} from {args.sites} sites in {elapsed:.2f}s")
+    print(f"events received by stub: {received[0]}")
+    if lag:
+        print(
+            f"event loop lag: p50={percentile(lag, 50) * 1000:.2f}ms "
+            f"p99={percentile(lag, 99) * 1000:.2f}ms max={max(lag) * 1000:.2f}ms "
+            f"mean={statistics.mean(lag) * 1000:.2f}ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--errors", type=int, default=5000, help="発生させるエラーの数")
+    parser.add_argument("--sites", type=int, default=3, help="エラーの発生箇所の数（指紋の数）")
+    parser.add_argument("--interval", type=float, default=60.0, help="同じ指紋を送る最短間隔（秒）")
+    parser.add_argument("--batch", type=int, default=1, help="何件ごとにイベントループに制御を返すか")
+    parser.add_argument("--port", type=int, default=8599, help="スタブサーバーのポート")
+    parser.add_argument("--direct", action="store_true", help="ErrorReporterを使わず同期的に送信する")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,17 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import asyncpg  # 追加
-from typing import Final, Optional, List, Dict, Any
+import aiohttp
+import aiosqlite
+import asyncio
+import base64
+import hashlib
+import time
+from typing import Awaitable, Callable, Final, Optional, List, Dict, Any, Tuple
 from pydantic import BaseModel, Field
-from datetime import datetime
+from datetime import date, datetime, timedelta
 import logging
 from pathlib import Path
 import json
@@ -14,6 +20,8 @@ from dotenv import load_dotenv
 import os
 import sqlite3
 
+from module.analytics_store import JST, AnalyticsStore
+
 load_dotenv()
 
 security = HTTPBasic()
@@ -24,10 +32,45 @@ PORT: Final[int] = 8000
 
 PATHS: Final[dict] = {
     "db": Path(__file__).parent / "data/server_board.db",
-    "user_count": Path(__file__).parent / "data/user_count.json",
+    "request_db": Path(__file__).parent / "data/request.db",
     "public": Path(__file__).parent / "public"
 }
 
+STATS_CACHE_TTL: Final[float] = 5.0  # latency・サーバー数・ユーザー数のキャッシュ秒数
+STATS_SERVICE_URL: Final[str] = os.getenv("STATS_SERVICE_URL", "http://127.0.0.1:8492")
+STATS_RECONNECT_MAX: Final[float] = 30.0  # Bot停止中の再接続間隔の上限（秒）
+SERVERS_PAGE_SIZE: Final[int] = 50
+SERVERS_MAX_PAGE_SIZE: Final[int] = 100
+SERVERS_SNAPSHOT_TTL: Final[float] = 30.0  # 1ページ目のスナップショットを保持する秒数
+SERVERS_CHANGED_CHANNEL: Final[str] = "servers_changed"  # /up時にBotがNOTIFYするチャンネル
+
+SERVER_COLUMNS: Final[str] = "server_id, server_name, icon_url, description, last_up_time, registered_at, invite_url"
+# (last_up_time DESC NULLS LAST, server_id DESC) のインデックスに沿ったキーセットページネーション
+SELECT_SERVERS_FIRST_SQL: Final[str] = f"""
+    SELECT {SERVER_COLUMNS} FROM servers
+    ORDER BY last_up_time DESC NULLS LAST, server_id DESC
+    LIMIT $1
+"""
+SELECT_SERVERS_AFTER_SQL: Final[str] = f"""
+    SELECT {SERVER_COLUMNS} FROM servers
+    WHERE (last_up_time, server_id) < ($1, $2) OR last_up_time IS NULL
+    ORDER BY last_up_time DESC NULLS LAST, server_id DESC
+    LIMIT $3
+"""
+SELECT_SERVERS_AFTER_NULL_SQL: Final[str] = f"""
+    SELECT {SERVER_COLUMNS} FROM servers
+    WHERE last_up_time IS NULL AND server_id < $1
+    ORDER BY server_id DESC
+    LIMIT $2
+"""
+
+# SQLiteは同じSQL文字列のプリペアドステートメントを接続ごとにキャッシュするため、
+# クエリは固定の文字列として使い回す
+SELECT_REQUESTS_SQL: Final[str] = "SELECT * FROM requests"
+DELETE_REQUEST_SQL: Final[str] = "DELETE FROM requests WHERE user_id = ? AND message = ? AND date = ?"
+ANALYTICS_DEFAULT_DAYS: Final[int] = 30
+ANALYTICS_MAX_DAYS: Final[int] = 366
+
 TIME_UNITS: Final[Dict[str, int]] = {
     "days": 24 * 60 * 60,
     "hours": 60 * 60,
@@ -39,9 +82,10 @@ ERROR_MESSAGES: Final[dict] = {
     "db_not_found": "DBファイルが見つかりません: {}",
     "table_not_found": "サーバーテーブルが存在しません",
     "server_not_found": "サーバーが見つかりません",
-    "user_count_not_found": "ユーザー数ファイルが見つかりません: {}",
+    "stats_unavailable": "Botの統計情報をまだ受信していません",
     "db_error": "DBエラー: {}",
     "json_error": "JSONデコードエラー: {}",
+    "invalid_cursor": "cursorが不正です",
     "unexpected": "予期せぬエラー: {}"
 }
 
@@ -72,6 +116,8 @@ class DatabaseManager:
         # ...existing code...
         self.db_path = db_path  # 互換性のため残す（使用しません）
         self.pool = None  # asyncpg用の接続プール
+        self._table_checked = False
+        self._listener: Optional[asyncpg.Connection] = None
 
     async def _get_pool(self) -> asyncpg.Pool:
         if self.pool is None:
@@ -96,15 +142,24 @@ class DatabaseManager:
                 detail=ERROR_MESSAGES["table_not_found"]
             )
 
-    async def get_all_servers(self) -> List[Dict[str, Any]]:
+    async def get_servers_page(
+        self,
+        limit: int,
+        cursor: Optional[Tuple[Optional[datetime], int]] = None
+    ) -> List[Dict[str, Any]]:
+        """last_up_timeの新しい順にサーバーを1ページ分取得"""
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
-                await self.check_table_exists(conn)
-                rows = await conn.fetch("""
-                    SELECT * FROM servers
-                    ORDER BY last_up_time DESC NULLS LAST, registered_at DESC
-                """) 
+                if not self._table_checked:
+                    await self.check_table_exists(conn)
+                    self._table_checked = True
+                if cursor is None:
+                    rows = await conn.fetch(SELECT_SERVERS_FIRST_SQL, limit)
+                elif cursor[0] is None:
+                    rows = await conn.fetch(SELECT_SERVERS_AFTER_NULL_SQL, cursor[1], limit)
+                else:
+                    rows = await conn.fetch(SELECT_SERVERS_AFTER_SQL, cursor[0], cursor[1], limit)
                 return [dict(row) for row in rows]
 
         except asyncpg.PostgresError as e:
@@ -114,12 +169,35 @@ class DatabaseManager:
                 detail=ERROR_MESSAGES["db_error"].format(str(e))
             ) from e
 
+    async def listen_for_changes(self, callback: Callable[[], None]) -> None:
+        """Botの/upでサーバー一覧が変わったときに通知を受け取る"""
+        try:
+            self._listener = await asyncpg.connect(
+                host=os.getenv("DB_HOST"),
+                port=int(os.getenv("DB_PORT", "5432")),
+                database="server_board",
+                user=os.getenv("DB_USER"),
+                password=os.getenv("DB_PASSWORD")
+            )
+            await self._listener.add_listener(SERVERS_CHANGED_CHANNEL, lambda *_: callback())
+        except (OSError, asyncpg.PostgresError) as e:
+            # 通知が受け取れなくてもスナップショットはTTLで更新される
+            logger.warning("Failed to listen for server changes: %s", e)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            await self._listener.close()
+            self._listener = None
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
     async def get_server(self, server_id: int) -> Dict[str, Any]:
         try:
             pool = await self._get_pool()
             async with pool.acquire() as conn:
                 row = await conn.fetchrow(
-                    "SELECT * FROM servers WHERE server_id = $1",
+                    f"SELECT {SERVER_COLUMNS} FROM servers WHERE server_id = $1",
                     server_id
                 )
                 if row:
@@ -137,6 +215,101 @@ class DatabaseManager:
                 detail=ERROR_MESSAGES["db_error"].format(str(e))
             ) from e
 
+class SQLiteDatabase:
+    """aiosqliteの接続を使い回してSQLiteにアクセスするクラス
+
+    クエリは専用スレッドで実行されるため、イベントループを止めない。
+    """
+
+    def __init__(self, db_path: Path, **connect_kwargs: Any) -> None:
+        self.db_path = db_path
+        self._connect_kwargs = connect_kwargs
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._lock = asyncio.Lock()
+
+    async def _get_conn(self) -> aiosqlite.Connection:
+        if self._conn is None:
+            async with self._lock:
+                if self._conn is None:
+                    conn = await aiosqlite.connect(str(self.db_path), **self._connect_kwargs)
+                    conn.row_factory = aiosqlite.Row
+                    self._conn = conn
+        return self._conn
+
+    async def fetch_all(self, query: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        conn = await self._get_conn()
+        async with conn.execute(query, params) as cursor:
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    async def fetch_one(self, query: str, params: Tuple = ()) -> Optional[Dict[str, Any]]:
+        conn = await self._get_conn()
+        async with conn.execute(query, params) as cursor:
+            row = await cursor.fetchone()
+        return dict(row) if row else None
+
+    async def execute(self, query: str, params: Tuple = ()) -> int:
+        conn = await self._get_conn()
+        cursor = await conn.execute(query, params)
+        await conn.commit()
+        return cursor.rowcount
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+class JSONResponseCache:
+    """読み取り中心のエンドポイント向けに、シリアライズ済みの応答をTTL付きで保持するクラス
+
+    ETagは本文のハッシュで、``If-None-Match`` が一致すれば304を返せる。
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, bytes, str]] = {}
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Tuple[bytes, str]:
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1], entry[2]
+
+        async with self._lock:
+            # 待っている間に他のリクエストが更新していればそれを使う
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1], entry[2]
+            data = await loader()
+            body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            self._entries[key] = (time.monotonic() + self.ttl, body, etag)
+            return body, etag
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+def as_datetime(value: Any) -> Optional[datetime]:
+    """asyncpgのdatetimeと、古いデータのISO文字列の両方を受け付ける"""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+def encode_cursor(last_up_time: Optional[datetime], server_id: int) -> str:
+    raw = f"{last_up_time.isoformat() if last_up_time else ''}|{server_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        last_up, server_id = raw.rsplit("|", 1)
+        return (datetime.fromisoformat(last_up) if last_up else None), int(server_id)
+    except (ValueError, UnicodeError) as e:
+        raise HTTPException(status_code=400, detail=ERROR_MESSAGES["invalid_cursor"]) from e
+
 class TimeCalculator:
     """時間計算を行うクラス"""
 
@@ -162,31 +335,45 @@ class TimeCalculator:
 
         return "たった今"
 
-class UserCountManager:
-    """ユーザー数管理を行うクラス"""
-
-    def __init__(self, file_path: Path) -> None:
-        self.file_path = file_path
-
-    async def get_total_users(self) -> int:
-        if not self.file_path.exists():
-            raise HTTPException(
-                status_code=500,
-                detail=ERROR_MESSAGES["user_count_not_found"].format(
-                    self.file_path
-                )
-            )
-
-        try:
-            data = json.loads(self.file_path.read_text(encoding="utf-8"))
-            return data.get("total_users", 0)
-
-        except json.JSONDecodeError as e:
-            logger.error("JSON decode error: %s", e, exc_info=True)
-            raise HTTPException(
-                status_code=500,
-                detail=ERROR_MESSAGES["json_error"].format(str(e))
-            ) from e
+class StatsClient:
+    """BotのStatsServiceをSSEで購読し、最新の統計情報をメモリに保持するクラス"""
+
+    def __init__(self, base_url: str) -> None:
+        self.base_url = base_url
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, on_update: Callable[[], None]) -> None:
+        self._task = asyncio.create_task(self._run(on_update))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self, on_update: Callable[[], None]) -> None:
+        delay = 1.0
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=5)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            while True:
+                try:
+                    async with session.get(f"{self.base_url}/stats/stream") as response:
+                        response.raise_for_status()
+                        delay = 1.0
+                        async for line in response.content:
+                            if line.startswith(b"data: "):
+                                self.snapshot = json.loads(line[6:])
+                                on_update()
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    logger.warning("Stats stream disconnected: %s", e)
+                # Botの再起動中は最後に受信した値を返し続ける
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, STATS_RECONNECT_MAX)
+
+    def get(self, key: str) -> Any:
+        if self.snapshot is None:
+            raise HTTPException(status_code=503, detail=ERROR_MESSAGES["stats_unavailable"])
+        return self.snapshot.get(key)
 
 class ServerBoardAPI:
     """サーバーボードAPIを管理するクラス"""
@@ -194,15 +381,18 @@ class ServerBoardAPI:
     def __init__(self) -> None:
         self.app = FastAPI(title=APP_TITLE)
         self.db = DatabaseManager(PATHS["db"])
-        self.user_count = UserCountManager(PATHS["user_count"])
+        self.stats = StatsClient(STATS_SERVICE_URL)
         self.time_calc = TimeCalculator()
+        self.request_db = SQLiteDatabase(PATHS["request_db"])
+        self.analytics = AnalyticsStore()
+        self.stats_cache = JSONResponseCache(STATS_CACHE_TTL)
+        self.servers_snapshot = JSONResponseCache(SERVERS_SNAPSHOT_TTL)
+        self._first_page_cursors: Dict[int, Optional[str]] = {}
         self._setup_middleware()
         self._setup_routes()
         logger.info("Database path: %s", PATHS['db'])
-        logger.info("User count file path: %s", PATHS['user_count'])
+        logger.info("Stats service URL: %s", STATS_SERVICE_URL)
         logger.info("Public directory path: %s", PATHS['public'])
-        self.latency_file = Path(__file__).parent / "data/latency.json"
-        self.server_count_file = Path(__file__).parent / "data/server_count.json"
 
     def _setup_middleware(self) -> None:
         """ミドルウェアの設定"""
@@ -211,7 +401,8 @@ class ServerBoardAPI:
             allow_origins=["*"],
             allow_credentials=True,
             allow_methods=["*"],
-            allow_headers=["*"]
+            allow_headers=["*"],
+            expose_headers=["ETag", "X-Next-Cursor"]
         )
 
     def _setup_routes(self) -> None:
@@ -229,31 +420,91 @@ class ServerBoardAPI:
             StaticFiles(directory=PATHS["public"], html=True),
             name="static"
         )
+        self.app.on_event("startup")(self._startup)
+        self.app.on_event("shutdown")(self._shutdown)
+
+    async def _startup(self) -> None:
+        await self.db.listen_for_changes(self.servers_snapshot.clear)
+        # 新しい値を受信したらシリアライズ済みの応答を作り直す
+        self.stats.start(self.stats_cache.clear)
+
+    async def _shutdown(self) -> None:
+        await self.stats.stop()
+        await self.request_db.close()
+        await self.analytics.close()
+        await self.db.close()
 
-    def _process_server_data(
+    async def _cached_json(
         self,
-        servers: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+        request: Request,
+        key: str,
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Response:
+        """キャッシュ済みのJSONを返す（ETagが一致すれば304）"""
+        body, etag = await self.stats_cache.get(key, loader)
+        headers = {"ETag": etag, "Cache-Control": f"max-age={int(STATS_CACHE_TTL)}"}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def _serialize_servers(self, servers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """サーバー一覧をJSON化できる形にし、経過時間を付け加える"""
+        items = []
         for server in servers:
-            if last_up_str := server.get("last_up_time"):
-                last_up = datetime.fromisoformat(last_up_str)
-                server["time_since_last_up"] = self.time_calc.calculate_time_ago(
-                    last_up
-                )
-            else:
-                server["time_since_last_up"] = None
-        return servers
-
-    async def get_servers(self) -> List[Server]:
-        """全サーバー情報を取得するエンドポイント"""
+            last_up = as_datetime(server["last_up_time"])
+            registered_at = as_datetime(server["registered_at"])
+            items.append({
+                **server,
+                "last_up_time": last_up.isoformat() if last_up else None,
+                "registered_at": registered_at.isoformat() if registered_at else None,
+                "time_since_last_up": self.time_calc.calculate_time_ago(last_up) if last_up else None
+            })
+        return items
+
+    async def _load_servers_page(
+        self,
+        limit: int,
+        cursor: Optional[Tuple[Optional[datetime], int]]
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        servers = await self.db.get_servers_page(limit, cursor)
+        next_cursor = None
+        if len(servers) == limit:
+            last = servers[-1]
+            next_cursor = encode_cursor(as_datetime(last["last_up_time"]), last["server_id"])
+        return self._serialize_servers(servers), next_cursor
+
+    async def get_servers(self, request: Request, limit: int = SERVERS_PAGE_SIZE, cursor: Optional[str] = None) -> Response:
+        """サーバー情報を新しくupされた順に1ページ分取得するエンドポイント
+
+        次のページがある場合は ``X-Next-Cursor`` ヘッダーの値を ``cursor`` に渡す。
+        """
+        limit = max(1, min(limit, SERVERS_MAX_PAGE_SIZE))
         try:
-            servers = await self.db.get_all_servers()
-            if not servers:
-                return []
-
-            processed_servers = self._process_server_data(servers)
-            return [Server(**server) for server in processed_servers]
+            if cursor is None:
+                # 1ページ目はアクセスが集中するため、短いTTLのスナップショットから返す
+                async def load() -> List[Dict[str, Any]]:
+                    items, self._first_page_cursors[limit] = await self._load_servers_page(limit, None)
+                    return items
+
+                body, etag = await self.servers_snapshot.get(f"servers:{limit}", load)
+                headers = {"ETag": etag}
+                next_cursor = self._first_page_cursors.get(limit)
+                if next_cursor:
+                    headers["X-Next-Cursor"] = next_cursor
+                if etag in request.headers.get("if-none-match", ""):
+                    return Response(status_code=304, headers=headers)
+                return Response(content=body, media_type="application/json", headers=headers)
+
+            items, next_cursor = await self._load_servers_page(limit, decode_cursor(cursor))
+            headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+            return Response(
+                content=json.dumps(items, ensure_ascii=False),
+                media_type="application/json",
+                headers=headers
+            )
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error("Unexpected error: %s", e, exc_info=True)
             raise HTTPException(
@@ -281,12 +532,16 @@ class ServerBoardAPI:
                 detail=ERROR_MESSAGES["unexpected"].format(str(e))
             ) from e
 
-    async def get_total_users(self) -> Dict[str, int]:
+    async def get_total_users(self, request: Request) -> Response:
         """総ユーザー数を取得するエンドポイント"""
+        async def load() -> Dict[str, int]:
+            return {"total_users": self.stats.get("total_users")}
+
         try:
-            total = await self.user_count.get_total_users()
-            return {"total_users": total}
+            return await self._cached_json(request, "users", load)
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error("Unexpected error: %s", e, exc_info=True)
             raise HTTPException(
@@ -296,14 +551,9 @@ class ServerBoardAPI:
 
     async def get_requests(self, credentials: HTTPBasicCredentials = Depends(security)) -> List[Dict[str, Any]]:
         """リクエスト内容を取得するエンドポイント"""
+        self.basic_auth(credentials)
         try:
-            conn = sqlite3.connect('data/request.db')
-            conn.row_factory = sqlite3.Row  # Add this line to enable row as dictionary
-            c = conn.cursor()
-            c.execute("SELECT * FROM requests")
-            requests = [dict(row) for row in c.fetchall()]
-            conn.close()
-            return requests
+            return await self.request_db.fetch_all(SELECT_REQUESTS_SQL)
 
         except sqlite3.Error as e:
             logger.error("Database error: %s", e, exc_info=True)
@@ -316,12 +566,8 @@ class ServerBoardAPI:
         """リクエストを削除するエンドポイント"""
         self.basic_auth(credentials)
         try:
-            conn = sqlite3.connect("data/request.db")
-            c = conn.cursor()
             logger.info("Deleting request with user_id=%s, message=%s, date=%s", user_id, message, date)
-            c.execute("DELETE FROM requests WHERE user_id = ? AND message = ? AND date = ?", (user_id, message, date))
-            conn.commit()
-            conn.close()
+            await self.request_db.execute(DELETE_REQUEST_SQL, (user_id, message, date))
             return {"message": "リクエストが削除されました"}
 
         except sqlite3.Error as e:
@@ -331,36 +577,35 @@ class ServerBoardAPI:
                 detail=ERROR_MESSAGES["db_error"].format(str(e))
             ) from e
 
-    async def get_analytics(self, guildid: int) -> Dict[str, Any]:
-        """指定されたguildidの最新のアナリティクスデータを取得するエンドポイント"""
-        from fastapi import HTTPException
-        import json
-        analytics_db = Path(__file__).parent / "data/analytics.db"
-        if not analytics_db.exists():
-            raise HTTPException(status_code=500, detail=f"Analytics DBが見つかりません: {analytics_db}")
+    async def get_analytics(
+        self,
+        guildid: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """指定されたguildidの日次アナリティクスを期間指定で取得するエンドポイント
 
-        try:
-            conn = sqlite3.connect(str(analytics_db), detect_types=sqlite3.PARSE_DECLTYPES)
-            conn.row_factory = sqlite3.Row
-            c = conn.cursor()
-            c.execute("""
-                SELECT * FROM analytics_data
-                WHERE guild_id = ?
-                ORDER BY timestamp DESC
-                LIMIT 1
-            """, (guildid,))
-            row = c.fetchone()
-            conn.close()
-            if not row:
-                raise HTTPException(status_code=404, detail="指定されたguildidのアナリティクスデータは存在しません")
-            result = dict(row)
-            # JSON形式のカラムを変換
-            result["daily_messages"] = json.loads(result["daily_messages"])
-            result["daily_active_users"] = json.loads(result["daily_active_users"])
-            return result
+        期間を省略した場合は直近30日分を返す。
+        """
+        end = end or datetime.now(JST).date()
+        start = start or end - timedelta(days=ANALYTICS_DEFAULT_DAYS - 1)
+        if start > end or (end - start).days >= ANALYTICS_MAX_DAYS:
+            raise HTTPException(status_code=400, detail=f"期間は{ANALYTICS_MAX_DAYS}日以内で指定してください")
 
+        try:
+            rows = await self.analytics.get_range(guildid, start, end)
         except sqlite3.Error as e:
             raise HTTPException(status_code=500, detail=f"Analytics DBエラー: {e}")
+        if not rows:
+            raise HTTPException(status_code=404, detail="指定されたguildidのアナリティクスデータは存在しません")
+
+        return {
+            "guild_id": guildid,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "daily_messages": {day.isoformat(): messages for day, messages, _ in rows},
+            "daily_active_users": {day.isoformat(): active for day, _, active in rows}
+        }
 
     def basic_auth(self, credentials: HTTPBasicCredentials = Depends(security)) -> None:
         """Basic認証の検証"""
@@ -373,28 +618,19 @@ class ServerBoardAPI:
                 headers={"WWW-Authenticate": "Basic"}
             )
 
-    async def get_latency(self) -> dict:
-        if not self.latency_file.exists():
-            raise HTTPException(status_code=404, detail="latency.jsonが見つかりません")
-        try:
-            with self.latency_file.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data
-        except Exception as e:
-            logger.error("latency.json読み込みエラー: %s", e, exc_info=True)
-            raise HTTPException(status_code=500, detail=f"latency.jsonの読み込みに失敗しました: {e}")
+    async def get_latency(self, request: Request) -> Response:
+        """Botのレイテンシを取得するエンドポイント"""
+        async def load() -> Dict[str, Any]:
+            return {"latency_ms": self.stats.get("latency_ms"), "shards": self.stats.get("shards")}
+
+        return await self._cached_json(request, "latency", load)
 
-    async def get_server_count(self) -> Dict[str, Any]:
+    async def get_server_count(self, request: Request) -> Response:
         """サーバー数を取得するエンドポイント"""
-        if not self.server_count_file.exists():
-            raise HTTPException(status_code=404, detail="server_count.jsonが見つかりません")
-        try:
-            with self.server_count_file.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data
-        except Exception as e:
-            logger.error("server_count.json読み込みエラー: %s", e, exc_info=True)
-            raise HTTPException(status_code=500, detail=f"server_count.jsonの読み込みに失敗しました: {e}")
+        async def load() -> Dict[str, Any]:
+            return {"server_count": self.stats.get("server_count")}
+
+        return await self._cached_json(request, "server_count", load)
 
 # APIインスタンスの作成
 api = ServerBoardAPI()